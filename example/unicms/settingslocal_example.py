@@ -116,6 +116,7 @@ MIDDLEWARE = [
     'htmlmin.middleware.MarkRequestMiddleware',
 
     # unicms
+    'cms.contexts.middleware.website_middleware',
     'cms.contexts.middleware.detect_language_middleware',
     'cms.contexts.middleware.show_template_blocks_sections',
     'cms.contexts.middleware.show_cms_draft_mode',
@@ -318,6 +319,10 @@ MONGO_CONNECTION_PARAMS = dict()
 
 MONGO_DB_NAME = 'unicms'
 MONGO_COLLECTION_NAME = 'search'
+# search engine storage, MongoDB or local SQLite FTS5 index
+SEARCH_BACKEND = 'cms.search.backends.MongoSearchBackend'
+# SEARCH_BACKEND = 'cms.search.backends.SQLiteSearchBackend'
+# SEARCH_SQLITE_PATH = f'{BASE_DIR}/unicms_search.sqlite3'
 MODEL_TO_MONGO_MAP = {
     'cmspages.Page': 'cms.search.models.page_to_entry',
     'cmspublications.Publication': 'cms.search.models.publication_to_entry'
@@ -4,3 +4,16 @@ from . settings import *
 LOCKS_CACHE_TTL = 0
 
 
+
+# local search engine, tests don't need a MongoDB instance
+SEARCH_BACKEND = 'cms.search.backends.SQLiteSearchBackend'
+SEARCH_SQLITE_PATH = ':memory:'
+
+# renditions are generated by their own tests only
+CMS_IMAGE_RENDITIONS_ENABLED = False
+# images optimized in the PRESAVE hook, no process pool
+CMS_MEDIA_PROCESSING_QUEUE = False
+CMS_MEDIA_PROCESSING_WORKERS = 0
+
+# audit log entries written in the request transaction
+CMS_AUDIT_LOG_ASYNC = False
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'cms.api'
+
+    def ready(self):
+        # that actually loads the signals
+        import cms.api.signals # noqa
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+
+from . import settings as app_settings
+from . settings import FORM_SOURCE_LABEL
+
+logger = logging.getLogger(__name__)
+
+
+# form schema cache
+FORM_CACHE_ENABLED = getattr(settings, 'FORM_CACHE_ENABLED',
+                             app_settings.FORM_CACHE_ENABLED)
+FORM_CACHE_KEY_PREFIX = getattr(settings, 'FORM_CACHE_KEY_PREFIX',
+                                app_settings.FORM_CACHE_KEY_PREFIX)
+FORM_CACHE_TTL = getattr(settings, 'FORM_CACHE_TTL',
+                         app_settings.FORM_CACHE_TTL)
+FORM_OPTIONS_SOURCE_TTL = getattr(settings, 'FORM_OPTIONS_SOURCE_TTL',
+                                  app_settings.FORM_OPTIONS_SOURCE_TTL)
+FORM_OPTIONS_SEARCH_FIELDS = getattr(settings, 'FORM_OPTIONS_SEARCH_FIELDS',
+                                     app_settings.FORM_OPTIONS_SEARCH_FIELDS)
+
+GENERATION_KEY_PREFIX = f'{FORM_CACHE_KEY_PREFIX}generation_'
+SOURCE_KEY_PREFIX = f'{FORM_CACHE_KEY_PREFIX}source_'
+
+
+def _generation_key(model_label):
+    return f'{GENERATION_KEY_PREFIX}{model_label}'
+
+
+def get_models_generations(model_labels):
+    """
+    returns the current generation of each model.
+    A missing counter is initialized with a timestamp, this way
+    an evicted counter never matches schemas of past generations
+    """
+    keys = {_generation_key(label): label for label in model_labels}
+    generations = cache.get_many(keys.keys())
+    for key in keys:
+        if generations.get(key) is None:
+            cache.add(key, int(time.time()), None)
+            generations[key] = cache.get(key)
+    return {label: generations[key] for key,label in keys.items()}
+
+
+def bump_model_generation(model_label):
+    """
+    invalidates all the cached form schemas with options of a model.
+    Called by post_save and post_delete signals
+    """
+    key = _generation_key(model_label)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # key doesn't exist yet (or it has been evicted)
+        cache.add(key, int(time.time()), None)
+        return cache.incr(key)
+
+
+def get_user_scope(user):
+    """
+    form options are the same for all the users of a scope,
+    editorial board permissions are checked on submission
+    """
+    if not user or not user.is_authenticated: return 'anonymous'
+    if user.is_superuser: return 'superuser'
+    if user.is_staff: return 'staff'
+    return 'user'
+
+
+def get_queryset_sql(queryset):
+    try:
+        return str(queryset.query)
+    except EmptyResultSet:
+        return ''
+
+
+def get_field_signature(name, field):
+    """
+    what a field contributes to its serialization,
+    without evaluating its queryset
+    """
+    signature = {'name': name,
+                 'widget': field.widget.__class__.__name__,
+                 'label': field.label,
+                 'required': field.required,
+                 'help_text': field.help_text,
+                 'api_source': getattr(field, FORM_SOURCE_LABEL, '')}
+    queryset = getattr(field, '_queryset', None)
+    if queryset is not None:
+        signature['model'] = queryset.model._meta.label_lower
+        signature['query'] = get_queryset_sql(queryset)
+    elif hasattr(field, '_choices'):
+        signature['choices'] = field._choices
+    return signature
+
+
+def make_form_cache_key(form, user=None, language=''):
+    """
+    forms built with different arguments (site, webpath, ...)
+    filter their querysets differently and get different keys
+    """
+    fields = [get_field_signature(name, field)
+              for name, field in form.fields.items()]
+    models = sorted({i['model'] for i in fields if 'model' in i})
+    form_class = form.__class__
+    value_key = json.dumps({'form': f'{form_class.__module__}.{form_class.__name__}',
+                            'scope': get_user_scope(user),
+                            'lang': language,
+                            'fields': fields,
+                            'generations': get_models_generations(models)},
+                           sort_keys=True,
+                           default=str)
+    hashed_v = hashlib.sha256(value_key.encode()).hexdigest()
+    return f'{FORM_CACHE_KEY_PREFIX}{hashed_v}'
+
+
+def get_form_from_cache(key):
+    if not FORM_CACHE_ENABLED: return
+    res = cache.get(key)
+    if res is not None:
+        logger.debug(f'uniCMS form cache - {key} succesfully taken from cache')
+    return res
+
+
+def set_form_to_cache(key, value):
+    if not FORM_CACHE_ENABLED: return
+    cache.set(key, value, FORM_CACHE_TTL)
+    logger.debug(f'uniCMS form cache - {key} succesfully stored to cache')
+    return True
+
+
+def set_options_source(queryset):
+    """
+    stores the queryset of a select field, with its searchable
+    fields, and returns its token.
+    Options are then served by the form field options endpoints
+    """
+    model = queryset.model._meta.label_lower
+    value_key = json.dumps({'model': model,
+                            'query': get_queryset_sql(queryset)})
+    token = hashlib.sha256(value_key.encode()).hexdigest()
+    cache.set(f'{SOURCE_KEY_PREFIX}{token}',
+              {'model': model,
+               'query': queryset.query,
+               'search_fields': FORM_OPTIONS_SEARCH_FIELDS.get(model, [])},
+              FORM_OPTIONS_SOURCE_TTL)
+    return token
+
+
+def get_options_source(token):
+    return cache.get(f'{SOURCE_KEY_PREFIX}{token}')
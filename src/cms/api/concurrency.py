@@ -1,7 +1,14 @@
 import logging
+import time
 
 from django.conf import settings
-from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache as default_cache
+
+from cms.contexts.models import EditorialBoardLockUser
+
+from rest_framework.exceptions import PermissionDenied
 
 from . import settings as app_settings
 
@@ -9,6 +16,8 @@ logger = logging.getLogger(__name__)
 
 
 # locks timed cache
+LOCKS_CACHE_ENABLED = getattr(settings, 'LOCKS_CACHE_ENABLED',
+                              app_settings.LOCKS_CACHE_ENABLED)
 LOCKS_CACHE_TTL = getattr(settings, 'LOCKS_CACHE_TTL',
                           app_settings.LOCKS_CACHE_TTL)
 LOCKS_CACHE_KEY_PREFIX = getattr(settings, 'LOCKS_CACHE_KEY_PREFIX',
@@ -16,16 +25,110 @@ LOCKS_CACHE_KEY_PREFIX = getattr(settings, 'LOCKS_CACHE_KEY_PREFIX',
 LOCK_MESSAGE = getattr(settings, 'LOCK_MESSAGE', app_settings.LOCK_MESSAGE)
 
 
+class LockService(object):
+    """
+    locks of many objects at once: the timed locks in cache,
+    set when an editor opens an item, and the editorial board ones
+    (EditorialBoardLockUser).
+    A single cache call and a single query for all the objects,
+    users are loaded only if someone else holds a lock.
+    Any Django cache backend can be used, Redis isn't required
+    """
+
+    def __init__(self, cache=None,
+                 key_prefix=LOCKS_CACHE_KEY_PREFIX,
+                 ttl=LOCKS_CACHE_TTL,
+                 enabled=LOCKS_CACHE_ENABLED):
+        self.cache = cache or default_cache
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+        self.enabled = enabled
+
+    def make_key(self, content_type_id, object_id):
+        return f'{self.key_prefix}{content_type_id}_{object_id}'
+
+    def get_objects_keys(self, objs):
+        """
+        {(content type id, object id): obj}.
+        Content types are cached by their manager
+        """
+        return {(ContentType.objects.get_for_model(obj).pk, obj.pk): obj
+                for obj in objs}
+
+    def get_cache_locks(self, keys):
+        """
+        {(content type id, object id): (user id, ttl)} of the locked objects
+        """
+        if not self.enabled or not keys: return {}
+        cache_keys = {self.make_key(*key): key for key in keys}
+        values = self.cache.get_many(list(cache_keys))
+        now = time.time()
+        locks = {}
+        for cache_key, value in values.items():
+            if not value: continue
+            if isinstance(value, (list, tuple)):
+                user_id, expires = value
+                ttl = max(int(expires - now), 0)
+            else: # pragma: no cover
+                # set by a previous version, without expiration time
+                user_id, ttl = value, self.ttl
+            locks[cache_keys[cache_key]] = (user_id, ttl)
+        return locks
+
+    def get_lock(self, content_type_id, object_id):
+        """
+        (user id, ttl) of the lock on an object, (0, 0) if it's not locked
+        """
+        key = (content_type_id, object_id)
+        return self.get_cache_locks([key]).get(key, (0, 0))
+
+    def set_lock(self, user_id, content_type_id, object_id):
+        if not self.enabled: return
+        key = self.make_key(content_type_id, object_id)
+        # expiration time stored with the owner, no ttl calls to read it
+        self.cache.set(key, (user_id, time.time() + self.ttl), self.ttl)
+        logger.debug(f'uniCMS locks timed cache - {key} succesfully stored to cache')
+
+    def get_conflicts(self, objs, user):
+        """
+        {obj: (owner user, ttl)} of the objects locked in cache
+        by other users
+        """
+        keys = self.get_objects_keys(objs)
+        conflicts = {key: lock
+                     for key, lock in self.get_cache_locks(keys).items()
+                     if lock[0] != user.pk}
+        if not conflicts: return {}
+        owners = get_user_model().objects.in_bulk({lock[0] for lock in conflicts.values()})
+        return {keys[key]: (owners.get(user_id), ttl)
+                for key, (user_id, ttl) in conflicts.items()}
+
+    def check(self, objs, user):
+        """
+        raises PermissionDenied if an object is locked by another user
+        """
+        for obj, (owner, ttl) in self.get_conflicts(objs, user).items():
+            logger.debug(f'{user} tried to access to {obj} actually used by {owner}')
+            raise PermissionDenied(LOCK_MESSAGE.format(user=owner, ttl=ttl),
+                                   403)
+
+    def check_board_locks(self, objs, user):
+        """
+        {obj: True if not locked by the editorial board or user
+        is one of the lock owners}, as EditorialBoardLockUser.check_for_locks
+        """
+        keys = self.get_objects_keys(objs)
+        users = EditorialBoardLockUser.get_locks_users(keys)
+        return {obj: key not in users or user.pk in users[key]
+                for key, obj in keys.items()}
+
+
+lock_service = LockService()
+
+
 def get_lock_from_cache(content_type_id, object_id):
-    key = f'{LOCKS_CACHE_KEY_PREFIX}{content_type_id}_{object_id}'
-    res = cache.get(key)
-    if res: # pragma: no cover
-        logger.debug(f'uniCMS locks timed cache - {key} succesfully taken from cache')
-        return (res, cache.ttl(key))
-    return (0, 0)
+    return lock_service.get_lock(content_type_id, object_id)
 
 
 def set_lock_to_cache(user_id, content_type_id, object_id):
-    key = f'{LOCKS_CACHE_KEY_PREFIX}{content_type_id}_{object_id}'
-    cache.set(key, user_id, LOCKS_CACHE_TTL)
-    logger.debug(f'uniCMS locks timed cache - {key} succesfully stored to cache')
+    lock_service.set_lock(user_id, content_type_id, object_id)
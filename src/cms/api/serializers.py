@@ -1,11 +1,24 @@
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.urls import reverse
+from django.utils import translation
+from django.utils.encoding import force_str
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
 
+from . import settings as app_settings
+from . cache import (get_form_from_cache,
+                     make_form_cache_key,
+                     set_form_to_cache,
+                     set_options_source)
 from . settings import FORM_SOURCE_LABEL
 
 
+FORM_SELECT_OPTIONS_MAX = getattr(settings, 'FORM_SELECT_OPTIONS_MAX',
+                                  app_settings.FORM_SELECT_OPTIONS_MAX)
+
+
 class UniCMSCreateUpdateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
@@ -27,7 +40,22 @@ class UniCMSCreateUpdateSerializer(serializers.ModelSerializer):
 class UniCMSFormSerializer():
 
     @staticmethod
-    def serialize(form):
+    def serialize(form, user=None):
+        """
+        form schemas are cached for each user scope and language
+        and invalidated when the models of their options change.
+        Querysets with more than FORM_SELECT_OPTIONS_MAX items are
+        served lazily through a form field options api_source
+        """
+        key = make_form_cache_key(form, user, translation.get_language())
+        form_fields = get_form_from_cache(key)
+        if form_fields is None:
+            form_fields = UniCMSFormSerializer._serialize(form)
+            set_form_to_cache(key, form_fields)
+        return form_fields
+
+    @staticmethod
+    def _serialize(form):
 
         def _get_choices(choices):
             elements = []
@@ -35,7 +63,7 @@ class UniCMSFormSerializer():
                 if (type(choice[1]) == tuple):
                     elements.extend(_get_choices(choice[1]))
                 else:
-                    elements.append({"text": choice[1],
+                    elements.append({"text": force_str(choice[1]),
                                      "value": choice[0]})
             return elements
 
@@ -49,9 +77,9 @@ class UniCMSFormSerializer():
 
             field_dict = {}
             field_dict['id'] = field_name
-            field_dict['label'] = field.label
+            field_dict['label'] = force_str(field.label, strings_only=True)
             field_dict['required'] = 1 if field.required else 0
-            field_dict['help_text'] = field.help_text
+            field_dict['help_text'] = force_str(field.help_text, strings_only=True)
             field_dict['api_source'] = getattr(field, FORM_SOURCE_LABEL, '')
             field_dict['options'] = []
             field_dict['multiple'] = 0
@@ -68,7 +96,13 @@ class UniCMSFormSerializer():
                     field_dict['multiple'] = 1
 
                 if hasattr(field, '_queryset') and not getattr(field, FORM_SOURCE_LABEL, ''):
-                    for item in field._queryset:
+                    items = list(field._queryset[:FORM_SELECT_OPTIONS_MAX+1])
+                    if len(items) > FORM_SELECT_OPTIONS_MAX:
+                        token = set_options_source(field._queryset)
+                        field_dict['api_source'] = reverse('unicms_api:editorial-board-form-field-options',
+                                                           kwargs={'token': token})
+                        items = []
+                    for item in items:
                         field_dict['options'].append({"text": item.__str__(),
                                                       "value": item.pk})
                 elif hasattr(field, '_choices'):
@@ -79,6 +113,13 @@ class UniCMSFormSerializer():
         return form_fields
 
 
+class UniCMSSelectOptionsSerializer(serializers.Serializer):
+
+    def to_representation(self, instance):
+        return {'value': instance.pk,
+                'text': instance.__str__()}
+
+
 class UniCMSContentTypeClass(serializers.ModelSerializer):
     def to_representation(self, instance):
         data = super().to_representation(instance)
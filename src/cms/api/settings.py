@@ -10,3 +10,29 @@ LOCKS_CACHE_TTL = 25
 LOCK_MESSAGE = _("Unable to make changes. "
                  "{user} is currently editing this item")
 FORM_SOURCE_LABEL = 'api_source'
+
+# form schema cache
+FORM_CACHE_ENABLED = True
+FORM_CACHE_KEY_PREFIX = f'{CMS_CACHE_KEY_PREFIX}forms_'
+# in seconds
+FORM_CACHE_TTL = 3600
+# lazy options sources must outlive the schemas that reference them
+FORM_OPTIONS_SOURCE_TTL = 86400
+# select fields with more options are served through a lazy api_source
+FORM_SELECT_OPTIONS_MAX = 100
+# searchable fields of the lazy options, the ones shown by __str__.
+# Options of the other models can't be searched
+FORM_OPTIONS_SEARCH_FIELDS = {
+    'cmscarousels.carousel': ['name'],
+    'cmscontacts.contact': ['name'],
+    'cmscontexts.webpath': ['name'],
+    'cmscontexts.website': ['domain'],
+    'cmsmedias.media': ['title'],
+    'cmsmedias.mediacollection': ['name'],
+    'cmsmenus.navigationbar': ['name'],
+    'cmspages.page': ['name'],
+    'cmspublications.category': ['name'],
+    'cmspublications.publication': ['name', 'title'],
+    'cmstemplates.pagetemplate': ['name'],
+    'cmstemplates.templateblock': ['name'],
+}
@@ -0,0 +1,29 @@
+from django.apps import apps
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+
+from . cache import bump_model_generation
+
+
+def get_options_models():
+    """
+    models that can be options of a form select field:
+    the ones referenced by relation fields (ModelForm choice fields)
+    """
+    return {field.related_model
+            for model in apps.get_models()
+            for field in model._meta.get_fields()
+            if field.is_relation and field.concrete and field.related_model}
+
+
+def form_options_changed(sender, *args, **kwargs):
+    model_label = sender._meta.label_lower
+    bump_model_generation(model_label)
+    # a schema rebuilt before the commit would see the previous state
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: bump_model_generation(model_label))
+
+
+for model in get_options_models():
+    post_save.connect(form_options_changed, sender=model)
+    post_delete.connect(form_options_changed, sender=model)
@@ -1,5 +1,6 @@
 import logging
 
+from django.contrib.admin.models import LogEntry
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
@@ -98,6 +99,10 @@ class CarouselAPIUnitTest(TestCase):
                         follow=1)
         carousel.refresh_from_db()
         assert carousel.name == 'patched'
+        # changed fields only in item history
+        log = LogEntry.objects.filter(object_id=carousel.pk,
+                                      content_type=content_type).latest('pk')
+        assert log.change_message.endswith(": {'name': 'patched'}")
 
         # PUT
         carousel.created_by = None
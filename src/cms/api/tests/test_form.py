@@ -0,0 +1,131 @@
+import logging
+
+from unittest.mock import patch
+
+from django.contrib.admin.models import LogEntry, CHANGE
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cms.contexts.tests import ContextUnitTest
+
+from cms.pages.tests import PageUnitTest
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class FormCacheAPIUnitTest(TestCase):
+
+    def setUp(self):
+        pass
+
+    def _get_field(self, req, url, field_name):
+        res = req.get(url)
+        for field in res.json():
+            if field['id'] == field_name:
+                return field
+
+    def test_form_cache(self):
+        """
+        Form schemas are cached and invalidated by model changes
+        """
+        req = Client()
+        user = ContextUnitTest.create_user(username='staff',
+                                           is_staff=True,
+                                           is_superuser=True)
+        webpath = ContextUnitTest.create_webpath()
+        page = PageUnitTest.create_page(webpath=webpath)
+        req.force_login(user)
+
+        url = reverse('unicms_api:editorial-board-site-webpath-page-related-form',
+                      kwargs={'site_id': webpath.site.pk,
+                              'webpath_id': webpath.pk,
+                              'page_id': page.pk})
+        field = self._get_field(req, url, 'related_page')
+        assert page.pk in [i['value'] for i in field['options']]
+
+        # options are taken from cache
+        with CaptureQueriesContext(connection) as queries:
+            field = self._get_field(req, url, 'related_page')
+        assert not [i for i in queries.captured_queries
+                    if 'cmspages_page' in i['sql']]
+        assert page.pk in [i['value'] for i in field['options']]
+
+        # a new page invalidates the cached schema
+        related = PageUnitTest.create_page(webpath=webpath,
+                                           name='related page test')
+        field = self._get_field(req, url, 'related_page')
+        assert related.pk in [i['value'] for i in field['options']]
+
+        # a form built with other arguments gets its own schema
+        other_url = reverse('unicms_api:editorial-board-site-webpath-page-related-form',
+                            kwargs={'site_id': webpath.site.pk,
+                                    'webpath_id': webpath.pk,
+                                    'page_id': related.pk})
+        field = self._get_field(req, other_url, 'page')
+        assert [i['value'] for i in field['options']] == [related.pk]
+
+    def test_form_options_models(self):
+        """
+        Only models that can be select options invalidate the schemas
+        """
+        user = ContextUnitTest.create_user(username='staff', is_staff=True)
+        webpath = ContextUnitTest.create_webpath()
+        with patch('cms.api.signals.bump_model_generation') as bump:
+            page = PageUnitTest.create_page(webpath=webpath)
+        assert 'cmspages.page' in [i[0][0] for i in bump.call_args_list]
+        with patch('cms.api.signals.bump_model_generation') as bump:
+            LogEntry.objects.create(user=user,
+                                    object_id=str(page.pk),
+                                    object_repr=str(page),
+                                    action_flag=CHANGE)
+        assert not bump.called
+
+    def test_form_lazy_options(self):
+        """
+        Large querysets are served through a lazy api_source
+        """
+        req = Client()
+        user = ContextUnitTest.create_user(username='staff',
+                                           is_staff=True,
+                                           is_superuser=True)
+        webpath = ContextUnitTest.create_webpath()
+        page = PageUnitTest.create_page(webpath=webpath)
+        related = PageUnitTest.create_page(webpath=webpath,
+                                           name='related page test')
+
+        url = reverse('unicms_api:editorial-board-site-webpath-page-related-form',
+                      kwargs={'site_id': webpath.site.pk,
+                              'webpath_id': webpath.pk,
+                              'page_id': page.pk})
+        req.force_login(user)
+        with patch('cms.api.serializers.FORM_SELECT_OPTIONS_MAX', 1):
+            field = self._get_field(req, url, 'related_page')
+        assert not field['options']
+        api_source = field['api_source']
+        assert api_source
+
+        res = req.get(api_source)
+        assert res.json()['count'] == 2
+        res = req.get(api_source, {'search': 'related page'})
+        assert [i['value'] for i in res.json()['results']] == [related.pk]
+        # only the allowed fields are searched
+        res = req.get(api_source, {'search': 'titolo pagina'})
+        assert res.json()['count'] == 0
+        res = req.get(f'{api_source}{related.pk}/')
+        assert res.json()['value'] == related.pk
+
+        # staff users only
+        req.logout()
+        res = req.get(api_source)
+        assert res.status_code == 403
+
+        # unknown sources
+        req.force_login(user)
+        url = reverse('unicms_api:editorial-board-form-field-options',
+                      kwargs={'token': 'unknown'})
+        res = req.get(url)
+        assert res.status_code == 404
@@ -1,16 +1,25 @@
 import logging
+import os
+import zipfile
+
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from unittest.mock import patch
 
 from django.conf import settings
+from django.contrib.admin.models import LogEntry
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
-from django.test import Client, TestCase
+from django.test import Client, TestCase, TransactionTestCase
 from django.test.client import encode_multipart
 from django.urls import reverse
 
 from cms.contexts.tests import ContextUnitTest
 
+from cms.medias.bulk import extract_file, iter_archive
 from cms.medias.models import Media
+from cms.medias.processing import encode_webp
 from cms.medias.tests import MediaUnitTest
 
 logger = logging.getLogger(__name__)
@@ -174,3 +183,195 @@ class MediaAPIUnitTest(TestCase):
         req.force_login(user)
         res = req.get(url)
         assert isinstance(res.json(), list)
+
+    def test_media_processing_status(self):
+        """
+        Media images optimized after the upload
+        """
+        req = Client()
+        user = ContextUnitTest.create_user(is_staff=True, is_superuser=True)
+        req.force_login(user)
+        path = f'{settings.MEDIA_ROOT}/images/categories/eventi.jpg'
+        url = reverse('unicms_api:medias')
+
+        with patch('cms.medias.hooks.CMS_MEDIA_PROCESSING_QUEUE', True):
+            with self.captureOnCommitCallbacks() as callbacks:
+                with open(path, 'rb') as img_file:
+                    res = req.post(url, data={'title': 'media processing',
+                                              'description': 'blah blah',
+                                              'file': img_file})
+            # stored as uploaded
+            assert res.json()['processing_status'] == 'pending'
+            media = Media.objects.get(pk=res.json()['id'])
+            original = media.file.name
+            assert media.file_type == 'image/jpeg'
+            assert media.file.storage.exists(original)
+
+            for callback in callbacks:
+                callback()
+
+        url = reverse('unicms_api:media', kwargs={'pk': media.pk})
+        res = req.get(url).json()
+        assert res['processing_status'] == 'done'
+        media.refresh_from_db()
+        assert media.file.name.endswith('.webp')
+        assert media.file_type == 'image/webp'
+        assert media.file_size == media.file.size
+        assert not media.file.storage.exists(original)
+
+        # edits of a processed media don't touch its file
+        processed = media.file.name
+        with patch('cms.medias.hooks.CMS_MEDIA_PROCESSING_QUEUE', True):
+            for title in ('edited', 'edited again'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    res = req.patch(url, data={'title': title},
+                                    content_type='application/json')
+                assert res.status_code == 200
+                media.refresh_from_db()
+                assert media.file.name == processed
+                assert media.processing_status == 'done'
+        media.delete()
+
+    def test_media_deduplication(self):
+        """
+        Uploads of the same file share the stored one
+        """
+        req = Client()
+        user = ContextUnitTest.create_user(is_staff=True, is_superuser=True)
+        req.force_login(user)
+        path = f'{settings.MEDIA_ROOT}/unit_tests/download.jpeg'
+        url = reverse('unicms_api:medias')
+
+        medias = []
+        for title in ('logo', 'logo again'):
+            with open(path, 'rb') as img_file:
+                res = req.post(url, data={'title': title,
+                                          'description': 'blah blah',
+                                          'file': img_file})
+            medias.append(Media.objects.get(pk=res.json()['id']))
+        first, second = medias
+        assert len(first.file_hash) == 64
+        assert first.file_hash == second.file_hash
+        assert first.file.name == second.file.name
+        assert second.file_type == first.file_type
+
+        # the file is removed with the last media
+        first.delete()
+        assert second.file.storage.exists(second.file.name)
+        second.delete()
+        assert not second.file.storage.exists(second.file.name)
+
+    def test_media_bulk_upload(self):
+        """
+        Many files in a request, in a collection
+        """
+        req = Client()
+        user = ContextUnitTest.create_user(is_staff=True, is_superuser=True)
+        req.force_login(user)
+        collection = MediaUnitTest.create_media_collection()
+        url = reverse('unicms_api:medias-bulk')
+        path = f'{settings.MEDIA_ROOT}/unit_tests/download.jpeg'
+        invalid = f'{settings.MEDIA_ROOT}/unit_tests/icon_small.arj'
+
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zfile:
+            zfile.write(path, 'gallery/download.jpeg')
+            zfile.write(invalid, 'gallery/icon_small.arj')
+            zfile.writestr('gallery/.DS_Store', b'')
+        archive.seek(0)
+        archive.name = 'gallery.zip'
+
+        # extracted one at a time to temporary files
+        uploads = dict(iter_archive(archive))
+        assert uploads['download.jpeg'].temporary_file_path()
+        assert uploads['download.jpeg'].size == os.path.getsize(path)
+        for upload in uploads.values():
+            upload.close()
+        with zipfile.ZipFile(archive) as zfile, \
+             patch('cms.medias.bulk.FILE_MAX_SIZE', 10):
+            info = zfile.getinfo('gallery/download.jpeg')
+            # sizes in headers are not trusted
+            assert extract_file(zfile, info, 'download.jpeg') is None
+        archive.seek(0)
+
+        # no files
+        assert req.post(url, data={'description': 'gallery'}).status_code == 400
+
+        logs = LogEntry.objects.count()
+        with open(path, 'rb') as f1, open(path, 'rb') as f2, \
+             patch('cms.api.cache.bump_model_generation') as bump, \
+             self.captureOnCommitCallbacks(execute=True):
+            res = req.post(url, data={'files': [f1, f2],
+                                      'archive': archive,
+                                      'description': 'gallery',
+                                      'collection': collection.pk})
+        # select options of the bulk inserted models
+        bumped = {i[0][0] for i in bump.call_args_list}
+        assert {'cmsmedias.media', 'cmsmedias.mediacollectionitem'} <= bumped
+        assert res.status_code == 201
+        data = res.json()
+        assert data['created'] == 3
+        assert data['invalid'] == 1
+        assert [i['status'] for i in data['results']] == ['created', 'shared',
+                                                          'shared', 'invalid']
+        assert data['results'][3]['errors']
+
+        medias = Media.objects.filter(pk__in=[i['id'] for i in data['results'][:3]])
+        assert medias.count() == 3
+        # stored once
+        assert len({media.file.name for media in medias}) == 1
+        media = medias.first()
+        assert media.title == 'download'
+        assert media.file_type == 'image/webp'
+        assert media.file.storage.exists(media.file.name)
+        assert collection.mediacollectionitem_set.filter(media__in=medias).count() == 3
+        assert LogEntry.objects.count() == logs + 3
+
+        # limit
+        with patch('cms.api.views.media.CMS_MEDIA_BULK_MAX_FILES', 1):
+            with open(path, 'rb') as f1, open(path, 'rb') as f2:
+                res = req.post(url, data={'files': [f1, f2]})
+            assert res.status_code == 400
+            # archives are not extracted
+            archive.seek(0)
+            with open(path, 'rb') as f1, open(path, 'rb') as f2, \
+                 open(path, 'rb') as f3:
+                res = req.post(url, data={'files': [f1, f2, f3],
+                                          'archive': archive})
+            assert res.status_code == 400
+
+        collection.mediacollectionitem_set.filter(media__in=medias).delete()
+        for media in medias:
+            media.delete()
+        assert not media.file.storage.exists(media.file.name)
+
+    def test_media_processing_pool(self):
+        path = f'{settings.MEDIA_ROOT}/images/categories/eventi.jpg'
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            content = pool.submit(encode_webp, path).result()
+        assert content[8:12] == b'WEBP'
+
+
+class MediaProcessingTransactionUnitTest(TransactionTestCase):
+
+    def test_media_processing_autocommit(self):
+        """
+        API uploads aren't atomic, media are processed once saved
+        """
+        req = Client()
+        user = ContextUnitTest.create_user(is_staff=True, is_superuser=True)
+        req.force_login(user)
+        path = f'{settings.MEDIA_ROOT}/images/categories/eventi.jpg'
+        url = reverse('unicms_api:medias')
+
+        with patch('cms.medias.hooks.CMS_MEDIA_PROCESSING_QUEUE', True):
+            with open(path, 'rb') as img_file:
+                res = req.post(url, data={'title': 'media processing',
+                                          'description': 'blah blah',
+                                          'file': img_file})
+        assert res.status_code == 201
+        media = Media.objects.get(pk=res.json()['id'])
+        assert media.processing_status == 'done'
+        assert media.file.name.endswith('.webp')
+        assert media.file_type == 'image/webp'
+        media.delete()
@@ -1,10 +1,17 @@
 import logging
 
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import TestCase
 
 from cms.carousels.tests import CarouselUnitTest
 from cms.contexts.tests import ContextUnitTest
 
+from cms.contexts.models import EditorialBoardLock, EditorialBoardLockUser
+
+from rest_framework.exceptions import PermissionDenied
+
+from .. concurrency import LockService
 from .. views.generics import check_locks
 
 
@@ -34,3 +41,48 @@ class RedisLockTest(TestCase):
             check_locks(user=user2, item=carousel)
         except: # pragma: no cover
             logger.info('Exception raised! right!')
+
+    def test_lock_service(self):
+        """
+        locks of many objects, on a local cache
+        """
+        user1 = ContextUnitTest.create_user(username='user1')
+        user2 = ContextUnitTest.create_user(username='user2')
+        carousels = [CarouselUnitTest.create_carousel(name=f'carousel{i}')
+                     for i in range(3)]
+        content_type = ContentType.objects.get_for_model(carousels[0])
+        service = LockService(cache=LocMemCache('unicms-locks-test', {}),
+                              ttl=25)
+        for carousel in carousels[:2]:
+            service.set_lock(user1.pk, content_type.pk, carousel.pk)
+        user_id, ttl = service.get_lock(content_type.pk, carousels[0].pk)
+        assert user_id == user1.pk
+        assert 0 < ttl <= 25
+        assert service.get_lock(content_type.pk, carousels[2].pk) == (0, 0)
+
+        # no queries if the user holds the locks
+        with self.assertNumQueries(0):
+            assert service.get_conflicts(carousels, user1) == {}
+            service.check(carousels, user1)
+        # owners loaded once, for the conflicts only
+        with self.assertNumQueries(1):
+            conflicts = service.get_conflicts(carousels, user2)
+        assert set(conflicts) == set(carousels[:2])
+        assert conflicts[carousels[0]][0] == user1
+        with self.assertRaises(PermissionDenied):
+            service.check(carousels, user2)
+
+        # editorial board locks, in a single query
+        lock = EditorialBoardLock.objects.create(content_type=content_type,
+                                                 object_id=carousels[2].pk)
+        EditorialBoardLockUser.objects.create(lock=lock, user=user1)
+        with self.assertNumQueries(1):
+            allowed = service.check_board_locks(carousels, user2)
+        assert allowed == {carousels[0]: True,
+                           carousels[1]: True,
+                           carousels[2]: False}
+        assert all(service.check_board_locks(carousels, user1).values())
+        assert not EditorialBoardLockUser.check_for_locks(carousels[2], user2)
+
+        service = LockService(cache=service.cache, enabled=False)
+        assert service.get_conflicts(carousels, user2) == {}
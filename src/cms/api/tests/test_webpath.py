@@ -3,13 +3,29 @@ import logging
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
-from cms.contexts.models import (EditorialBoardLock,
+from cms.contexts.models import (EditorialBoardEditors,
+                                 EditorialBoardLock,
                                  EditorialBoardLockUser,
+                                 ScheduledTransition,
                                  WebPath)
+from cms.contexts.sites import get_websites
 from cms.contexts.tests import ContextUnitTest
+from cms.pages.models import (Page,
+                              PageBlock,
+                              PageHeading,
+                              PageHeadingLocalization,
+                              PageLocalization,
+                              PageMenu,
+                              PageRelated)
+from cms.pages.tests import PageUnitTest
+from cms.publications.models import PublicationContext
+from cms.publications.tests import PublicationUnitTest
 
 
 logger = logging.getLogger(__name__)
@@ -48,6 +64,56 @@ class WebpathAPIUnitTest(TestCase):
         res = req.get(url, {'not_existent_param': True})
         assert isinstance(res.json(), dict)
 
+    def test_list_optimized(self):
+        req = Client()
+        ebu = ContextUnitTest.create_editorialboard_user(permission=1)
+        user = ebu.user
+        user.is_staff = True
+        user.save()
+        req.force_login(user)
+        root = ebu.webpath
+        site = root.site
+        branch = ContextUnitTest.create_webpath(path='branch', parent=root)
+        leaf = ContextUnitTest.create_webpath(path='leaf', parent=branch)
+        EditorialBoardEditors.objects.create(user=user, webpath=branch,
+                                             permission=5, is_active=True)
+        url = reverse('unicms_api:editorial-board-site-webpaths',
+                      kwargs={'site_id': site.pk})
+
+        def get_list(children):
+            for i in range(children):
+                child = ContextUnitTest.create_webpath(path=f'child-{i}-{children}',
+                                                       parent=leaf,
+                                                       alias=branch if i % 2 else None)
+                if i == 0:
+                    EditorialBoardEditors.objects.create(user=user,
+                                                         webpath=child,
+                                                         permission=3,
+                                                         is_active=True)
+            # websites are loaded once per process
+            get_websites()
+            with CaptureQueriesContext(connection) as ctx:
+                res = req.get(url, {'page_size': 100}).json()
+            return res, len(ctx.captured_queries)
+
+        res, few_queries = get_list(2)
+        res, many_queries = get_list(8)
+        # the number of queries doesn't depend on the number of rows
+        assert few_queries == many_queries
+
+        webpaths = {i.pk: i for i in WebPath.objects.filter(site=site)}
+        for item in res['results']:
+            # same permissions of a single webpath lookup
+            webpath = webpaths[item['id']]
+            assert item['permission_id'] == \
+                   EditorialBoardEditors.get_permission(webpath, user)
+            # shallow parents
+            if item['parent']:
+                assert item['parent']['id'] == webpath.parent_id
+                assert 'parent' not in item['parent']
+                assert item['get_parent_fullpath'] == \
+                       webpath.parent.get_full_path()
+
     def test_get(self):
         req = Client()
         ebu = ContextUnitTest.create_editorialboard_user()
@@ -562,3 +628,57 @@ class WebpathAPIUnitTest(TestCase):
                               'pk': webpath.pk})
         res = req.get(url)
         assert isinstance(res.json(), list)
+
+    def test_clone_tree(self):
+        req = Client()
+        user = ContextUnitTest.create_user(is_staff=True, is_superuser=True)
+        req.force_login(user)
+        root = ContextUnitTest.create_webpath(path='department')
+        child = ContextUnitTest.create_webpath(path='courses', parent=root)
+        alias = ContextUnitTest.create_webpath(path='alias', parent=root, alias=child)
+        page = PageUnitTest.create_page(webpath=child)
+        page.tags.add('ciao')
+        PageUnitTest.create_page(webpath=child, draft_of=page.pk)
+        publication = PublicationUnitTest.create_pub(count=1)
+        PublicationContext.objects.create(publication=publication,
+                                          webpath=child,
+                                          date_start=timezone.localtime(),
+                                          date_end=timezone.localtime() + timezone.timedelta(hours=1),
+                                          is_active=True)
+        destination = ContextUnitTest.create_webpath(path='copies')
+        url = reverse('unicms_api:editorial-board-site-webpath-clone',
+                      kwargs={'site_id': root.site.pk,
+                              'pk': root.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = req.post(url, data={'parent': destination.pk},
+                           content_type='application/json')
+        assert res.status_code == 200
+
+        new_root = WebPath.objects.get(parent=destination)
+        new_child = WebPath.objects.get(parent=new_root, path=child.path)
+        assert new_child.fullpath == f'{destination.fullpath}{root.path}{child.path}'
+        assert new_child.created_by == user
+        # aliases inside the tree point to the clones
+        assert WebPath.objects.get(parent=new_root, path=alias.path).alias == new_child
+
+        new_page, new_draft = Page.objects.filter(webpath=new_child).order_by('pk')
+        assert new_draft.draft_of == new_page.pk
+        assert list(new_page.tags.names()) == ['ciao']
+        for model in (PageBlock, PageHeading, PageLocalization, PageMenu):
+            assert model.objects.filter(page=new_page).count() == \
+                   model.objects.filter(page=page).count()
+        assert PageHeadingLocalization.objects.filter(heading__page=new_page).exists()
+        assert PageRelated.objects.get(page=new_page).related_page == new_page
+
+        context = PublicationContext.objects.get(webpath=new_child)
+        assert context.url_cache == context.compute_url()
+        # scheduled with the new dates
+        assert ScheduledTransition.objects.filter(object_id=context.pk,
+                                                  field_name='date_end').exists()
+
+        # existent paths
+        res = req.post(url, data={'parent': destination.pk},
+                       content_type='application/json')
+        assert res.status_code == 400
+        assert WebPath.objects.filter(parent=destination).count() == 1
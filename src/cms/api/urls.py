@@ -6,6 +6,7 @@ from . views import (carousel, carousel_item, carousel_item_link,
                      carousel_item_localization,
                      contact, contact_info, contact_localization,
                      contact_info_localization,
+                     form_options,
                      media, media_collection, media_collection_item,
                      publication, publication_attachment,
                      publication_link, publication_localization,
@@ -52,6 +53,7 @@ eb_prefix = 'api/editorial-board'
 # medias
 m_prefix = f'{eb_prefix}/medias'
 urlpatterns += path(f'{m_prefix}/', media.MediaList.as_view(), name='medias'),
+urlpatterns += path(f'{m_prefix}/bulk/', media.MediaBulkUpload.as_view(), name='medias-bulk'),
 urlpatterns += path(f'{m_prefix}/<int:pk>/', media.MediaView.as_view(), name='media'),
 urlpatterns += path(f'{m_prefix}/<int:pk>/logs/', media.MediaLogsView.as_view(), name='media-logs'),
 urlpatterns += path(f'{m_prefix}/form/', media.MediaFormView.as_view(), name='media-form'),
@@ -159,6 +161,11 @@ urlpatterns += path(f'{coilo_prefix}/<int:pk>/logs/', contact_info_localization.
 urlpatterns += path(f'{coilo_prefix}/form/', contact_info_localization.ContactInfoLocalizationFormView.as_view(),
                     name='contact-info-localization-form'),
 
+# form fields lazy options
+fo_prefix = f'{eb_prefix}/form-options/<str:token>'
+urlpatterns += path(f'{fo_prefix}/', form_options.FormFieldOptionList.as_view(), name='editorial-board-form-field-options'),
+urlpatterns += path(f'{fo_prefix}/<int:pk>/', form_options.FormFieldOptionView.as_view(), name='editorial-board-form-field-option'),
+
 # websites
 urlpatterns += path(f'{eb_prefix}/sites/', website.EditorWebsiteList.as_view(), name='editorial-board-sites'),
 urlpatterns += path(f'{eb_prefix}/sites/<int:pk>/', website.EditorWebsiteView.as_view(), name='editorial-board-site'),
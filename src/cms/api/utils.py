@@ -26,12 +26,12 @@ def check_user_permission_on_object(user, obj, permission='change'):
     if obj.created_by == user: return {'granted': True}
 
     # check for Editorial Board locks
-    locks = EditorialBoardLockUser.get_object_locks(content_type=content_type,
-                                                    object_id=obj.pk)
+    key = (content_type.pk, obj.pk)
+    users = EditorialBoardLockUser.get_locks_users([key]).get(key)
     # if there is not lock, no permission
-    if not locks: return {'granted': False}
+    if not users: return {'granted': False}
     # if user is in lock user list, has permissions
-    if locks.filter(user=user).exists():
+    if user.pk in users:
         return {'granted': True, 'locked': True}
     # else no permissions but obj is locked
     return {'granted': False, 'locked':True}
@@ -71,7 +71,7 @@ class CarouselFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = CarouselForm()
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -112,7 +112,7 @@ class CarouselItemFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = CarouselItemForm(carousel_id=kwargs.get('carousel_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -120,7 +120,7 @@ class CarouselItemGenericFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = CarouselItemForm()
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
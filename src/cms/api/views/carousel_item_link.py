@@ -106,7 +106,7 @@ class CarouselItemLinksFormView(APIView):
     def get(self, *args, **kwargs):
         form = CarouselItemLinkForm(carousel_item_id=kwargs.get('carousel_item_id'),
                                     carousel_id=kwargs.get('carousel_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
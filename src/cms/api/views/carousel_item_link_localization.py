@@ -113,7 +113,7 @@ class CarouselItemLinkLocalizationFormView(APIView):
         form = CarouselItemLinkLocalizationForm(carousel_item_link_id=kwargs.get('carousel_item_link_id'),
                                                 carousel_item_id=kwargs.get('carousel_item_id'),
                                                 carousel_id=kwargs.get('carousel_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -105,7 +105,7 @@ class CarouselItemLocalizationFormView(APIView):
     def get(self, *args, **kwargs):
         form = CarouselItemLocalizationForm(carousel_item_id=kwargs.get('carousel_item_id'),
                                             carousel_id=kwargs.get('carousel_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
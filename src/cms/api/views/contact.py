@@ -73,7 +73,7 @@ class ContactFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = ContactForm()
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
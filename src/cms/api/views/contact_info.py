@@ -113,7 +113,7 @@ class ContactInfoFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = ContactInfoForm(contact_id=kwargs.get('contact_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -121,7 +121,7 @@ class ContactInfoGenericFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = ContactInfoForm()
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
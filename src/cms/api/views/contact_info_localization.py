@@ -105,7 +105,7 @@ class ContactInfoLocalizationFormView(APIView):
     def get(self, *args, **kwargs):
         form = ContactInfoLocalizationForm(contact_info_id=kwargs.get('contact_info_id'),
                                            contact_id=kwargs.get('contact_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -100,7 +100,7 @@ class ContactLocalizationFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = ContactLocalizationForm(contact_id=kwargs.get('contact_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -0,0 +1,64 @@
+from django.apps import apps
+from django.http import Http404
+
+from rest_framework import generics
+from rest_framework.permissions import IsAdminUser
+from rest_framework.schemas.openapi import AutoSchema
+
+from . generics import UniCMSListSelectOptionsAPIView
+from .. cache import get_options_source
+from .. serializers import UniCMSSelectOptionsSerializer
+
+
+class FormFieldOptionsMixin:
+    """
+    options of a select field stored by the form schema serializer
+    """
+
+    def get_source_queryset(self):
+        source = get_options_source(self.kwargs['token'])
+        if not source: raise Http404
+        model = apps.get_model(source['model'])
+        queryset = model._default_manager.all()
+        queryset.query = source['query']
+        self.search_fields = source.get('search_fields', [])
+        return queryset
+
+
+class FormFieldOptionListSchema(AutoSchema):
+    def get_operation_id(self, path, method):# pragma: no cover
+        return 'listFormFieldOptions'
+
+
+class FormFieldOptionList(FormFieldOptionsMixin,
+                          UniCMSListSelectOptionsAPIView):
+    """
+    """
+    description = ""
+    serializer_class = UniCMSSelectOptionsSerializer
+    schema = FormFieldOptionListSchema()
+
+    def get_queryset(self):
+        """
+        """
+        return self.get_source_queryset()
+
+
+class FormFieldOptionViewSchema(AutoSchema):
+    def get_operation_id(self, path, method):# pragma: no cover
+        return 'retrieveFormFieldOption'
+
+
+class FormFieldOptionView(FormFieldOptionsMixin,
+                          generics.RetrieveAPIView):
+    """
+    """
+    description = ""
+    permission_classes = [IsAdminUser]
+    serializer_class = UniCMSSelectOptionsSerializer
+    schema = FormFieldOptionViewSchema()
+
+    def get_queryset(self):
+        """
+        """
+        return self.get_source_queryset()
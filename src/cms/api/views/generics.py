@@ -1,22 +1,17 @@
 import logging
 
 from django.contrib.admin.models import ADDITION
-from django.contrib.auth import get_user_model
-from django.contrib.contenttypes.models import ContentType
 from django.db.models import ProtectedError
 from django.utils.translation import gettext_lazy as _
 
 from django_filters.rest_framework import DjangoFilterBackend
 
-from cms.contexts.utils import log_obj_event
+from cms.contexts.audit import log_obj_event
 
 from rest_framework import filters, generics
-from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAdminUser
 
-from .. concurrency import (get_lock_from_cache,
-                            # set_lock_to_cache,
-                            LOCK_MESSAGE)
+from .. concurrency import lock_service
 from .. exceptions import LoggedPermissionDenied
 from .. ordering import StableOrderingFilter
 from .. pagination import UniCmsApiPagination, UniCmsSelectOptionsApiPagination
@@ -34,10 +29,16 @@ class UniCMSListCreateAPIView(generics.ListCreateAPIView):
     filterset_fields = ['is_active', 'created', 'modified', 'created_by']
     pagination_class = UniCmsApiPagination
 
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self._created = serializer.instance
+
     def post(self, request, *args, **kwargs):
         post_request = super().post(request, *args, **kwargs)
-        model_class = self.serializer_class.Meta.model
-        item = model_class.objects.filter(pk=post_request.data['id']).first()
+        item = getattr(self, '_created', None)
+        if item is None: # pragma: no cover
+            model_class = self.serializer_class.Meta.model
+            item = model_class.objects.filter(pk=post_request.data['id']).first()
         log_obj_event(user=request.user,
                       obj=item,
                       data=request.data,
@@ -49,29 +50,31 @@ class UniCMSListCreateAPIView(generics.ListCreateAPIView):
 
 
 def check_locks(item, user):
-    content_type_id = ContentType.objects.get_for_model(item).pk
-    object_id = item.pk
-    user_id = user.pk
-    lock = get_lock_from_cache(content_type_id, object_id)
-    user_lock = lock[0]
-    owner_user = get_user_model().objects.filter(pk=user_lock).first()
-    if user_lock and not user_lock == user_id:
-        logger.debug(f'{user} tried to access to {owner_user} actually used by {item}')
-        raise PermissionDenied(LOCK_MESSAGE.format(user=owner_user,
-                                                   ttl=lock[1]),
-                               403)
-    # set_lock_to_cache(user_id, content_type_id, object_id)
+    lock_service.check([item], user)
 
 
 class UniCMSCachedRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
 
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self._updated = serializer.instance
+
+    def log_update(self, request, item):
+        # log action in item history, only the changed fields
+        updated = getattr(self, '_updated', None)
+        # the instance read before the update holds the old values
+        old = item if updated is not None and updated is not item else None
+        log_obj_event(user=request.user,
+                      obj=updated if updated is not None else item,
+                      data=request.data,
+                      old=old)
+
     def patch(self, request, *args, **kwargs):
         item = self.get_object()
         # check for locks
         check_locks(item, request.user)
         ok_response = super().patch(request, *args, **kwargs)
-        # log action in item history
-        log_obj_event(user=request.user, obj=item, data=request.data)
+        self.log_update(request, item)
         return ok_response
 
     def put(self, request, *args, **kwargs):
@@ -79,8 +82,7 @@ class UniCMSCachedRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPI
         # check for locks
         check_locks(item, request.user)
         ok_response = super().put(request, *args, **kwargs)
-        # log action in item history
-        log_obj_event(user=request.user, obj=item, data=request.data)
+        self.log_update(request, item)
         return ok_response
 
     def delete(self, request, *args, **kwargs):
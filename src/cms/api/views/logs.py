@@ -1,5 +1,6 @@
 from django.contrib.admin.models import LogEntry
 
+from cms.contexts.audit import audit_log
 from cms.contexts.serializers import LogEntrySerializer
 
 from rest_framework import filters, generics
@@ -25,6 +26,8 @@ class ObjectLogEntriesList(generics.ListAPIView):
         """
         """
         if object_id and content_type_id:
+            # entries still waiting in this process
+            audit_log.flush()
             return LogEntry.objects.filter(content_type__pk=content_type_id,
                                            object_id=object_id)
         return LogEntry.objects.none() # pragma: no cover
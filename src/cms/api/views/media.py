@@ -1,18 +1,27 @@
 import logging
 import os
 
+from itertools import islice
+
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.translation import gettext_lazy as _
 
 from cms.medias import settings as media_settings
+from cms.medias.bulk import (BULK_INVALID,
+                             CMS_MEDIA_BULK_MAX_FILES,
+                             bulk_upload,
+                             iter_archive)
 from cms.medias.forms import MediaForm
-from cms.medias.models import Media
+from cms.medias.models import Media, MediaCollection
 from cms.medias.serializers import MediaSerializer, MediaSelectOptionsSerializer
 from cms.templates.utils import secure_url
 
 from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.schemas.openapi import AutoSchema
@@ -40,11 +49,62 @@ class MediaList(UniCMSListCreateAPIView):
     description = ""
     search_fields = ['title', 'file', 'description', 'file_type', 'uuid']
     permission_classes = [MediaGetCreatePermissions]
-    filterset_fields = ['created', 'modified', 'created_by', 'file_type']
+    filterset_fields = ['created', 'modified', 'created_by', 'file_type',
+                        'processing_status', 'file_hash']
     serializer_class = MediaSerializer
     queryset = Media.objects.all()
 
 
+class MediaBulkUpload(APIView):
+    """
+    many files (multipart "files" and zip "archive"),
+    optionally added to a collection
+    """
+    description = ""
+    permission_classes = [MediaGetCreatePermissions]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        uploads = [(i.name, i) for i in request.FILES.getlist('files')]
+        try:
+            for archive in request.FILES.getlist('archive'):
+                # not extracted beyond the limit
+                if len(uploads) > CMS_MEDIA_BULK_MAX_FILES: break
+                uploads.extend(islice(iter_archive(archive),
+                                      CMS_MEDIA_BULK_MAX_FILES + 1 - len(uploads)))
+            return self.upload_files(request, uploads)
+        finally:
+            # extracted temporary files
+            for name, upload in uploads:
+                if not isinstance(upload, list): upload.close()
+
+    def upload_files(self, request, uploads):
+        if not uploads:
+            raise ValidationError({'files': _("No files uploaded")})
+        if len(uploads) > CMS_MEDIA_BULK_MAX_FILES:
+            raise ValidationError({'files': _("Maximum {} files").format(CMS_MEDIA_BULK_MAX_FILES)})
+
+        collection = None
+        if request.data.get('collection'):
+            collection = get_object_or_404(MediaCollection,
+                                           pk=request.data['collection'])
+            permission = check_user_permission_on_object(request.user,
+                                                         collection)
+            if not permission['granted']:
+                raise LoggedPermissionDenied(classname=self.__class__.__name__,
+                                             resource=request.method)
+
+        report = bulk_upload(uploads,
+                             user=request.user,
+                             description=request.data.get('description', ''),
+                             collection=collection)
+        invalid = len([i for i in report if i['status'] == BULK_INVALID])
+        return Response({'created': len(report) - invalid,
+                         'invalid': invalid,
+                         'results': report},
+                        status=201 if invalid < len(report) else 400)
+
+
 class MediaView(UniCMSCachedRetrieveUpdateDestroyAPIView):
     """
     """
@@ -92,7 +152,7 @@ class MediaFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = MediaForm()
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
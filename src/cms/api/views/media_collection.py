@@ -73,7 +73,7 @@ class MediaCollectionFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = MediaCollectionForm()
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -123,7 +123,7 @@ class MediaCollectionItemFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = MediaCollectionItemForm(collection_id=kwargs.get('collection_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -146,7 +146,7 @@ class MenuFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = MenuForm()
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
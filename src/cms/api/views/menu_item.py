@@ -143,7 +143,7 @@ class MenuItemFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = MenuItemForm(menu_id=kwargs.get('menu_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
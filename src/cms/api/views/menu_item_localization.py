@@ -105,7 +105,7 @@ class MenuItemLocalizationFormView(APIView):
     def get(self, *args, **kwargs):
         form = MenuItemLocalizationForm(menu_item_id=kwargs.get('menu_item_id'),
                                         menu_id=kwargs.get('menu_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -314,7 +314,7 @@ class PageFormView(APIView):
     def get(self, *args, **kwargs):
         form = PageForm(site_id=kwargs.get('site_id'),
                         webpath_id=kwargs.get('webpath_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -322,7 +322,7 @@ class PageGenericFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PageForm(site_id=kwargs.get('site_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
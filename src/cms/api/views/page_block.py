@@ -50,7 +50,7 @@ class PageBlockFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PageBlockForm(page_id=kwargs.get('page_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
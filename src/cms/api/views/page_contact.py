@@ -49,7 +49,7 @@ class PageContactFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PageContactForm(page_id=kwargs.get('page_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -122,7 +122,7 @@ class PageHeadingLocalizationFormView(APIView):
     def get(self, *args, **kwargs):
         form = PageHeadingLocalizationForm(page_id=kwargs.get('page_id'),
                                            heading_id=kwargs.get('heading_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -47,7 +47,7 @@ class PageLinkFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PageLinkForm(page_id=kwargs.get('page_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
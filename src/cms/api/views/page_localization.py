@@ -123,7 +123,7 @@ class PageLocalizationFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PageLocalizationForm(page_id=kwargs.get('page_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -48,7 +48,7 @@ class PageMediaFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PageMediaForm(page_id=kwargs.get('page_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -51,7 +51,7 @@ class PagePublicationFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PagePublicationForm(page_id=kwargs.get('page_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
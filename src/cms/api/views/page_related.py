@@ -46,7 +46,7 @@ class PageRelatedFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PageRelatedForm(page_id=kwargs.get('page_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -10,11 +10,17 @@ from cms.contexts.decorators import detect_language
 from cms.contexts.models import WebPath
 
 from cms.publications.forms import PublicationEditForm, PublicationForm
+from cms.publications.cache import (get_preview_from_cache,
+                                    make_preview_cache_key,
+                                    set_preview_to_cache)
 from cms.publications.models import Publication, PublicationContext
+from cms.publications.scheduler import publication_scheduler
 from cms.publications.serializers import (PublicationSerializer,
                                           PublicationContextSerializer,
+                                          PublicationContextPublicSerializer,
                                           PublicationSelectOptionsSerializer)
-from cms.publications.utils import publication_context_base_filter
+from cms.publications.utils import (publication_context_base_filter,
+                                    publication_context_related_objects)
 
 from rest_framework import filters, generics
 from rest_framework.permissions import IsAdminUser
@@ -60,7 +66,7 @@ class ApiPublicationsByContext(generics.ListAPIView):
     """
     description = 'ApiPublicationsByContext'
     pagination_class = UniCmsApiPagination
-    serializer_class = PublicationContextSerializer
+    serializer_class = PublicationContextPublicSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ['publication__title',
                      'publication__subheading',
@@ -76,7 +82,20 @@ class ApiPublicationsByContext(generics.ListAPIView):
         if category:
             query_params['publication__category__pk'] = category
         pubcontx = PublicationContext.objects.filter(**query_params)
-        return pubcontx
+        return publication_context_related_objects(pubcontx)
+
+    def list(self, request, *args, **kwargs):
+        # pagination links are absolute
+        filters = {'uri': request.build_absolute_uri()}
+        key = make_preview_cache_key(self.kwargs['webpath_id'], filters,
+                                     getattr(request, 'LANGUAGE_CODE', ''))
+        data = get_preview_from_cache(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            # valid until a publication context starts or ends
+            timeout = publication_scheduler.get_cache_timeout(self.kwargs['webpath_id'])
+            set_preview_to_cache(key, data, timeout)
+        return Response(data)
 
 
 class ApiPublicationsByContextCategorySchema(AutoSchema):
@@ -292,7 +311,7 @@ class PublicationFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PublicationForm()
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -300,7 +319,7 @@ class PublicationEditFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PublicationEditForm()
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -49,7 +49,7 @@ class PublicationLinkFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PublicationLinkForm(publication_id=kwargs.get('publication_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
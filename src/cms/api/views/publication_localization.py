@@ -104,7 +104,7 @@ class PublicationLocalizationFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PublicationLocalizationForm(publication_id=kwargs.get('publication_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -50,7 +50,7 @@ class PublicationMediaCollectionFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PublicationMediaCollectionForm(publication_id=kwargs.get('publication_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
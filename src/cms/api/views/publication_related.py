@@ -48,7 +48,7 @@ class PublicationRelatedFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PublicationRelatedForm(publication_id=kwargs.get('publication_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
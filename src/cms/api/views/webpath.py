@@ -13,10 +13,11 @@ from rest_framework.permissions import IsAdminUser
 from rest_framework.schemas.openapi import AutoSchema
 
 from cms.contexts import settings as contexts_settings
+from cms.contexts.cloning import clone_webpaths
 from cms.contexts.forms import WebPathForm, WebPathCloneForm
 from cms.contexts.models import EditorialBoardEditors, EditorialBoardLockUser, WebPath, WebSite
 from cms.contexts.serializers import WebPathSerializer, WebPathSelectOptionsSerializer
-from cms.contexts.utils import clone, is_publisher
+from cms.contexts.utils import is_publisher
 
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -51,7 +52,7 @@ class WebpathList(UniCMSListCreateAPIView):
             if not site.is_managed_by(self.request.user):
                 raise LoggedPermissionDenied(classname=self.__class__.__name__,
                                              resource=site)
-            return WebPath.objects.filter(site=site)
+            return WebPath.objects.filter(site=site).select_related('site')
         return WebPath.objects.none() # pragma: no cover
 
     def post(self, request, *args, **kwargs):
@@ -171,7 +172,7 @@ class WebpathView(UniCMSCachedRetrieveUpdateDestroyAPIView):
 class WebpathFormView(APIView):
     def get(self, *args, **kwargs):
         form = WebPathForm(site_id=kwargs.get('site_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -271,7 +272,7 @@ class WebpathAllList(generics.ListAPIView):
     """
     description = ""
     serializer_class = WebPathSerializer
-    queryset = WebPath.objects.all()
+    queryset = WebPath.objects.select_related('site')
     schema = EditorialBoardWebpathAllListSchema()
     permission_classes = [IsAdminUser]
     filter_backends = [filters.SearchFilter,
@@ -284,7 +285,7 @@ class WebpathAllList(generics.ListAPIView):
 class WebpathCloneFormView(APIView):
     def get(self, *args, **kwargs):
         form = WebPathCloneForm()
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -365,38 +366,23 @@ class WebpathCloneView(APIView):
             raise LoggedPermissionDenied(classname=self.__class__.__name__,
                                          resource=request.method)
 
-        # exclue relations
-        excluded_childrens = ['editorialboardeditors',
-                              'linked_page',
-                              'navigationbaritem']
-        if exclude_pages:
-            excluded_childrens.append('page')
-        if exclude_news:
-            excluded_childrens.append('publicationcontext')
-
-        # set new parent
-        custom_values = {'parent': parent}
-
         # set values to all childs
-        recursive_values = {'created_by': request.user,
-                            'modified_by': None,
-                            'site': parent.site,
-                            'date_start': timezone.localtime(),
-                            'date_end': timezone.localtime() + timezone.timedelta(days=30),
-                            'in_evidence_start': None,
-                            'in_evidence_end': None}
+        values = {'created_by': request.user,
+                  'modified_by': None,
+                  'date_start': timezone.localtime(),
+                  'date_end': timezone.localtime() + timezone.timedelta(days=30),
+                  'in_evidence_start': None,
+                  'in_evidence_end': None}
 
         # clone full tree or get only childs (useful to clone a root in another root!)
         to_apply = WebPath.objects.filter(parent=item) if only_childs else [item]
-        for element in to_apply:
-            try:
-                clone(element,
-                      excluded_fields=['created', 'modified'],
-                      excluded_childrens=excluded_childrens,
-                      custom_values=custom_values,
-                      recursive_custom_values=recursive_values)
-            except Exception as e: # pragma: no cover
-                raise LoggedValidationException(classname=self.__class__.__name__,
-                                                resource=request.method,
-                                                detail=e)
+        try:
+            clone_webpaths(to_apply, parent,
+                           values=values,
+                           exclude_pages=exclude_pages,
+                           exclude_news=exclude_news)
+        except Exception as e:
+            raise LoggedValidationException(classname=self.__class__.__name__,
+                                            resource=request.method,
+                                            detail=e)
         return Response(_("Cloning done with success!"))
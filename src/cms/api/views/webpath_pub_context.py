@@ -176,7 +176,7 @@ class PublicationContextFormView(APIView):
     def get(self, *args, **kwargs):
         form = PublicationContextForm(site_id=kwargs.get('site_id'),
                                       webpath_id=kwargs.get('webpath_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -184,7 +184,7 @@ class PublicationContextGenericFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = PublicationContextForm(site_id=kwargs.get('site_id'))
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
@@ -192,7 +192,7 @@ class EditorialBoardLockUserFormView(APIView):
 
     def get(self, *args, **kwargs):
         form = EditorialBoardLockUserForm()
-        form_fields = UniCMSFormSerializer.serialize(form)
+        form_fields = UniCMSFormSerializer.serialize(form, self.request.user)
         return Response(form_fields)
 
 
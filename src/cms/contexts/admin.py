@@ -6,7 +6,8 @@ from . models import (EditorialBoardEditors,
                       EditorialBoardLockUser,
                       WebPath,
                       WebSite,
-                      EntryUsedBy)
+                      EntryUsedBy,
+                      ScheduledTransition)
 
 
 class WebPathAdminInline(admin.TabularInline):
@@ -67,3 +68,10 @@ class EntryUsedByAdmin(admin.ModelAdmin):
     list_display = ('content_type', 'content_object',
                     'used_by_content_type', 'used_by_content_object')
     # raw_id_fields = ('object_id', 'used_by_object_id')
+
+
+@admin.register(ScheduledTransition)
+class ScheduledTransitionAdmin(admin.ModelAdmin):
+    list_filter = ('fire_at', 'content_type', 'field_name')
+    list_display = ('content_type', 'content_object',
+                    'field_name', 'fire_at')
@@ -0,0 +1,226 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.admin.models import LogEntry, ADDITION, CHANGE
+from django.contrib.contenttypes.models import ContentType
+from django.db import close_old_connections, connection, transaction
+from django.utils.translation import gettext as _
+
+from . import settings as app_settings
+
+
+logger = logging.getLogger(__name__)
+
+CMS_AUDIT_LOG_ASYNC = getattr(settings, 'CMS_AUDIT_LOG_ASYNC',
+                              app_settings.CMS_AUDIT_LOG_ASYNC)
+CMS_AUDIT_LOG_QUEUE_SIZE = getattr(settings, 'CMS_AUDIT_LOG_QUEUE_SIZE',
+                                   app_settings.CMS_AUDIT_LOG_QUEUE_SIZE)
+CMS_AUDIT_LOG_BATCH_SIZE = getattr(settings, 'CMS_AUDIT_LOG_BATCH_SIZE',
+                                   app_settings.CMS_AUDIT_LOG_BATCH_SIZE)
+CMS_AUDIT_LOG_FLUSH_INTERVAL = getattr(settings, 'CMS_AUDIT_LOG_FLUSH_INTERVAL',
+                                       app_settings.CMS_AUDIT_LOG_FLUSH_INTERVAL)
+
+# never logged, they change on every save
+EXCLUDED_FIELDS = ('id', 'created', 'modified',
+                   'created_by', 'modified_by',
+                   'object_content_type')
+
+
+def get_field_values(obj):
+    """
+    {field name: value} of the concrete fields of an instance,
+    without queries
+    """
+    return {field.name: field.value_from_object(obj)
+            for field in obj._meta.concrete_fields
+            if field.name not in EXCLUDED_FIELDS}
+
+
+def _loggable(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # files, dates, uuids ...
+    return str(value)
+
+
+def get_changes(obj, old=None, data={}):
+    """
+    compact diff of a saved instance: the fields that differ from
+    the old values or, if there aren't, the ones in the request data.
+    Many to many fields are taken from data
+    """
+    changes = {}
+    values = get_field_values(obj)
+    if old is not None:
+        old_values = get_field_values(old)
+        for name, value in values.items():
+            if value != old_values.get(name):
+                changes[name] = _loggable(value)
+    else:
+        for name, value in values.items():
+            if name in data:
+                changes[name] = _loggable(value)
+    for field in obj._meta.many_to_many:
+        if field.name in data and field.name not in EXCLUDED_FIELDS:
+            value = data.getlist(field.name) if hasattr(data, 'getlist') \
+                    else data[field.name]
+            changes[field.name] = _loggable(value) if not isinstance(value, list) \
+                                  else [_loggable(i) for i in value]
+    return changes
+
+
+def make_log_entry(user, obj, changes={}, action_flag=CHANGE):
+    """
+    unsaved LogEntry of an action on an object
+    """
+    msg = _("changed") if action_flag == CHANGE else _("added")
+    return LogEntry(user_id=user.pk,
+                    # cached by ContentType manager
+                    content_type_id=ContentType.objects.get_for_model(obj).pk,
+                    object_id=str(obj.pk),
+                    object_repr=str(obj)[:200],
+                    action_flag=action_flag,
+                    change_message=f'{msg}: {changes}' if changes else msg)
+
+
+class AuditLog(object):
+    """
+    LogEntries buffer.
+    Entries logged in a transaction are queued when it's committed
+    (and dropped if it's rolled back), a background thread writes them
+    with bulk inserts, every flush_interval seconds or when batch_size
+    entries are waiting.
+    The queue is bounded: when it's full, callers write the waiting
+    entries themselves (back-pressure), they are never discarded.
+    If not threaded, entries are written immediately,
+    in the caller transaction.
+    """
+
+    def __init__(self,
+                 threaded=CMS_AUDIT_LOG_ASYNC,
+                 queue_size=CMS_AUDIT_LOG_QUEUE_SIZE,
+                 batch_size=CMS_AUDIT_LOG_BATCH_SIZE,
+                 flush_interval=CMS_AUDIT_LOG_FLUSH_INTERVAL):
+        self.threaded = threaded
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.pid = None
+        self._writer = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # entries of the parent are written by the parent
+        self.lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=self.queue.maxsize)
+        self._writer = None
+
+    def log(self, entries):
+        if not entries: return
+        if not self.threaded:
+            self.write(entries)
+        elif connection.in_atomic_block:
+            transaction.on_commit(lambda: self.put(entries))
+        else:
+            self.put(entries)
+
+    def put(self, entries):
+        self._start_writer()
+        for entry in entries:
+            try:
+                self.queue.put_nowait(entry)
+            except queue.Full:
+                logger.warning('Audit log queue is full, flushing it')
+                self.flush()
+                self.queue.put(entry)
+
+    def get_batch(self, timeout=0):
+        """
+        waiting entries, at most batch_size.
+        Waits up to timeout seconds for the first one
+        """
+        batch = []
+        try:
+            batch.append(self.queue.get(timeout=timeout) if timeout
+                         else self.queue.get_nowait())
+            while len(batch) < self.batch_size:
+                batch.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def write(self, entries):
+        try:
+            LogEntry.objects.bulk_create(entries, batch_size=self.batch_size)
+        except Exception as e: # pragma: no cover
+            logger.exception(f'Audit log: {len(entries)} entries not written: {e}')
+            return 0
+        return len(entries)
+
+    def flush(self):
+        """
+        writes all the waiting entries, returns their number
+        """
+        written = 0
+        batch = self.get_batch()
+        while batch:
+            written += self.write(batch)
+            batch = self.get_batch()
+        return written
+
+    def _start_writer(self):
+        pid = os.getpid()
+        if self._writer and self._writer.is_alive() and self.pid == pid:
+            return
+        with self.lock:
+            if self._writer and self._writer.is_alive() and self.pid == pid:
+                return
+            self.pid = pid
+            self._writer = threading.Thread(target=self._run_writer,
+                                            args=(pid,),
+                                            name='unicms-audit-log',
+                                            daemon=True)
+            self._writer.start()
+
+    def _run_writer(self, pid):
+        while self.pid == pid:
+            batch = self.get_batch(timeout=self.flush_interval)
+            if not batch: continue
+            # the next entries, if they are coming
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and time.monotonic() < deadline:
+                more = self.get_batch(timeout=max(deadline - time.monotonic(), 0.01))
+                if not more: break
+                batch.extend(more)
+            close_old_connections()
+            self.write(batch)
+
+
+audit_log = AuditLog()
+# entries still waiting when the process exits
+atexit.register(audit_log.flush)
+
+
+def log_obj_event(user, obj, data={}, action_flag=CHANGE, old=None):
+    """
+    logs an action on an object, with the changed fields.
+    old is the instance before the change
+    """
+    changes = get_changes(obj, old=old, data=data) \
+              if action_flag in (ADDITION, CHANGE) else {}
+    audit_log.log([make_log_entry(user, obj, changes, action_flag)])
+
+
+def log_objs_event(user, objs, action_flag=CHANGE):
+    """
+    logs an action on many objects
+    """
+    audit_log.log([make_log_entry(user, obj, action_flag=action_flag)
+                   for obj in objs])
@@ -2,6 +2,7 @@ import hashlib
 import json
 import logging
 import re
+import time
 import urllib
 
 from collections import OrderedDict
@@ -30,6 +31,32 @@ CMS_CACHE_ENABLED = getattr(settings,
                             app_settings.CMS_CACHE_ENABLED)
 
 
+GENERATION_KEY = f'{CMS_CACHE_KEY_PREFIX}pages_generation'
+
+
+def get_cache_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, int(time.time()), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def purge_cms_cache():
+    """
+    invalidates all the cached pages
+    """
+    get_cache_generation()
+    try:
+        generation = cache.incr(GENERATION_KEY)
+    except ValueError: # pragma: no cover
+        # evicted between the two calls
+        cache.add(GENERATION_KEY, int(time.time()), None)
+        generation = cache.get(GENERATION_KEY)
+    logger.debug(f'uniCMS Cache - pages generation bumped to {generation}')
+    return generation
+
+
 def make_cache_key(request):
     v = request.get_raw_uri()
     up = urllib.parse.urlparse(v)
@@ -39,7 +66,7 @@ def make_cache_key(request):
         qs['lang'] = [request.LANGUAGE_CODE]
     qs_ser = json.dumps(dict(qs))
 
-    value_key = f'{up.netloc}_{up.path}_{qs_ser}'
+    value_key = f'{up.netloc}_{up.path}_{qs_ser}_{get_cache_generation()}'
     hashed_v = hashlib.sha256(value_key.encode()).hexdigest()
     cache_key = f'{CMS_CACHE_KEY_PREFIX}{hashed_v}'
     return cache_key
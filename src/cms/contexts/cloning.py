@@ -0,0 +1,252 @@
+import logging
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+
+from . exceptions import ReservedWordException
+from . models import WebPath
+from . scheduler import bulk_schedule_transitions
+from . sitemaps import mark_sitemaps_dirty
+from . utils import append_slash, load_hooks, sanitize_path
+
+
+logger = logging.getLogger(__name__)
+
+# {model label: fk to the page}, cloned with their pages
+PAGE_CHILDS = {'cmspages.PageBlock': 'page',
+               'cmspages.PageCarousel': 'page',
+               'cmspages.PageContact': 'page',
+               'cmspages.PageHeading': 'page',
+               'cmspages.PageLink': 'page',
+               'cmspages.PageLocalization': 'page',
+               'cmspages.PageMedia': 'page',
+               'cmspages.PageMediaCollection': 'page',
+               'cmspages.PageMenu': 'page',
+               'cmspages.PagePublication': 'page',
+               'cmspages.PageRelated': 'page'}
+
+
+def copy_instance(obj, values={}, **fields):
+    """
+    unsaved copy of a model instance.
+    values are set only if the model has those fields
+    """
+    model = obj.__class__
+    data = {field.attname: getattr(obj, field.attname)
+            for field in model._meta.concrete_fields
+            if not field.primary_key}
+    for field_name, value in values.items():
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            continue
+        if field.concrete:
+            data[field.attname] = value.pk if field.is_relation and value else value
+    for field_name, value in fields.items():
+        data[field_name] = value
+    return model(**data)
+
+
+def bulk_insert(model, objs, parent_field):
+    """
+    bulk_create, with primary keys also where
+    the database doesn't return them
+    """
+    model.objects.bulk_create(objs)
+    if not objs or objs[0].pk is not None: return objs
+    # the new rows are the only ones of their (new) parents,
+    # in insert order
+    parents = {getattr(obj, f'{parent_field}_id') for obj in objs}
+    pks = model.objects.filter(**{f'{parent_field}__in': parents})\
+                       .order_by('pk')\
+                       .values_list('pk', flat=True)
+    for obj, pk in zip(objs, pks):
+        obj.pk = pk
+        obj._state.adding = False
+    return objs
+
+
+def get_subtree(webpaths):
+    """
+    lists of the descendant WebPaths, level by level
+    """
+    levels = []
+    parents = [webpath.pk for webpath in webpaths]
+    while parents:
+        level = list(WebPath.objects.filter(parent__in=parents))
+        if not level: break
+        levels.append(level)
+        parents = [webpath.pk for webpath in level]
+    return levels
+
+
+def clone_webpaths(webpaths, parent, values={},
+                   exclude_pages=False, exclude_news=False):
+    """
+    clones WebPaths, with their subtrees, pages and publication
+    contexts, under parent. Rows are inserted in bulk, model by model,
+    in one transaction. CMS_HOOKS POSTSAVE flow and caches invalidations
+    run once, after the commit.
+    Returns the new WebPaths
+    """
+    cloned = {}
+    with transaction.atomic():
+        new_webpaths = _clone_webpaths(webpaths, parent, values, cloned)
+        if not exclude_pages:
+            _clone_pages(cloned, values)
+        if not exclude_news:
+            _clone_publication_contexts(cloned, values)
+
+        created = [obj for model_cloned in cloned.values()
+                   for obj in model_cloned.values()]
+        bulk_schedule_transitions(created)
+        transaction.on_commit(lambda: webpaths_cloned(parent.site_id, created))
+    logger.info(f'WebPath clone: {len(created)} objects cloned in {parent}')
+    return new_webpaths
+
+
+def webpaths_cloned(site_id, objs):
+    """
+    deferred hooks and invalidations of the cloned objects
+    """
+    for obj in objs:
+        load_hooks(obj, 'POSTSAVE')
+    mark_sitemaps_dirty([site_id])
+
+    from cms.api.cache import bump_model_generation
+    from cms.publications.cache import bump_preview_generation
+    bump_preview_generation()
+    for label in {obj._meta.label_lower for obj in objs}:
+        bump_model_generation(label)
+
+
+def _clone_webpaths(webpaths, parent, values, cloned):
+    cloned_webpaths = cloned.setdefault(WebPath, {})
+    levels = [list(webpaths)] + get_subtree(webpaths)
+    for level in levels:
+        news = []
+        for webpath in level:
+            new_parent = cloned_webpaths.get(webpath.parent_id, parent)
+            new = copy_instance(webpath, values,
+                                parent_id=new_parent.pk,
+                                site_id=parent.site_id)
+            new.path = sanitize_path(append_slash(new.path))
+            new.fullpath = sanitize_path(f'{new_parent.fullpath}/{new.path}')
+            for reserved_word in settings.CMS_HANDLERS_PATHS:
+                if reserved_word in new.fullpath:
+                    _msg = f'{new.fullpath} matches with the reserved word: {reserved_word}'
+                    raise ReservedWordException(_msg)
+            cloned_webpaths[webpath.pk] = new
+            news.append(new)
+
+        if not news: continue
+        fullpaths = [new.fullpath for new in news]
+        existent = WebPath.objects.filter(site_id=parent.site_id,
+                                          fullpath__in=fullpaths).first()
+        if existent or len(set(fullpaths)) < len(fullpaths):
+            fullpath = existent.fullpath if existent else fullpaths[0]
+            raise Exception(f'Existent path "{fullpath}". Change it')
+
+        WebPath.objects.bulk_create(news)
+        if news[0].pk is None:
+            pks = dict(WebPath.objects.filter(site_id=parent.site_id,
+                                              fullpath__in=fullpaths)
+                                      .values_list('fullpath', 'pk'))
+            for new in news:
+                new.pk = pks[new.fullpath]
+                new._state.adding = False
+
+    # aliases of the cloned tree point to the clones
+    aliases = [new for new in cloned_webpaths.values()
+               if new.alias_id in cloned_webpaths]
+    for new in aliases:
+        new.alias = cloned_webpaths[new.alias_id]
+    WebPath.objects.bulk_update(aliases, ['alias'])
+    return [cloned_webpaths[webpath.pk] for webpath in webpaths]
+
+
+def _clone_pages(cloned, values):
+    Page = apps.get_model('cmspages.Page')
+    cloned_webpaths = cloned[WebPath]
+    cloned_pages = cloned.setdefault(Page, {})
+
+    pages = list(Page.objects.filter(webpath__in=list(cloned_webpaths)).order_by('pk'))
+    if not pages: return
+    for page in pages:
+        cloned_pages[page.pk] = copy_instance(page, values,
+                                              webpath_id=cloned_webpaths[page.webpath_id].pk)
+    bulk_insert(Page, list(cloned_pages.values()), 'webpath')
+
+    # drafts of the cloned pages
+    drafts = [new for new in cloned_pages.values()
+              if new.draft_of in cloned_pages]
+    for new in drafts:
+        new.draft_of = cloned_pages[new.draft_of].pk
+    Page.objects.bulk_update(drafts, ['draft_of'])
+
+    clone_pages_childs(cloned_pages, values, cloned)
+
+
+def clone_pages_childs(cloned_pages, values={}, cloned=None,
+                       remap_related=True):
+    """
+    copies tags, childs and headings localizations of pages
+    to their clones ({page pk: inserted clone}), with bulk inserts.
+    If remap_related, related pages that are cloned too
+    are replaced by their clones.
+    Returns {model: {pk: clone}}
+    """
+    Page = apps.get_model('cmspages.Page')
+    PageHeadingLocalization = apps.get_model('cmspages.PageHeadingLocalization')
+    cloned = {} if cloned is None else cloned
+
+    # tags
+    through = Page.tags.through
+    content_type = ContentType.objects.get_for_model(Page)
+    through.objects.bulk_create(
+        [through(content_type=content_type,
+                 object_id=cloned_pages[tagged.object_id].pk,
+                 tag_id=tagged.tag_id)
+         for tagged in through.objects.filter(content_type=content_type,
+                                              object_id__in=list(cloned_pages))]
+    )
+
+    for label, fk in PAGE_CHILDS.items():
+        model = apps.get_model(label)
+        model_cloned = cloned.setdefault(model, {})
+        for child in model.objects.filter(**{f'{fk}__in': list(cloned_pages)}).order_by('pk'):
+            fields = {f'{fk}_id': cloned_pages[getattr(child, f'{fk}_id')].pk}
+            related_page_id = getattr(child, 'related_page_id', None)
+            if remap_related and related_page_id in cloned_pages:
+                fields['related_page_id'] = cloned_pages[related_page_id].pk
+            model_cloned[child.pk] = copy_instance(child, values, **fields)
+        bulk_insert(model, list(model_cloned.values()), fk)
+
+    # headings localizations
+    headings = cloned[apps.get_model('cmspages.PageHeading')]
+    model_cloned = cloned.setdefault(PageHeadingLocalization, {})
+    for localization in PageHeadingLocalization.objects.filter(heading__in=list(headings))\
+                                                       .order_by('pk'):
+        model_cloned[localization.pk] = copy_instance(localization, values,
+                                                      heading_id=headings[localization.heading_id].pk)
+    bulk_insert(PageHeadingLocalization, list(model_cloned.values()), 'heading')
+    return cloned
+
+
+def _clone_publication_contexts(cloned, values):
+    PublicationContext = apps.get_model('cmspublications.PublicationContext')
+    cloned_webpaths = cloned[WebPath]
+    model_cloned = cloned.setdefault(PublicationContext, {})
+    contexts = PublicationContext.objects.filter(webpath__in=list(cloned_webpaths))\
+                                         .select_related('publication')\
+                                         .order_by('pk')
+    for context in contexts:
+        new = copy_instance(context, values)
+        new.webpath = cloned_webpaths[context.webpath_id]
+        new.publication = context.publication
+        new.set_url_cache()
+        model_cloned[context.pk] = new
+    bulk_insert(PublicationContext, list(model_cloned.values()), 'webpath')
@@ -24,38 +24,29 @@ def used_by(obj):
             for entry in entries:
                 parents.append(entry)
 
-    used_by_content_type = ContentType.objects.get_for_model(obj)
-    already_used = EntryUsedBy.objects.filter(object_id=obj.pk,
-                                              content_type=used_by_content_type)
-    already_used.delete()
-    for parent in parents:
-        content_type = ContentType.objects.get_for_model(parent)
-        entry_dict = dict(object_id=parent.pk,
-                          content_type=content_type,
-                          used_by_content_type=used_by_content_type,
-                          used_by_object_id=obj.pk)
-
-        already_used = EntryUsedBy.objects.filter(**entry_dict)
-        if already_used.exists():
-            continue
-        EntryUsedBy.objects.create(**entry_dict)
-
     # inlines fks
-    childs = []
     for child in obj._meta.related_objects:
         if child.related_model not in excluded_types:
             q = {child.field.name: obj}
             for entry in child.related_model.objects.filter(**q):
-                childs.append(entry)
+                parents.append(entry)
 
-    for child in childs:
-        content_type = ContentType.objects.get_for_model(child)
-        entry_dict = dict(object_id=child.pk,
-                          content_type=content_type,
-                          used_by_content_type=used_by_content_type,
-                          used_by_object_id=obj.pk)
+    used_by_content_type = ContentType.objects.get_for_model(obj)
+    already_used = EntryUsedBy.objects.filter(object_id=obj.pk,
+                                              content_type=used_by_content_type)
+    already_used.delete()
 
-        already_used = EntryUsedBy.objects.filter(**entry_dict)
-        if already_used.exists():
-            continue
-        EntryUsedBy.objects.create(**entry_dict)
+    # missing entries are inserted at once
+    entries = {}
+    existent = set(EntryUsedBy.objects.filter(used_by_content_type=used_by_content_type,
+                                              used_by_object_id=obj.pk)
+                                      .values_list('content_type_id', 'object_id'))
+    for parent in parents:
+        content_type = ContentType.objects.get_for_model(parent)
+        if (content_type.pk, parent.pk) in existent: continue
+        entries.setdefault((content_type.pk, parent.pk),
+                           EntryUsedBy(object_id=parent.pk,
+                                       content_type=content_type,
+                                       used_by_content_type=used_by_content_type,
+                                       used_by_object_id=obj.pk))
+    EntryUsedBy.objects.bulk_create(entries.values())
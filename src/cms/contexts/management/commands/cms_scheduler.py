@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from cms.contexts.scheduler import (CMS_SCHEDULER_INTERVAL,
+                                    get_next_transition,
+                                    process_due_transitions,
+                                    rebuild_schedule,
+                                    run_scheduler)
+
+
+class Command(BaseCommand):
+    help = 'uniCMS scheduler of contents going live or expiring'
+
+    def add_arguments(self, parser):
+        parser.epilog = 'Example: ./manage.py cms_scheduler -loop'
+        parser.add_argument('-loop', required=False, action="store_true",
+                            help="keep running, processing transitions when they are due")
+        parser.add_argument('-interval', type=int, required=False,
+                            default=CMS_SCHEDULER_INTERVAL,
+                            help="maximum seconds between two checks")
+        parser.add_argument('-rebuild', required=False, action="store_true",
+                            help="enqueue the upcoming transitions of all the contents")
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            print(f'{rebuild_schedule()} transitions scheduled')
+
+        if options['loop']:
+            run_scheduler(interval=options['interval'])
+            return
+
+        print(f'{process_due_transitions()} contents processed')
+        print(f'next transition: {get_next_transition()}')
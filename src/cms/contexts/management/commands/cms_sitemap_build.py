@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from cms.contexts.models import WebSite
+from cms.contexts import sitemaps
+
+
+class Command(BaseCommand):
+    help = 'uniCMS sitemaps pre-generation in SITEMAP_ROOT'
+
+    def add_arguments(self, parser):
+        parser.epilog = 'Example: ./manage.py cms_sitemap_build -dirty'
+        parser.add_argument('-site', type=str, required=False,
+                            help="domain of the website, all if omitted")
+        parser.add_argument('-dirty', required=False, action="store_true",
+                            help="only websites changed since the last build")
+        parser.add_argument('-protocol', type=str, required=False,
+                            default=sitemaps.SITEMAP_PROTOCOL)
+
+    def handle(self, *args, **options):
+        if not sitemaps.SITEMAP_ROOT:
+            raise CommandError('SITEMAP_ROOT is not configured')
+
+        websites = WebSite.objects.filter(is_active=True)
+        if options['site']:
+            websites = websites.filter(domain=options['site'])
+        for website in websites:
+            if options['dirty'] and not sitemaps.is_sitemap_dirty(website):
+                continue
+            chunks = sitemaps.build_sitemaps(website, protocol=options['protocol'])
+            print(f'{website.domain}: {chunks} sitemaps built')
+        if not options['site']:
+            sitemaps.clean_sitemaps_dirty()
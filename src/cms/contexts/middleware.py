@@ -1,18 +1,53 @@
 import logging
 
+from django.conf import settings
 
+from . import settings as app_settings
+from . sites import get_website_from_host
 from . utils import detect_user_language, toggle_session_state
 
 logger = logging.getLogger(__name__)
 
+CMS_LANGUAGE_EXCLUDED_PATHS = getattr(settings, 'CMS_LANGUAGE_EXCLUDED_PATHS',
+                                      app_settings.CMS_LANGUAGE_EXCLUDED_PATHS)
+
+
+def website_middleware(get_response):
+    """
+    attaches the WebSite of the requested host to request.site,
+    without queries
+    """
+    def website(request):
+        request.site = get_website_from_host(request.get_host())
+        return get_response(request)
+
+    return website
+
 
 def detect_language_middleware(get_response):
     """
     get_response is a callable ...
     """
+    excluded = CMS_LANGUAGE_EXCLUDED_PATHS
+    if excluded is None:
+        excluded = [i for i in (settings.STATIC_URL, settings.MEDIA_URL) if i]
+    excluded = tuple(excluded)
+
     def language_middleware(request):
+        if excluded and request.path.startswith(excluded):
+            return get_response(request)
+
         detect_user_language(request)
         response = get_response(request)
+        lang = getattr(request, '_unicms_language_cookie', None)
+        if lang:
+            response.set_cookie(settings.LANGUAGE_COOKIE_NAME, lang,
+                                max_age=settings.LANGUAGE_COOKIE_AGE,
+                                path=settings.LANGUAGE_COOKIE_PATH,
+                                domain=settings.LANGUAGE_COOKIE_DOMAIN,
+                                secure=settings.LANGUAGE_COOKIE_SECURE,
+                                httponly=settings.LANGUAGE_COOKIE_HTTPONLY,
+                                samesite=settings.LANGUAGE_COOKIE_SAMESITE)
         return response
 
     return language_middleware
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.25 on 2026-10-19 03:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('cmscontexts', '0014_website_lang'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledTransition',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('field_name', models.CharField(max_length=64)),
+                ('fire_at', models.DateTimeField(db_index=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cmscontexts_scheduledtransition_transitions', to='contenttypes.contenttype', verbose_name='content type')),
+            ],
+            options={
+                'verbose_name_plural': 'Scheduled Transitions',
+                'ordering': ('fire_at',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='scheduledtransition',
+            index=models.Index(fields=['content_type', 'object_id'], name='cmscontexts_content_9663c9_idx'),
+        ),
+    ]
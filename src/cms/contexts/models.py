@@ -1,6 +1,7 @@
 import logging
 
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -205,6 +206,44 @@ class WebPath(ActivableModel, TimeStampedModel, CreatedModifiedBy):
     def get_parent_fullpath(self):
         return self.parent.get_full_path() if self.parent else ''
 
+    @classmethod
+    def prefetch_relations(cls, webpaths):
+        """
+        loads parents and aliases of webpaths and of all their ancestors,
+        with a query for each tree level instead of one for each node.
+        Returns a {pk: webpath} dict of all the loaded webpaths
+        """
+        relations = [cls._meta.get_field('parent'),
+                     cls._meta.get_field('alias')]
+        loaded = {i.pk: i for i in webpaths}
+        pending = list(webpaths)
+        while pending:
+            missing = set()
+            for webpath in pending:
+                for field in relations:
+                    pk = getattr(webpath, field.attname)
+                    if pk and pk not in loaded and not field.is_cached(webpath):
+                        missing.add(pk)
+            fetched = cls.objects.select_related('site')\
+                                 .filter(pk__in=missing) if missing else []
+            loaded.update({i.pk: i for i in fetched})
+
+            next_pending = []
+            for webpath in pending:
+                for field in relations:
+                    pk = getattr(webpath, field.attname)
+                    if not pk: continue
+                    if field.is_cached(webpath):
+                        related = field.get_cached_value(webpath)
+                    else:
+                        related = loaded.get(pk)
+                        field.set_cached_value(webpath, related)
+                    if related and related.pk not in loaded:
+                        loaded[related.pk] = related
+                        next_pending.append(related)
+            pending = next_pending + list(fetched)
+        return loaded
+
     def is_localizable_by(self, user=None, obj=None, parent=False):
         if not user: return False
         if user.is_superuser: return True
@@ -274,6 +313,50 @@ class EditorialBoardEditors(TimeStampedModel, CreatedModifiedBy, ActivableModel)
         return {'webpath': f'{self.webpath}',
                 'permission': self.permission}
 
+    @classmethod
+    def get_permissions_map(cls, webpaths, user):
+        """
+        same results of get_permission() for many webpaths,
+        with a single query on user permissions.
+        Webpaths ancestors should be already loaded,
+        see WebPath.prefetch_relations()
+        """
+        if not user or not user.is_authenticated:
+            return {i.pk: 0 for i in webpaths}
+        if user.is_superuser:
+            return {i.pk: 7 for i in webpaths}
+
+        entries = {}
+        global_permission = 0
+        for webpath_id, permission in cls.objects.filter(user=user,
+                                                         is_active=True)\
+                                                 .values_list('webpath_id',
+                                                              'permission'):
+            if webpath_id is None:
+                global_permission = max(global_permission, permission)
+            else:
+                entries[webpath_id] = max(permission,
+                                          entries.get(webpath_id, permission))
+
+        result = {}
+        for webpath in webpaths:
+            permission = entries.get(webpath.pk)
+            if permission is not None and permission >= 0:
+                result[webpath.pk] = permission
+                continue
+            # the nearest ancestor with a permission decides,
+            # only permissions on descendants (2,5,7) are inherited
+            inherited = 0
+            ancestor = webpath.parent
+            while ancestor:
+                permission = entries.get(ancestor.pk)
+                if permission is not None and permission > 0:
+                    inherited = permission if permission in (2, 5, 7) else 0
+                    break
+                ancestor = ancestor.parent
+            result[webpath.pk] = inherited or global_permission
+        return result
+
     @classmethod
     def get_permission(cls, webpath, user, check_all=True, consider_zero=True):
 
@@ -360,16 +443,36 @@ class EditorialBoardLockUser(models.Model):
         return cls.get_object_locks(content_type=content_type,
                                     object_id=object_id).filter(user=user)
 
+    @classmethod
+    def get_locks_users(cls, keys):
+        """
+        {(content type id, object id): user ids} of the locked objects,
+        in a single query
+        """
+        objects = {}
+        for content_type_id, object_id in keys:
+            objects.setdefault(content_type_id, set()).add(object_id)
+        if not objects: return {}
+        query = Q()
+        for content_type_id, object_ids in objects.items():
+            query |= Q(lock__content_type_id=content_type_id,
+                       lock__object_id__in=object_ids)
+        users = {}
+        for key in cls.objects.filter(query).values_list('lock__content_type_id',
+                                                         'lock__object_id',
+                                                         'user_id'):
+            users.setdefault(key[:2], set()).add(key[2])
+        return users
+
     @classmethod
     def check_for_locks(cls, obj, user):
         # check for locks on object
-        content_type = ContentType.objects.get_for_model(obj)
-        locks = cls.get_object_locks(content_type=content_type,
-                                     object_id=obj.pk)
+        key = (ContentType.objects.get_for_model(obj).pk, obj.pk)
+        users = cls.get_locks_users([key]).get(key)
         # if there is not lock, ok
-        if not locks: return True
+        if not users: return True
         # if user is in lock user list, has permissions
-        if locks.filter(user=user).exists():
+        if user.pk in users:
             return True
         # else no permissions but obj is locked
         return False # pragma: no cover
@@ -413,3 +516,32 @@ class EntryUsedBy(models.Model):
     def __str__(self): # pragma: no cover
         return (f'{self.content_type} {self.object_id} used by '
                 f'{self.used_by_content_type} {self.used_by_object_id}')
+
+
+class ScheduledTransition(models.Model):
+    """
+    persisted queue of the upcoming instants
+    in which contents go live or expire
+    """
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name=_("content type"),
+        related_name="%(app_label)s_%(class)s_transitions",
+    )
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey('content_type', 'object_id')
+    field_name = models.CharField(max_length=64)
+    fire_at = models.DateTimeField(db_index=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = _("Scheduled Transitions")
+        ordering = ('fire_at',)
+        indexes = [
+           models.Index(fields=['content_type', 'object_id']),
+        ]
+
+    def __str__(self): # pragma: no cover
+        return (f'{self.content_type} {self.object_id} '
+                f'{self.field_name} {self.fire_at}')
@@ -0,0 +1,183 @@
+import logging
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import settings as app_settings
+from . cache import purge_cms_cache
+from . models import ScheduledTransition
+from . sitemaps import mark_sitemaps_dirty
+from . utils import load_hooks
+
+
+logger = logging.getLogger(__name__)
+
+CMS_SCHEDULED_TRANSITIONS = getattr(settings, 'CMS_SCHEDULED_TRANSITIONS',
+                                    app_settings.CMS_SCHEDULED_TRANSITIONS)
+CMS_SCHEDULER_INTERVAL = getattr(settings, 'CMS_SCHEDULER_INTERVAL',
+                                 app_settings.CMS_SCHEDULER_INTERVAL)
+
+
+def get_scheduled_models():
+    """
+    returns {model: datetime fields} of CMS_SCHEDULED_TRANSITIONS
+    """
+    scheduled = {}
+    for label, fields in CMS_SCHEDULED_TRANSITIONS.items():
+        try:
+            scheduled[apps.get_model(label)] = fields
+        except LookupError: # pragma: no cover
+            logger.warning(f'uniCMS scheduler - {label} is not installed')
+    return scheduled
+
+
+def schedule_transitions(obj, fields=None):
+    """
+    replaces the pending transitions of an object
+    with its upcoming datetimes
+    """
+    fields = fields or CMS_SCHEDULED_TRANSITIONS.get(obj._meta.label, ())
+    content_type = ContentType.objects.get_for_model(obj)
+    unschedule_transitions(obj, content_type)
+    now = timezone.now()
+    transitions = [ScheduledTransition(content_type=content_type,
+                                       object_id=obj.pk,
+                                       field_name=field_name,
+                                       fire_at=getattr(obj, field_name))
+                   for field_name in fields
+                   if getattr(obj, field_name, None) and
+                      getattr(obj, field_name) > now]
+    ScheduledTransition.objects.bulk_create(transitions)
+    return transitions
+
+
+def bulk_schedule_transitions(objs):
+    """
+    schedules the upcoming transitions of new objects, in a single query
+    """
+    now = timezone.now()
+    transitions = []
+    for obj in objs:
+        fields = CMS_SCHEDULED_TRANSITIONS.get(obj._meta.label, ())
+        if not fields: continue
+        content_type = ContentType.objects.get_for_model(obj)
+        transitions.extend(ScheduledTransition(content_type=content_type,
+                                               object_id=obj.pk,
+                                               field_name=field_name,
+                                               fire_at=getattr(obj, field_name))
+                           for field_name in fields
+                           if getattr(obj, field_name, None) and
+                              getattr(obj, field_name) > now)
+    ScheduledTransition.objects.bulk_create(transitions)
+    return transitions
+
+
+def unschedule_transitions(obj, content_type=None):
+    content_type = content_type or ContentType.objects.get_for_model(obj)
+    ScheduledTransition.objects.filter(content_type=content_type,
+                                       object_id=obj.pk).delete()
+
+
+def rebuild_schedule():
+    """
+    enqueues the upcoming transitions of all the existing contents
+    """
+    count = 0
+    now = timezone.now()
+    for model, fields in get_scheduled_models().items():
+        upcoming = Q()
+        for field_name in fields:
+            upcoming |= Q(**{f'{field_name}__gt': now})
+        for obj in model.objects.filter(upcoming).iterator():
+            count += len(schedule_transitions(obj, fields))
+    return count
+
+
+def get_next_transition():
+    transition = ScheduledTransition.objects.only('fire_at').first()
+    return transition.fire_at if transition else None
+
+
+def process_due_transitions(now=None):
+    """
+    removes the due transitions and, after the commit,
+    fires the CMS_HOOKS POSTSAVE flow of the contents
+    that went live or expired, then purges the pages cache.
+    Returns the number of processed contents
+    """
+    now = now or timezone.now()
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    with transaction.atomic():
+        # concurrent schedulers don't process the same transitions
+        due = list(ScheduledTransition.objects.select_for_update(skip_locked=skip_locked)
+                                              .filter(fire_at__lte=now))
+        if not due: return 0
+
+        objects_ids = {}
+        for transition in due:
+            objects_ids.setdefault(transition.content_type_id, set())\
+                       .add(transition.object_id)
+        objs = []
+        for content_type_id, ids in objects_ids.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            objs.extend(model.objects.filter(pk__in=ids))
+        ScheduledTransition.objects.filter(pk__in=[i.pk for i in due]).delete()
+        # hooks (search engine indexing) never run holding the row locks
+        transaction.on_commit(lambda: transitions_fired(objs))
+    return len(objs)
+
+
+def transitions_fired(objs):
+    """
+    hooks of the contents that went live or expired,
+    a failure doesn't stop the others
+    """
+    for obj in objs:
+        logger.info(f'uniCMS scheduler - {obj._meta.label} {obj.pk} transition')
+        try:
+            load_hooks(obj, 'POSTSAVE')
+        except Exception as e:
+            logger.exception(f'uniCMS scheduler - {obj._meta.label} {obj.pk} '
+                             f'transition hooks failed: {e}')
+    purge_cms_cache()
+    mark_sitemaps_dirty()
+
+
+def run_scheduler(stop_event=None, interval=CMS_SCHEDULER_INTERVAL):
+    """
+    processes transitions as they become due,
+    sleeping until the next one (at most interval seconds)
+    """
+    stop_event = stop_event or threading.Event()
+    while not stop_event.is_set():
+        close_old_connections()
+        try:
+            process_due_transitions()
+            transition = get_next_transition()
+        except Exception as e: # pragma: no cover
+            logger.exception(f'uniCMS scheduler - {e}')
+            transition = None
+        timeout = interval
+        if transition:
+            seconds = (transition - timezone.now()).total_seconds()
+            timeout = max(0, min(interval, seconds))
+        stop_event.wait(timeout)
+
+
+def start_scheduler_thread(interval=CMS_SCHEDULER_INTERVAL):
+    """
+    runs the scheduler in a daemon thread of the current process,
+    returns the event that stops it
+    """
+    stop_event = threading.Event()
+    thread = threading.Thread(target=run_scheduler,
+                              args=(stop_event, interval),
+                              name='unicms-scheduler',
+                              daemon=True)
+    thread.start()
+    return stop_event
@@ -54,6 +54,22 @@ class ParentForeignKey(serializers.PrimaryKeyRelatedField):
         return None # pragma: no cover
 
 
+class WebPathListSerializer(serializers.ListSerializer):
+    """
+    resolves parents, aliases and user permissions
+    of the whole page of results at once
+    """
+
+    def to_representation(self, data):
+        webpaths = list(data)
+        WebPath.prefetch_relations(webpaths)
+        request = self.context.get('request', None)
+        if request and request.user:
+            self.permissions = EditorialBoardEditors.get_permissions_map(webpaths,
+                                                                         request.user)
+        return super().to_representation(webpaths)
+
+
 class WebPathSerializer(UniCMSCreateUpdateSerializer, UniCMSContentTypeClass):
 
     site = WebSiteForeignKey()
@@ -74,20 +90,37 @@ class WebPathSerializer(UniCMSCreateUpdateSerializer, UniCMSContentTypeClass):
                   'meta_keywords',
                   'robots',
                   'is_active']
+        list_serializer_class = WebPathListSerializer
+
+    @staticmethod
+    def get_shallow_data(instance):
+        return {'id': instance.pk,
+                'name': instance.name,
+                'path': instance.path,
+                'get_full_path': instance.get_full_path(),
+                'full_name': instance.__str__()}
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
+        # lists return shallow parent and alias references
+        in_list = isinstance(self.parent, WebPathListSerializer)
         if instance.parent:
-            parent = WebPathSerializer(instance.parent)
-            data['parent'] = parent.data
+            data['parent'] = self.get_shallow_data(instance.parent) \
+                             if in_list else \
+                             WebPathSerializer(instance.parent).data
         if instance.alias:
-            alias = WebPathSerializer(instance.alias)
-            data['alias'] = alias.data
+            data['alias'] = self.get_shallow_data(instance.alias) \
+                            if in_list else \
+                            WebPathSerializer(instance.alias).data
         data['full_name'] = instance.__str__()
         request = self.context.get('request', None)
         if request and request.user:
             context_permissions = dict(CMS_CONTEXT_PERMISSIONS)
-            permission = EditorialBoardEditors.get_permission(instance, request.user)
+            permissions = getattr(self.parent, 'permissions', {})
+            if instance.pk in permissions:
+                permission = permissions[instance.pk]
+            else:
+                permission = EditorialBoardEditors.get_permission(instance, request.user)
             data['permission_id'] = permission
             data['permission_label'] = context_permissions[permission]
         return data
@@ -23,10 +23,49 @@ CMS_CACHE_TTL = 25
 CMS_CACHE_MAX_ENTRIES = 0
 # request.get_raw_uri() that matches the following would be not cached
 CMS_CACHE_EXCLUDED_MATCHES = ['/search?',]
+# in seconds, each process checks at most once in this interval
+# if the websites changed in another process
+CMS_WEBSITES_CHECK_INTERVAL = 5
+
+# LANGUAGE DETECTION
+# where the language chosen with ?lang= is stored:
+# 'session' or 'cookie' (LANGUAGE_COOKIE_NAME), the latter never
+# touches the session backend and lets anonymous pages be cached by a CDN
+CMS_LANGUAGE_DETECTION = 'session'
+# paths prefixes ignored by detect_language_middleware,
+# None means STATIC_URL and MEDIA_URL
+CMS_LANGUAGE_EXCLUDED_PATHS = None
+
+# SCHEDULED TRANSITIONS
+# contents that go live or expire without being saved
+# {model label: datetime fields}, CMS_HOOKS POSTSAVE flow is fired on each transition
+CMS_SCHEDULED_TRANSITIONS = {
+    'cmspages.Page': ('date_start', 'date_end'),
+    'cmspublications.PublicationContext': ('date_start', 'date_end'),
+}
+# in seconds, maximum sleep between two checks of `cms_scheduler -loop`
+CMS_SCHEDULER_INTERVAL = 60
+
+# editorial board actions (LogEntry) are written by a background thread,
+# with bulk inserts, after the commit. If False they are written immediately
+CMS_AUDIT_LOG_ASYNC = True
+# entries waiting to be written, callers write them when it's full
+CMS_AUDIT_LOG_QUEUE_SIZE = 10000
+# entries of each insert
+CMS_AUDIT_LOG_BATCH_SIZE = 200
+# in seconds, maximum delay before an entry is written
+CMS_AUDIT_LOG_FLUSH_INTERVAL = 2
 
 # SITEMAPS PRIORITIES
 SITEMAP_WEBPATHS_PRIORITY = 0.6
 SITEMAP_NEWS_PRIORITY = 0.6
+# urls of each sitemap of the index (sitemaps protocol limit)
+SITEMAP_CHUNK_SIZE = 50000
+# pre-generated sitemaps folder (cms_sitemap_build).
+# If empty sitemaps are streamed from the database on each request
+SITEMAP_ROOT = ''
+# protocol of the urls in pre-generated sitemaps
+SITEMAP_PROTOCOL = 'https'
 
 # ROBOTS.TXT
 ROBOTS_SETTINGS = {'*': # all website domains. Specify one if you want
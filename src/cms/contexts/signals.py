@@ -1,4 +1,11 @@
+from cms.contexts.scheduler import (CMS_SCHEDULED_TRANSITIONS,
+                                    schedule_transitions,
+                                    unschedule_transitions)
+from cms.contexts.models import WebPath, WebSite
+from cms.contexts.sitemaps import mark_sitemaps_dirty
+from cms.contexts.sites import bump_websites_version
 from cms.contexts.utils import load_hooks
+from django.db import connection, transaction
 from django.db.models.signals import (pre_save, post_save,
                                       pre_delete, post_delete)
 
@@ -19,9 +26,42 @@ def cms_post_delete(instance, *args, **kwargs):
     load_hooks(instance, 'POSTDELETE', *args, **kwargs)
 
 
+def cms_schedule_transitions(sender, instance, *args, **kwargs):
+    if sender._meta.label not in CMS_SCHEDULED_TRANSITIONS: return
+    schedule_transitions(instance)
+
+
+def cms_unschedule_transitions(sender, instance, *args, **kwargs):
+    if sender._meta.label not in CMS_SCHEDULED_TRANSITIONS: return
+    unschedule_transitions(instance)
+
+
+def websites_changed(*args, **kwargs):
+    bump_websites_version()
+    # a map reloaded before the commit would see the previous rows
+    if connection.in_atomic_block:
+        transaction.on_commit(bump_websites_version)
+
+
+def webpath_sitemap_changed(instance, *args, **kwargs):
+    mark_sitemaps_dirty([instance.site_id])
+
+
 # all the models will send signals here but ... Only who have some hook
 # registered will turn on the lights
 pre_save.connect(cms_pre_save)
 post_save.connect(cms_post_save)
 pre_delete.connect(cms_pre_delete)
 post_delete.connect(cms_post_delete)
+
+# contents that go live or expire later
+post_save.connect(cms_schedule_transitions)
+post_delete.connect(cms_unschedule_transitions)
+
+# pre-generated sitemaps
+post_save.connect(webpath_sitemap_changed, sender=WebPath)
+post_delete.connect(webpath_sitemap_changed, sender=WebPath)
+
+# process-local websites map
+post_save.connect(websites_changed, sender=WebSite)
+post_delete.connect(websites_changed, sender=WebSite)
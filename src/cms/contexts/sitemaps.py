@@ -0,0 +1,168 @@
+import logging
+import math
+import os
+import tempfile
+
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from . import settings as app_settings
+from . cache import CMS_CACHE_KEY_PREFIX
+from . models import WebPath
+
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_NEWS_PRIORITY = getattr(settings, 'SITEMAP_NEWS_PRIORITY',
+                                app_settings.SITEMAP_NEWS_PRIORITY)
+SITEMAP_WEBPATHS_PRIORITY = getattr(settings, 'SITEMAP_WEBPATHS_PRIORITY',
+                                    app_settings.SITEMAP_WEBPATHS_PRIORITY)
+SITEMAP_CHUNK_SIZE = getattr(settings, 'SITEMAP_CHUNK_SIZE',
+                             app_settings.SITEMAP_CHUNK_SIZE)
+SITEMAP_ROOT = getattr(settings, 'SITEMAP_ROOT', app_settings.SITEMAP_ROOT)
+SITEMAP_PROTOCOL = getattr(settings, 'SITEMAP_PROTOCOL',
+                           app_settings.SITEMAP_PROTOCOL)
+
+DIRTY_KEY_PREFIX = f'{CMS_CACHE_KEY_PREFIX}sitemap_dirty_'
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def get_webpaths(website):
+    return WebPath.objects.filter(site=website,
+                                  is_active=True,
+                                  alias__isnull=True,
+                                  alias_url="").order_by('pk')
+
+
+def get_publication_contexts(website):
+    from cms.publications.models import PublicationContext
+
+    now = timezone.localtime()
+    return PublicationContext.objects.filter(webpath__site=website,
+                                             webpath__is_active=True,
+                                             is_active=True,
+                                             publication__is_active=True,
+                                             date_start__lte=now,
+                                             date_end__gt=now)\
+                                     .select_related('publication',
+                                                     'webpath__alias')\
+                                     .order_by('pk')
+
+
+# (queryset, url, priority) of each sitemap section
+SITEMAP_SECTIONS = (
+    (get_webpaths, lambda i: i.get_full_path(), SITEMAP_WEBPATHS_PRIORITY),
+    (get_publication_contexts, lambda i: i.url, SITEMAP_NEWS_PRIORITY),
+)
+
+
+def get_chunks_count(website):
+    total = sum(get_queryset(website).count()
+                for get_queryset, url, priority in SITEMAP_SECTIONS)
+    return max(1, math.ceil(total / SITEMAP_CHUNK_SIZE))
+
+
+def iter_urls(website, chunk):
+    """
+    yields (path, lastmod, priority) of the urls in a sitemap chunk,
+    sections are concatenated and split every SITEMAP_CHUNK_SIZE urls
+    """
+    start = (chunk - 1) * SITEMAP_CHUNK_SIZE
+    end = start + SITEMAP_CHUNK_SIZE
+    offset = 0
+    for get_queryset, url, priority in SITEMAP_SECTIONS:
+        if offset >= end: return
+        queryset = get_queryset(website)
+        count = queryset.count()
+        if start < offset + count:
+            entries = queryset[max(start - offset, 0):min(end - offset, count)]
+            for entry in entries.iterator(chunk_size=2000):
+                yield url(entry), entry.modified, priority
+        offset += count
+
+
+def render_urlset(website, chunk, base_url):
+    yield f'{XML_HEADER}<urlset xmlns="{XMLNS}">\n'
+    for path, lastmod, priority in iter_urls(website, chunk):
+        yield (f'<url><loc>{escape(base_url + path)}</loc>'
+               f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+               f'<priority>{priority}</priority></url>\n')
+    yield '</urlset>\n'
+
+
+def render_index(website, base_url, chunks=None):
+    sitemap_url = f"{base_url}{reverse('unicms_sitemap')}"
+    chunks = chunks or get_chunks_count(website)
+    yield f'{XML_HEADER}<sitemapindex xmlns="{XMLNS}">\n'
+    for chunk in range(1, chunks + 1):
+        yield f'<sitemap><loc>{escape(sitemap_url)}?p={chunk}</loc></sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def get_sitemap_path(website, chunk=None):
+    """
+    pre-generated sitemap file, if any
+    """
+    if not SITEMAP_ROOT: return
+    name = f'sitemap-{int(chunk)}.xml' if chunk else 'sitemap.xml'
+    path = os.path.join(SITEMAP_ROOT, website.domain, name)
+    return path if os.path.exists(path) else None
+
+
+def _write(path, lines):
+    # crawlers never read a partially written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+def build_sitemaps(website, protocol=SITEMAP_PROTOCOL):
+    """
+    writes the sitemap index and its chunks of a website in SITEMAP_ROOT.
+    Returns the number of chunks
+    """
+    folder = os.path.join(SITEMAP_ROOT, website.domain)
+    os.makedirs(folder, exist_ok=True)
+    cache.delete(f'{DIRTY_KEY_PREFIX}{website.pk}')
+    base_url = f'{protocol}://{website.domain}'
+    chunks = get_chunks_count(website)
+    for chunk in range(1, chunks + 1):
+        _write(os.path.join(folder, f'sitemap-{chunk}.xml'),
+               render_urlset(website, chunk, base_url))
+    _write(os.path.join(folder, 'sitemap.xml'),
+           render_index(website, base_url, chunks))
+    # chunks of a bigger past sitemap
+    chunk = chunks + 1
+    while os.path.exists(os.path.join(folder, f'sitemap-{chunk}.xml')):
+        os.remove(os.path.join(folder, f'sitemap-{chunk}.xml'))
+        chunk += 1
+    logger.info(f'uniCMS sitemap - {website} {chunks} sitemaps built')
+    return chunks
+
+
+def mark_sitemaps_dirty(site_ids=None):
+    """
+    pre-generated sitemaps of these sites (all if None)
+    must be rebuilt
+    """
+    if not SITEMAP_ROOT: return
+    site_ids = site_ids if site_ids is not None else ['all']
+    cache.set_many({f'{DIRTY_KEY_PREFIX}{i}': True for i in site_ids if i},
+                   None)
+
+
+def is_sitemap_dirty(website):
+    dirty = cache.get_many([f'{DIRTY_KEY_PREFIX}{website.pk}',
+                            f'{DIRTY_KEY_PREFIX}all'])
+    return bool(dirty)
+
+
+def clean_sitemaps_dirty():
+    cache.delete(f'{DIRTY_KEY_PREFIX}all')
@@ -0,0 +1,91 @@
+import logging
+import re
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from . import settings as app_settings
+from . cache import CMS_CACHE_KEY_PREFIX
+
+
+logger = logging.getLogger(__name__)
+
+CMS_WEBSITES_CHECK_INTERVAL = getattr(settings, 'CMS_WEBSITES_CHECK_INTERVAL',
+                                      app_settings.CMS_WEBSITES_CHECK_INTERVAL)
+
+VERSION_KEY = f'{CMS_CACHE_KEY_PREFIX}websites_version'
+
+# process-local {domain: WebSite}, replaced as a whole on changes
+_websites = {'map': None, 'version': None, 'checked': 0}
+
+
+def get_websites_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, int(time.time()), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_websites_version():
+    """
+    invalidates the websites map of all the processes.
+    Called by WebSite signals
+    """
+    _websites['map'] = None
+    get_websites_version()
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError: # pragma: no cover
+        # evicted between the two calls
+        cache.add(VERSION_KEY, int(time.time()), None)
+        return cache.get(VERSION_KEY)
+
+
+def get_websites():
+    """
+    returns {domain: WebSite} of all the websites.
+    The shared version is checked at most once
+    every CMS_WEBSITES_CHECK_INTERVAL seconds
+    """
+    now = time.monotonic()
+    websites = _websites['map']
+    if websites is not None and \
+       now - _websites['checked'] < CMS_WEBSITES_CHECK_INTERVAL:
+        return websites
+
+    version = get_websites_version()
+    if websites is None or version != _websites['version']:
+        WebSite = apps.get_model('cmscontexts.WebSite')
+        websites = {i.domain: i for i in WebSite.objects.all()}
+        logger.debug(f'uniCMS websites - {len(websites)} websites loaded')
+        _websites.update(map=websites, version=version)
+    _websites['checked'] = now
+    return websites
+
+
+def get_domain_from_host(host):
+    # without port
+    return re.match(r'^[a-zA-Z0-9\.\-\_]*', host).group()
+
+
+def get_website_from_host(host):
+    """
+    returns the WebSite (also if not active) of a request host, if any
+    """
+    return get_websites().get(get_domain_from_host(host))
+
+
+def get_request_website(request):
+    """
+    the WebSite attached by website_middleware,
+    looked up if the middleware is not installed
+    """
+    WebSite = apps.get_model('cmscontexts.WebSite')
+    website = getattr(request, 'site', None)
+    if isinstance(website, WebSite):
+        return website
+    return get_website_from_host(request.META.get('HTTP_HOST', '') or
+                                 request.META.get('SERVER_NAME', ''))
@@ -1,15 +1,27 @@
 import datetime
 import logging
 
+from importlib import import_module
+from unittest.mock import patch
+
 from django.conf import settings
+from django.contrib.admin.models import LogEntry
 from django.contrib.auth import get_user_model
+from django.http import HttpResponse
 from django.test import RequestFactory, TestCase
+from django.utils import timezone
 
+from . audit import AuditLog, get_changes, make_log_entry
+from . cache import get_cache_generation
 from . exceptions import ReservedWordException
+from . middleware import detect_language_middleware, website_middleware
+from . scheduler import get_next_transition, process_due_transitions
 from . models import *
 from . settings import *
+from . sites import (get_request_website, get_website_from_host,
+                     get_websites, get_websites_version)
 from . templatetags.unicms_contexts import *
-from . utils import sanitize_path
+from . utils import detect_user_language, sanitize_path
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -191,6 +203,149 @@ class ContextUnitTest(TestCase):
         webpath = self.create_webpath(path="path-3")
         EditorialBoardEditors.get_permission(user=user, webpath=webpath, check_all=False)
 
+    def test_websites_map(self):
+        website = self.create_website()
+        get_websites()
+        req = RequestFactory().get('/', HTTP_HOST=f'{website.domain}:8000')
+        with self.assertNumQueries(0):
+            website_middleware(lambda request: None)(req)
+            assert req.site == website
+            assert get_request_website(req) == website
+            assert get_website_from_host('unknown.org') is None
+
+        # changes are seen by the next lookup
+        website.is_active = False
+        website.save()
+        assert get_website_from_host(website.domain).is_active is False
+        website.delete()
+        assert get_website_from_host(website.domain) is None
+
+        # bumped again after the commit: a map loaded by another process
+        # before it would hold the previous rows
+        with self.captureOnCommitCallbacks() as callbacks:
+            website = self.create_website()
+        version = get_websites_version()
+        for callback in callbacks:
+            callback()
+        assert get_websites_version() > version
+
+    def test_scheduled_transitions(self):
+        # pages tests depend on these ones
+        from cms.pages.tests import PageUnitTest
+
+        start = timezone.localtime() + timezone.timedelta(minutes=30)
+        pages = [PageUnitTest.create_page(date_start=start, webpath_path=path)
+                 for path in ('scheduled-1', 'scheduled-2')]
+        transitions = ScheduledTransition.objects.filter(object_id__in=[i.pk for i in pages])
+        assert [i.field_name for i in transitions] == ['date_start', 'date_start']
+        assert get_next_transition() == start
+        assert process_due_transitions() == 0
+
+        generation = get_cache_generation()
+        now = timezone.now() + timezone.timedelta(minutes=45)
+        # a failing hook doesn't stop the others
+        with patch('cms.contexts.scheduler.load_hooks',
+                   side_effect=[Exception('search engine down'), None]) as load_hooks:
+            with self.captureOnCommitCallbacks() as callbacks:
+                assert process_due_transitions(now=now) == 2
+                # hooks run after the commit
+                assert not load_hooks.called
+                # transitions are removed anyway
+                assert not transitions.all().exists()
+            for callback in callbacks:
+                callback()
+        assert sorted(i.args[0].pk for i in load_hooks.call_args_list) == \
+               sorted(i.pk for i in pages)
+        # pages cache purged
+        assert get_cache_generation() > generation
+
+    def test_audit_log(self):
+        user = self.create_user()
+        webpath = self.create_webpath()
+        old = WebPath.objects.get(pk=webpath.pk)
+        webpath.name = 'changed'
+        webpath.save()
+        # only the changed fields
+        changes = get_changes(webpath, old=old)
+        assert changes == {'name': 'changed'}
+        # without the old values, the ones in request data
+        changes = get_changes(webpath, data={'name': 'changed', 'foo': 1})
+        assert changes == {'name': 'changed'}
+
+        logs = LogEntry.objects.count()
+        audit_log = AuditLog(threaded=True, queue_size=2, batch_size=10)
+        # no writer thread, entries are written by flush
+        with patch.object(audit_log, '_start_writer'):
+            with self.captureOnCommitCallbacks(execute=True):
+                audit_log.log([make_log_entry(user, webpath, changes)
+                               for i in range(3)])
+                # queued after the commit
+                assert audit_log.queue.empty()
+            # the queue is bounded, the third entry has flushed it
+            assert LogEntry.objects.count() == logs + 2
+            assert audit_log.queue.qsize() == 1
+            assert audit_log.flush() == 1
+        assert LogEntry.objects.count() == logs + 3
+        entry = LogEntry.objects.latest('pk')
+        assert entry.change_message.endswith(": {'name': 'changed'}")
+
+        # not threaded, written in the caller transaction
+        audit_log = AuditLog(threaded=False)
+        audit_log.log([make_log_entry(user, webpath)])
+        assert LogEntry.objects.count() == logs + 4
+
+        # previous import path
+        from . import audit, utils
+        assert utils.log_obj_event is audit.log_obj_event
+
+
+    def test_detect_user_language(self):
+        website = self.create_website()
+        website.lang = 'it'
+        website.save()
+        get_websites()
+        engine = import_module(settings.SESSION_ENGINE)
+
+        def get_request(path='/', **kwargs):
+            req = RequestFactory().get(path, HTTP_HOST=website.domain, **kwargs)
+            req.session = engine.SessionStore()
+            return req
+
+        def middleware(req):
+            return detect_language_middleware(lambda request: HttpResponse())(req)
+
+        # no queries, no session writes if the language doesn't change
+        req = get_request()
+        with self.assertNumQueries(0):
+            middleware(req)
+        assert req.LANGUAGE_CODE == website.lang
+        assert not req.session.modified
+
+        req = get_request('/?lang=en')
+        middleware(req)
+        assert req.LANGUAGE_CODE == 'en'
+        assert req.session.modified
+        # the view decorator reuses it
+        assert detect_user_language(req) == 'en'
+
+        # static files are ignored
+        req = get_request(f'{settings.STATIC_URL}style.css')
+        middleware(req)
+        assert not hasattr(req, 'LANGUAGE_CODE')
+
+        # url and cookie only
+        with patch('cms.contexts.utils.CMS_LANGUAGE_DETECTION', 'cookie'):
+            req = get_request('/?lang=en')
+            res = middleware(req)
+            assert res.cookies[settings.LANGUAGE_COOKIE_NAME].value == 'en'
+
+            req = get_request()
+            req.COOKIES[settings.LANGUAGE_COOKIE_NAME] = 'en'
+            res = middleware(req)
+            assert req.LANGUAGE_CODE == 'en'
+            assert not res.cookies
+            assert not req.session.accessed
+
 
     # start Template tags tests
     def tests_templatetags_breadcrumbs(self):
@@ -1,11 +1,8 @@
 import logging
 import re
 
-from django.apps import apps
 from django.conf import settings
 from django.contrib import messages
-from django.contrib.admin.models import LogEntry, CHANGE
-from django.contrib.contenttypes.models import ContentType
 from django.utils import translation
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext as _
@@ -14,17 +11,20 @@ from django.template.loader import get_template, render_to_string
 from django.template.exceptions import (TemplateDoesNotExist,
                                         TemplateSyntaxError)
 
-from copy import deepcopy
-
 from django_auto_serializer.auto_serializer import (ImportableSerializedInstance,
                                                     SerializableInstance)
 
-# from . models import WebSite
+from . import settings as app_settings
+from . sites import get_request_website
+# moved to cms.contexts.audit, still importable from here
+from . audit import log_obj_event, log_objs_event # noqa
 
 
 
 logger = logging.getLogger(__name__)
 CMS_PATH_PREFIX = getattr(settings, 'CMS_PATH_PREFIX', '')
+CMS_LANGUAGE_DETECTION = getattr(settings, 'CMS_LANGUAGE_DETECTION',
+                                 app_settings.CMS_LANGUAGE_DETECTION)
 
 
 def get_CMS_HOOKS():
@@ -33,24 +33,38 @@ def get_CMS_HOOKS():
 
 
 def detect_user_language(request):
+    """
+    ?lang= request arg, then the language chosen before
+    (session or cookie, see CMS_LANGUAGE_DETECTION),
+    then the website language and finally the browser one.
+    No queries, the session is written only when the language changes
+    """
+    # already detected (middleware and view decorator)
+    lang = getattr(request, '_unicms_language', None)
+    if lang:
+        translation.activate(lang)
+        return lang
+
     # get browser language
     req_lang = translation.get_language_from_request(request)
 
     # get website language
     # if website language exists overwrite browser language
-    current_domain = request.META.get('HTTP_HOST', '').split(':')[0]
-    website_lang = ''
-    if current_domain:
-        WebSite = apps.get_model('cmscontexts.WebSite')
-        website = WebSite.objects.filter(domain=current_domain).first()
-        if website: website_lang = website.lang
-
-    # get from session
-    if website_lang:
-        current = request.session.get(f'_unicms_website_{website.pk}_lang', website_lang) # current session website language
+    website = get_request_website(request)
+    website_lang = website.lang if website else ''
+
+    if CMS_LANGUAGE_DETECTION == 'cookie':
+        # never touches the session
+        session_key = None
+        chosen = request.COOKIES.get(settings.LANGUAGE_COOKIE_NAME)
+        current = chosen or website_lang or req_lang
+    elif website_lang:
+        session_key = f'_unicms_website_{website.pk}_lang'
+        current = request.session.get(session_key, website_lang) # current session website language
     else:
         # if there is a choosen language in session, overwrite current
-        current = request.session.get(translation.LANGUAGE_SESSION_KEY, req_lang) # current session language
+        session_key = translation.LANGUAGE_SESSION_KEY
+        current = request.session.get(session_key, req_lang) # current session language
 
     # if user changes language in URL overwrite current
     lang = request.GET.get('lang', current)
@@ -58,12 +72,15 @@ def detect_user_language(request):
     # set language
     translation.activate(lang)
     request.LANGUAGE_CODE = lang
+    request._unicms_language = lang
 
-    # set in session
-    if website_lang:
-        request.session[f'_unicms_website_{website.pk}_lang'] = lang
-    else:
-        request.session[translation.LANGUAGE_SESSION_KEY] = lang
+    # store the choice, only if changed
+    if lang != current:
+        if session_key:
+            request.session[session_key] = lang
+        elif lang in dict(settings.LANGUAGES):
+            # set on the response by detect_language_middleware
+            request._unicms_language_cookie = lang
 
     # return
     return lang
@@ -189,36 +206,6 @@ def is_publisher(permission):
             'allow_descendant': allow_descendant}
 
 
-def log_obj_event(user, obj, data={}, action_flag=CHANGE):
-    """
-    new LogEntry to log change action on object
-    """
-    msg = _("changed") if action_flag == CHANGE else _("added")
-
-    # ex: FILE_UPLOAD_MAX_MEMORY_SIZE exceeded
-    # TypeError: cannot pickle '_io.BufferedRandom' object
-    try:
-        data = deepcopy(data)
-        data = dict(data)
-    except Exception:
-        data = {}
-
-    # pop readonly fields from logged dict
-    data.pop('id', None)
-    data.pop('created', None)
-    data.pop('modified', None)
-    data.pop('created_by', None)
-    data.pop('modified_by', None)
-    data.pop('object_content_type', None)
-
-    LogEntry.objects.log_action(user_id = user.pk,
-                                content_type_id = ContentType.objects.get_for_model(obj).pk,
-                                object_id = obj.pk,
-                                object_repr = obj.__str__(),
-                                action_flag = action_flag,
-                                change_message = f'{msg}: {data}' if data else msg)
-
-
 def clone(obj,
           excluded_fields=[],
           excluded_childrens=[],
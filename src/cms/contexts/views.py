@@ -3,11 +3,11 @@ import re
 
 from django.conf import settings
 from django.contrib.admin.views.decorators import staff_member_required
-from django.contrib.sitemaps import GenericSitemap
-from django.contrib.sitemaps.views import sitemap
-from django.http import (Http404,
+from django.http import (FileResponse,
+                         Http404,
                          HttpResponse,
-                         HttpResponseRedirect)
+                         HttpResponseRedirect,
+                         StreamingHttpResponse)
 from django.shortcuts import render, get_object_or_404
 from django.urls import reverse
 from django.utils import timezone
@@ -21,7 +21,12 @@ from urllib.parse import urlparse
 
 from . import settings as app_settings
 from . decorators import unicms_cache
-from . models import EditorialBoardEditors, WebSite, WebPath
+from . models import EditorialBoardEditors, WebPath
+from . sites import get_request_website
+from . sitemaps import (get_chunks_count,
+                        get_sitemap_path,
+                        render_index,
+                        render_urlset)
 from . utils import append_slash, is_editor
 
 
@@ -30,19 +35,12 @@ logger = logging.getLogger(__name__)
 CMS_PATH_PREFIX = getattr(settings, 'CMS_PATH_PREFIX', '')
 CMS_APP_REGEXP_URLPATHS_LOADED = {import_string(k):v
                                   for k,v in getattr(settings, 'CMS_APP_REGEXP_URLPATHS', {}).items()}
-SITEMAP_NEWS_PRIORITY = getattr(settings, 'SITEMAP_NEWS_PRIORITY',
-                                app_settings.SITEMAP_NEWS_PRIORITY)
-SITEMAP_WEBPATHS_PRIORITY = getattr(settings, 'SITEMAP_WEBPATHS_PRIORITY',
-                                    app_settings.SITEMAP_WEBPATHS_PRIORITY)
 ROBOTS_SETTINGS = getattr(settings, 'ROBOTS_SETTINGS', app_settings.ROBOTS_SETTINGS)
 
 def _get_site_from_host(request):
-    requested_site = re.match(r'^[a-zA-Z0-9\.\-\_]*',
-                              request.get_host()).group()
-
-    website = get_object_or_404(WebSite,
-                                domain=requested_site,
-                                is_active=True)
+    website = get_request_website(request)
+    if not website or not website.is_active:
+        raise Http404(_("CMS WebSite not found"))
     return website
 
 
@@ -128,36 +126,26 @@ def pagePreview(request, page_id):
 
 
 def base_unicms_sitemap(request):
+    """
+    sitemap index, or its chunk number ?p=
+    """
     website = _get_site_from_host(request)
-    protocol =  request.scheme
-
-    webpaths_map = {
-        'queryset': WebPath.objects.filter(site=website,
-                                           is_active=True,
-                                           alias__isnull=True,
-                                           alias_url=""),
-        'date_field': 'modified',
-    }
-    # news_map = {
-        # 'queryset': PublicationContext.objects.filter(webpath__site=website,
-                                                      # webpath__is_active=True,
-                                                      # date_start__lte=timezone.localtime(),
-                                                      # date_end__gte=timezone.localtime(),
-                                                      # publication__is_active=True),
-        # 'date_field': 'modified',
-    # }
-
-    sitemap_dict = {
-        'webpaths': GenericSitemap(webpaths_map,
-                                   priority=SITEMAP_WEBPATHS_PRIORITY,
-                                   protocol=protocol),
-        # 'news': GenericSitemap(news_map,
-                               # priority=SITEMAP_NEWS_PRIORITY,
-                               # protocol=protocol)
-        }
-
-    sitemaps = sitemap(request, sitemaps=sitemap_dict)
-    return HttpResponse(sitemaps.render(), content_type='text/xml')
+    chunk = request.GET.get('p')
+    if chunk and not chunk.isdigit():
+        raise Http404()
+
+    path = get_sitemap_path(website, chunk)
+    if path:
+        return FileResponse(open(path, 'rb'), content_type='application/xml')
+
+    base_url = f'{request.scheme}://{request.get_host()}'
+    if not chunk:
+        content = render_index(website, base_url)
+    elif 0 < int(chunk) <= get_chunks_count(website):
+        content = render_urlset(website, int(chunk), base_url)
+    else:
+        raise Http404()
+    return StreamingHttpResponse(content, content_type='application/xml')
 
 
 def unicms_robots(request):
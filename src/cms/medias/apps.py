@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CmsMediasConfig(AppConfig):
     name = 'cms.medias'
     label = 'cmsmedias'
+
+    def ready(self):
+        # that actually loads the signals
+        import cms.medias.signals # noqa
@@ -0,0 +1,301 @@
+import logging
+import mimetypes
+import os
+import zipfile
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.admin.models import ADDITION
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.db import transaction
+from django.db.models import Max
+
+from cms.contexts.audit import log_objs_event
+
+from . import settings as app_settings
+from . deduplication import CMS_MEDIA_DEDUPLICATION
+from . models import Media, MediaCollectionItem
+from . processing import (CMS_MEDIA_PROCESSING_QUEUE,
+                          encode_webp,
+                          process_media,
+                          run)
+from . renditions import CMS_IMAGE_RENDITIONS_EAGER, get_renditions
+from . utils import get_file_hash, inspect_file
+
+
+logger = logging.getLogger(__name__)
+
+FILETYPE_IMAGE = getattr(settings, 'FILETYPE_IMAGE',
+                         app_settings.FILETYPE_IMAGE)
+FILE_MAX_SIZE = getattr(settings, 'FILE_MAX_SIZE',
+                        app_settings.FILE_MAX_SIZE)
+CMS_MEDIA_BULK_MAX_FILES = getattr(settings, 'CMS_MEDIA_BULK_MAX_FILES',
+                                   app_settings.CMS_MEDIA_BULK_MAX_FILES)
+CMS_MEDIA_BULK_WORKERS = getattr(settings, 'CMS_MEDIA_BULK_WORKERS',
+                                 app_settings.CMS_MEDIA_BULK_WORKERS)
+
+BULK_CREATED = 'created'
+BULK_SHARED = 'shared'
+BULK_INVALID = 'invalid'
+
+
+def _max_size_errors():
+    _max_size_mb = (FILE_MAX_SIZE / 1024) / 1024
+    return [f'File size exceed the maximum value ({_max_size_mb} MB)']
+
+
+def extract_file(archive, info, name):
+    """
+    a zip archive entry copied in chunks to a temporary file,
+    None if bigger than FILE_MAX_SIZE (headers sizes are not trusted)
+    """
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    upload = TemporaryUploadedFile(name, content_type, 0, None)
+    with archive.open(info) as source:
+        for chunk in iter(lambda: source.read(upload.DEFAULT_CHUNK_SIZE), b''):
+            upload.size += len(chunk)
+            if upload.size > FILE_MAX_SIZE:
+                upload.close()
+                return
+            upload.write(chunk)
+    upload.seek(0)
+    return upload
+
+
+def iter_archive(fobj):
+    """
+    uploads of the files in a zip archive, or errors
+    if they can't be extracted.
+    Files are extracted one at a time to temporary files,
+    removed when they are stored or closed
+    """
+    try:
+        archive = zipfile.ZipFile(fobj)
+    except zipfile.BadZipFile:
+        yield os.path.basename(fobj.name), ['Invalid zip archive']
+        return
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir(): continue
+            name = os.path.basename(info.filename)
+            # hidden files and OS metadata (__MACOSX/, .DS_Store)
+            if not name or name.startswith('.') or \
+               info.filename.startswith('__MACOSX/'):
+                continue
+            # never extracted if too big
+            upload = None
+            if info.file_size <= FILE_MAX_SIZE:
+                upload = extract_file(archive, info, name)
+            yield name, upload or _max_size_errors()
+
+
+def prepare_file(upload):
+    """
+    (worker) validates an upload and returns its metadata,
+    or the validation errors
+    """
+    errors = []
+    for validator in Media._meta.get_field('file').validators:
+        try:
+            validator(upload)
+        except ValidationError as e:
+            errors.extend(e.messages)
+    if errors:
+        return {'errors': errors}
+    data = inspect_file(upload)
+    return {'file_type': data['mime_type'],
+            'file_size': data['file_size'],
+            'file_hash': get_file_hash(upload)}
+
+
+def store_file(upload, meta):
+    """
+    (worker) stores an upload, images converted to WebP
+    if they are not going to be processed after the insert
+    """
+    field = Media._meta.get_field('file')
+    name, content = upload.name, upload
+    if meta['file_type'] in FILETYPE_IMAGE and not CMS_MEDIA_PROCESSING_QUEUE:
+        upload.seek(0)
+        webp = run(encode_webp, upload.read())
+        if webp:
+            name = f'{os.path.splitext(name)[0]}.webp'
+            content = ContentFile(webp)
+            meta.update(file_type='image/webp', file_size=len(webp))
+    upload.seek(0)
+    return field.storage.save(field.generate_filename(None, name), content)
+
+
+def get_library_duplicates(hashes):
+    """
+    {hash: Media} of the files already in the library
+    """
+    duplicates = {}
+    if not CMS_MEDIA_DEDUPLICATION or not hashes: return duplicates
+    medias = Media.objects.filter(file_hash__in=hashes)\
+                          .exclude(processing_status=app_settings.MEDIA_PROCESSING_FAILED)\
+                          .only('file', 'file_size', 'file_type',
+                                'file_hash', 'processing_status')\
+                          .order_by('pk')
+    for media in medias:
+        if media.file_hash in duplicates: continue
+        if media.file.storage.exists(media.file.name):
+            duplicates[media.file_hash] = media
+    return duplicates
+
+
+def bulk_upload(uploads, user, description='', collection=None):
+    """
+    creates a Media for each (name, upload or errors) and,
+    if a collection is given, its MediaCollectionItem.
+    Files are validated, hashed and stored by a pool of
+    CMS_MEDIA_BULK_WORKERS threads, rows inserted in bulk.
+    Returns a report entry for each upload, in the same order
+    """
+    report = [{'name': name} for name, upload in uploads]
+    valid = []
+    for entry, (name, upload) in zip(report, uploads):
+        if isinstance(upload, list):
+            entry.update(status=BULK_INVALID, errors=upload)
+        else:
+            valid.append((entry, upload))
+
+    with ThreadPoolExecutor(max_workers=CMS_MEDIA_BULK_WORKERS,
+                            thread_name_prefix='unicms-bulk-upload') as executor:
+        prepared = list(executor.map(prepare_file,
+                                     [upload for entry, upload in valid]))
+
+        # uploads already in the library or in the batch share their file
+        duplicates = get_library_duplicates({meta['file_hash']
+                                             for meta in prepared
+                                             if 'file_hash' in meta})
+        to_store, to_share, originals = [], [], {}
+        for (entry, upload), meta in zip(valid, prepared):
+            if meta.get('errors'):
+                entry.update(status=BULK_INVALID, errors=meta['errors'])
+                continue
+            entry['meta'] = meta
+            if meta['file_hash'] in duplicates or meta['file_hash'] in originals:
+                to_share.append(entry)
+                continue
+            to_store.append((entry, upload))
+            if CMS_MEDIA_DEDUPLICATION:
+                originals[meta['file_hash']] = entry
+
+        names = executor.map(store_file,
+                             [upload for entry, upload in to_store],
+                             [entry['meta'] for entry, upload in to_store])
+        for (entry, upload), name in zip(to_store, names):
+            entry['file'] = name
+            entry['status'] = BULK_CREATED
+            if CMS_MEDIA_PROCESSING_QUEUE and \
+               entry['meta']['file_type'] in FILETYPE_IMAGE:
+                # optimized after the insert
+                entry['meta']['processing_status'] = app_settings.MEDIA_PROCESSING_PENDING
+
+    for entry in to_share:
+        meta = entry['meta']
+        duplicate = duplicates.get(meta['file_hash'])
+        if duplicate:
+            entry['file'] = duplicate.file.name
+            meta.update(file_type=duplicate.file_type,
+                        file_size=duplicate.file_size,
+                        processing_status=duplicate.processing_status)
+        else:
+            original = originals[meta['file_hash']]
+            entry['file'] = original['file']
+            original = original['meta']
+            meta.update(file_type=original['file_type'],
+                        file_size=original['file_size'])
+            if 'processing_status' in original:
+                meta['processing_status'] = original['processing_status']
+        entry['status'] = BULK_SHARED
+
+    created = [entry for entry in report if entry.get('file')]
+    try:
+        _bulk_insert(created, user, description, collection)
+    except Exception: # pragma: no cover
+        for entry, upload in to_store:
+            if entry.get('file'):
+                Media._meta.get_field('file').storage.delete(entry['file'])
+        raise
+
+    for entry in report:
+        meta = entry.pop('meta', None)
+        if meta and 'media' in entry:
+            media = entry.pop('media')
+            entry.update(id=media.pk, uuid=str(media.uuid),
+                         file_type=media.file_type,
+                         processing_status=media.processing_status)
+        entry.pop('file', None)
+    return report
+
+
+def _bulk_insert(entries, user, description, collection):
+    to_process = []
+    with transaction.atomic():
+        medias = []
+        for entry in entries:
+            meta = entry['meta']
+            media = Media(title=os.path.splitext(entry['name'])[0][:256],
+                          description=description,
+                          file=entry['file'],
+                          file_size=meta['file_size'],
+                          file_type=meta['file_type'],
+                          file_hash=meta['file_hash'],
+                          processing_status=meta.get('processing_status',
+                                                     app_settings.MEDIA_PROCESSING_DONE),
+                          created_by=user,
+                          modified_by=user)
+            medias.append(media)
+            entry['media'] = media
+        Media.objects.bulk_create(medias)
+        # primary keys aren't returned by all the databases
+        pks = dict(Media.objects.filter(uuid__in=[media.uuid for media in medias])
+                                .values_list('uuid', 'pk'))
+        for entry in entries:
+            media = entry['media']
+            media.pk = pks[media.uuid]
+            if entry['status'] == BULK_CREATED and \
+               media.processing_status == app_settings.MEDIA_PROCESSING_PENDING:
+                to_process.append((media.pk, media.file.name))
+
+        if collection:
+            order = MediaCollectionItem.objects.filter(collection=collection)\
+                                               .aggregate(Max('order'))['order__max'] or 0
+            MediaCollectionItem.objects.bulk_create(
+                [MediaCollectionItem(media=media,
+                                     collection=collection,
+                                     is_active=True,
+                                     order=order + (index + 1) * 10,
+                                     created_by=user,
+                                     modified_by=user)
+                 for index, media in enumerate(medias)])
+        log_objs_event(user=user, objs=medias, action_flag=ADDITION)
+        # no save signals
+        labels = [Media._meta.label_lower]
+        if collection:
+            labels.append(MediaCollectionItem._meta.label_lower)
+        transaction.on_commit(lambda: medias_bulk_created(labels))
+
+        for media_id, name in to_process:
+            transaction.on_commit(lambda media_id=media_id, name=name:
+                                  process_media(media_id, name))
+
+    if CMS_IMAGE_RENDITIONS_EAGER:
+        for media in medias:
+            get_renditions(media)
+    logger.info(f'Media bulk upload: {len(medias)} media created by {user}')
+    return medias
+
+
+def medias_bulk_created(labels):
+    """
+    deferred invalidations of the bulk inserted objects
+    """
+    from cms.api.cache import bump_model_generation
+    for label in labels:
+        bump_model_generation(label)
@@ -0,0 +1,140 @@
+import logging
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Count
+
+from . import settings as app_settings
+from . delivery import invalidate_media_file_info
+from . renditions import remove_renditions
+from . utils import get_file_hash
+
+
+logger = logging.getLogger(__name__)
+
+CMS_MEDIA_DEDUPLICATION = getattr(settings, 'CMS_MEDIA_DEDUPLICATION',
+                                  app_settings.CMS_MEDIA_DEDUPLICATION)
+
+
+def get_duplicate(media):
+    """
+    the oldest Media with the same content, whose file still exists
+    """
+    Media = apps.get_model('cmsmedias.Media')
+    duplicates = Media.objects.filter(file_hash=media.file_hash)\
+                              .exclude(pk=media.pk)\
+                              .exclude(processing_status=app_settings.MEDIA_PROCESSING_FAILED)\
+                              .only('file', 'file_size', 'file_type',
+                                    'processing_status')\
+                              .order_by('pk')
+    for duplicate in duplicates:
+        if duplicate.file and duplicate.file.storage.exists(duplicate.file.name):
+            return duplicate
+
+
+def deduplicate_file(media):
+    """
+    hashes the uploaded file of a Media and, if it is already
+    in the library, makes the Media share the stored one.
+    Called by set_file_meta PRESAVE hook
+    """
+    field = media.file
+    uploaded = not field._committed
+    if not uploaded and media.file_hash: return
+    media.file_hash = get_file_hash(field)
+    # the existing ones are deduplicated by cms_media_dedupe command
+    if not uploaded or not CMS_MEDIA_DEDUPLICATION: return
+
+    duplicate = get_duplicate(media)
+    if not duplicate: return
+    # not stored again
+    media.file = duplicate.file.name
+    media.file_size = duplicate.file_size
+    media.file_type = duplicate.file_type
+    media.processing_status = duplicate.processing_status
+    media._unicms_duplicate = True
+    logger.info(f'Media upload {field.name} shares {duplicate.file.name}')
+    return duplicate
+
+
+def share_file(media, name, file_size, file_type):
+    """
+    points a Media to another stored file, without hooks.
+    Its old file can be removed only after this
+    """
+    Media = apps.get_model('cmsmedias.Media')
+    Media.objects.filter(pk=media.pk).update(file=name,
+                                             file_size=file_size,
+                                             file_type=file_type)
+    # after the update, or the old file could be cached again
+    invalidate_media_file_info(media)
+
+
+def hash_media_library():
+    """
+    sets the missing hashes of the stored files.
+    Returns the number of hashed Media
+    """
+    Media = apps.get_model('cmsmedias.Media')
+    hashed = 0
+    for media in Media.objects.filter(file_hash__isnull=True)\
+                              .exclude(file='')\
+                              .only('file').iterator():
+        try:
+            with media.file.open('rb'):
+                file_hash = get_file_hash(media.file)
+        except (FileNotFoundError, OSError) as e:
+            logger.warning(f'Media {media.pk} {media.file.name} not hashed: {e}')
+            continue
+        Media.objects.filter(pk=media.pk).update(file_hash=file_hash)
+        hashed += 1
+    return hashed
+
+
+def deduplicate_media_library(dry_run=False):
+    """
+    makes all the Media with the same content share the file
+    of the oldest one and removes the others.
+    Returns (deduplicated Media, removed files, freed bytes)
+    """
+    Media = apps.get_model('cmsmedias.Media')
+    deduplicated, removed, freed = 0, 0, 0
+    hashes = Media.objects.filter(file_hash__isnull=False)\
+                          .values('file_hash')\
+                          .annotate(count=Count('pk'))\
+                          .filter(count__gt=1)\
+                          .order_by()\
+                          .values_list('file_hash', flat=True)
+    for file_hash in list(hashes):
+        # files going to be replaced by the media processing are skipped
+        medias = list(Media.objects.filter(file_hash=file_hash)
+                                   .exclude(processing_status__in=(app_settings.MEDIA_PROCESSING_PENDING,
+                                                                   app_settings.MEDIA_PROCESSING_RUNNING))
+                                   .only('uuid', 'file', 'file_size', 'file_type')
+                                   .order_by('pk'))
+        keeper = None
+        for media in medias:
+            if media.file.storage.exists(media.file.name):
+                keeper = media
+                break
+        if not keeper: continue
+
+        names = set()
+        for media in medias:
+            if media.file.name == keeper.file.name: continue
+            names.add(media.file.name)
+            deduplicated += 1
+            if dry_run: continue
+            share_file(media, keeper.file.name,
+                       keeper.file_size, keeper.file_type)
+
+        for name in names:
+            fieldfile = Media(file=name).file
+            if not fieldfile.storage.exists(name): continue
+            removed += 1
+            freed += fieldfile.storage.size(name)
+            if dry_run: continue
+            remove_renditions(fieldfile)
+            fieldfile.storage.delete(name)
+            logger.info(f'Media file {name} replaced by {keeper.file.name}')
+    return deduplicated, removed, freed
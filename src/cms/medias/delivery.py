@@ -0,0 +1,213 @@
+import logging
+import mimetypes
+import os
+import re
+import uuid
+
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http import (FileResponse,
+                         HttpResponse,
+                         StreamingHttpResponse)
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from cms.contexts.cache import CMS_CACHE_KEY_PREFIX
+
+from . import settings as app_settings
+from . models import Media
+
+
+logger = logging.getLogger(__name__)
+
+CMS_MEDIA_SENDFILE = getattr(settings, 'CMS_MEDIA_SENDFILE',
+                             app_settings.CMS_MEDIA_SENDFILE)
+CMS_MEDIA_SENDFILE_URL = getattr(settings, 'CMS_MEDIA_SENDFILE_URL',
+                                 app_settings.CMS_MEDIA_SENDFILE_URL)
+CMS_MEDIA_CACHE_MAX_AGE = getattr(settings, 'CMS_MEDIA_CACHE_MAX_AGE',
+                                  app_settings.CMS_MEDIA_CACHE_MAX_AGE)
+CMS_MEDIA_REVALIDATE_MAX_AGE = getattr(settings, 'CMS_MEDIA_REVALIDATE_MAX_AGE',
+                                       app_settings.CMS_MEDIA_REVALIDATE_MAX_AGE)
+CMS_MEDIA_MISS_CACHE_TTL = getattr(settings, 'CMS_MEDIA_MISS_CACHE_TTL',
+                                   app_settings.CMS_MEDIA_MISS_CACHE_TTL)
+
+MEDIA_FILES_KEY_PREFIX = f'{CMS_CACHE_KEY_PREFIX}media_file_'
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 65536
+
+
+def get_media_version(media):
+    # changes when the media (its file) changes
+    return f'{int(media.modified.timestamp()):x}'
+
+
+def make_media_file_cache_key(unique_code):
+    return f'{MEDIA_FILES_KEY_PREFIX}{unique_code}'
+
+
+def get_media_file_info(unique_code):
+    """
+    {name, path, size, mtime, content_type, version} of a media file,
+    cached: no queries and no stat calls to serve it again
+    """
+    try:
+        unique_code = uuid.UUID(str(unique_code))
+    except ValueError:
+        return
+    key = make_media_file_cache_key(unique_code)
+    info = cache.get(key)
+    if info is not None:
+        return info or None
+
+    media = Media.objects.filter(uuid=unique_code)\
+                         .only('file', 'file_type', 'modified').first()
+    info = {}
+    if media and media.file:
+        try:
+            info = _get_file_info(media)
+        # missing file, unreachable remote storage ...
+        except Exception as e:
+            logger.warning(f'Media file {media.file.name} not available: {e}')
+    # misses are cached briefly, the file can be there soon
+    cache.set(key, info,
+              CMS_MEDIA_CACHE_MAX_AGE if info else CMS_MEDIA_MISS_CACHE_TTL)
+    return info or None
+
+
+def _get_file_info(media):
+    name = media.file.name
+    storage = media.file.storage
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        # storages without local paths, the file is read with storage.open
+        path = None
+    if path:
+        stat = os.stat(path)
+        size, mtime = stat.st_size, int(stat.st_mtime)
+    else:
+        size = storage.size(name)
+        try:
+            mtime = int(storage.get_modified_time(name).timestamp())
+        except NotImplementedError:
+            mtime = int(media.modified.timestamp())
+    content_type = media.file_type or \
+                   mimetypes.guess_type(name)[0] or \
+                   'application/octet-stream'
+    return {'name': name,
+            'path': path,
+            'size': size,
+            'mtime': mtime,
+            'content_type': content_type,
+            'version': get_media_version(media)}
+
+
+def invalidate_media_files_info(medias):
+    """
+    removes the cached files info of many medias, again after
+    the commit: requests served in the meantime cache the old ones
+    """
+    keys = [make_media_file_cache_key(media.uuid) for media in medias]
+    if not keys: return
+    cache.delete_many(keys)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_media_file_info(media):
+    invalidate_media_files_info([media])
+
+
+def parse_range(header, size):
+    """
+    (start, end) of a single bytes range, None if the whole file
+    must be served, False if not satisfiable
+    """
+    match = RANGE_RE.match(header or '')
+    if not match: return
+    start, end = match.groups()
+    if not start and not end: return
+    if not start:
+        # last N bytes
+        start, end = max(0, size - int(end)), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end: return False
+    return start, end
+
+
+def _open_file(info):
+    if info['path']:
+        return open(info['path'], 'rb')
+    return Media._meta.get_field('file').storage.open(info['name'], 'rb')
+
+
+def _read_range(info, start, end):
+    with _open_file(info) as fopen:
+        fopen.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = fopen.read(min(CHUNK_SIZE, remaining))
+            if not chunk: break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_media_file(request, info):
+    """
+    media file response, with validators and cache headers.
+    The transfer is offloaded to the webserver if CMS_MEDIA_SENDFILE,
+    otherwise full files go through wsgi.file_wrapper (sendfile)
+    and ranges are streamed.
+    Files of storages without local paths are always streamed
+    """
+    etag = f'"{info["mtime"]:x}-{info["size"]:x}"'
+    last_modified = http_date(info['mtime'])
+    response = get_conditional_response(request, etag=etag,
+                                        last_modified=info['mtime'])
+    if response is None:
+        response = _get_file_response(request, info)
+
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    # versioned urls never change
+    if request.GET.get('v') == info['version']:
+        response['Cache-Control'] = f'public, max-age={CMS_MEDIA_CACHE_MAX_AGE}, immutable'
+    else:
+        response['Cache-Control'] = f'public, max-age={CMS_MEDIA_REVALIDATE_MAX_AGE}'
+    return response
+
+
+def _get_file_response(request, info):
+    # the webserver can only send local files
+    if CMS_MEDIA_SENDFILE and info['path']:
+        response = HttpResponse(content_type=info['content_type'])
+        if CMS_MEDIA_SENDFILE == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = f'{CMS_MEDIA_SENDFILE_URL}{quote(info["name"])}'
+        else:
+            response['X-Sendfile'] = info['path']
+        # ranges are handled by the webserver
+        return response
+
+    size = info['size']
+    byte_range = parse_range(request.headers.get('Range'), size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read_range(info, start, end),
+                                         status=206,
+                                         content_type=info['content_type'])
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    else:
+        response = FileResponse(_open_file(info),
+                                 content_type=info['content_type'])
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -1,13 +1,15 @@
 import logging
-import magic
 import os
 
-from cms.medias.utils import get_file_type_size
+from cms.medias.utils import get_file_type_size, inspect_file
 from django.conf import settings
 from django.core.files.uploadedfile import InMemoryUploadedFile
 
 from . import settings as app_settings
-from . utils import to_webp
+from . deduplication import deduplicate_file
+from . processing import CMS_MEDIA_PROCESSING_QUEUE, enqueue_media
+from . renditions import remove_renditions
+from . utils import is_file_shared, to_webp
 
 
 logger = logging.getLogger(__name__)
@@ -16,9 +18,13 @@ FILETYPE_IMAGE = getattr(settings, 'FILETYPE_IMAGE',
 
 
 def set_file_meta(media_object):
+    # set by the media processing
+    if getattr(media_object, '_unicms_processed', False): return
     data = get_file_type_size(media_object)
     media_object.file_size = data['file_size']
     media_object.file_type = data['mime_type']
+    if hasattr(media_object, 'file_hash'):
+        deduplicate_file(media_object)
 
 
 def webp_image_optimizer(media_object):
@@ -30,8 +36,21 @@ def webp_image_optimizer(media_object):
 
     if not getattr(field, '_file', None): # pragma: no cover
         return
+    if getattr(media_object, '_unicms_processed', False):
+        return
+    # shares an already optimized file
+    if getattr(media_object, '_unicms_duplicate', False):
+        return
+
+    mimetype = inspect_file(field._file)['mime_type']
+    if mimetype in FILETYPE_IMAGE and CMS_MEDIA_PROCESSING_QUEUE and \
+       hasattr(media_object, 'processing_status'):
+        # stored files (done, pending or failed) are never processed again,
+        # new uploads are converted later, by the media processing pool
+        if field._committed: return
+        enqueue_media(media_object)
+        return True
 
-    mimetype = magic.Magic(mime=True).from_buffer(field._file.file.read())
     if mimetype in FILETYPE_IMAGE:
         field._file.seek(0)
         byte_io = to_webp(field._file)
@@ -60,6 +79,9 @@ def webp_image_optimizer(media_object):
 
 
 def remove_file(media_object):
+    # used by other objects too
+    if is_file_shared(media_object): return
+    remove_renditions(media_object.file)
     fpath = media_object.file.path
     try:
         os.remove(fpath)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from cms.medias.deduplication import (deduplicate_media_library,
+                                      hash_media_library)
+
+
+class Command(BaseCommand):
+    help = 'uniCMS media library deduplication'
+
+    def add_arguments(self, parser):
+        parser.epilog = 'Example: ./manage.py cms_media_dedupe [-dry-run]'
+        parser.add_argument('-dry-run', required=False, action="store_true",
+                            help="only count the duplicates")
+
+    def handle(self, *args, **options):
+        hashed = hash_media_library()
+        print(f'{hashed} media hashed')
+        deduplicated, removed, freed = deduplicate_media_library(dry_run=options['dry_run'])
+        prefix = '[dry run] ' if options['dry_run'] else ''
+        print(f'{prefix}{deduplicated} media deduplicated, '
+              f'{removed} files removed ({round(freed / 1024)} KB freed)')
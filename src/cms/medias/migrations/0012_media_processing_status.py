@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-19 03:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cmsmedias', '0011_alter_media_uuid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='media',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'pending'), ('processing', 'processing'), ('done', 'done'), ('failed', 'failed')], default='done', editable=False, max_length=12),
+        ),
+    ]
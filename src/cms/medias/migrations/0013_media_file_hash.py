@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-19 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cmsmedias', '0012_media_processing_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='media',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, null=True),
+        ),
+    ]
@@ -81,6 +81,14 @@ class Media(TimeStampedModel, AbstractMedia,
                             editable=False,
                             unique=True,
                             db_index=True)
+    # SHA-256 of the uploaded content, see cms.medias.deduplication
+    file_hash = models.CharField(max_length=64, blank=True, null=True,
+                                 db_index=True, editable=False)
+    # images optimization, see cms.medias.processing
+    processing_status = models.CharField(max_length=12,
+                                         choices=MEDIA_PROCESSING_STATUSES,
+                                         default=MEDIA_PROCESSING_DONE,
+                                         editable=False)
 
     class Meta:
         verbose_name_plural = _("Media")
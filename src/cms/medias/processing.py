@@ -0,0 +1,151 @@
+import logging
+import os
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+
+from . import settings as app_settings
+from . delivery import invalidate_media_files_info
+from . utils import to_webp
+
+
+logger = logging.getLogger(__name__)
+
+CMS_MEDIA_PROCESSING_QUEUE = getattr(settings, 'CMS_MEDIA_PROCESSING_QUEUE',
+                                     app_settings.CMS_MEDIA_PROCESSING_QUEUE)
+CMS_MEDIA_PROCESSING_WORKERS = getattr(settings, 'CMS_MEDIA_PROCESSING_WORKERS',
+                                       app_settings.CMS_MEDIA_PROCESSING_WORKERS)
+
+_pool = None
+_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=CMS_MEDIA_PROCESSING_WORKERS)
+    return _pool
+
+
+def run(func, *args):
+    """
+    runs a CPU bound function in the process pool and waits for it,
+    in the caller if CMS_MEDIA_PROCESSING_WORKERS is 0
+    """
+    if not CMS_MEDIA_PROCESSING_WORKERS:
+        return func(*args)
+    return get_pool().submit(func, *args).result()
+
+
+def get_source(fieldfile):
+    """
+    what workers read: the file path, or its content
+    if the storage is not local
+    """
+    try:
+        return fieldfile.storage.path(fieldfile.name)
+    except NotImplementedError: # pragma: no cover
+        with fieldfile.storage.open(fieldfile.name) as fopen:
+            return fopen.read()
+
+
+def encode_webp(source):
+    """
+    (worker) WebP content of an image path or content
+    """
+    fobj = BytesIO(source) if isinstance(source, bytes) else source
+    byte_io = to_webp(fobj)
+    if byte_io:
+        return byte_io.getvalue()
+
+
+def enqueue_media(media):
+    """
+    optimizes the image of a media once saved.
+    Called by PRESAVE hooks, see schedule_media_processing
+    """
+    media.processing_status = app_settings.MEDIA_PROCESSING_PENDING
+    media._unicms_enqueued = True
+
+
+def schedule_media_processing(media):
+    """
+    processes an enqueued media after the commit.
+    Called on post_save, when its pk and the stored file name are known
+    """
+    if not media.__dict__.pop('_unicms_enqueued', False): return
+    media_id, name = media.pk, media.file.name
+    transaction.on_commit(lambda: process_media(media_id, name))
+
+
+def process_media(media_id, name):
+    Media = apps.get_model('cmsmedias.Media')
+    if not Media.objects.filter(pk=media_id, file=name)\
+                        .update(processing_status=app_settings.MEDIA_PROCESSING_RUNNING):
+        return
+    media = Media(pk=media_id, file=name)
+    source = get_source(media.file)
+    if not CMS_MEDIA_PROCESSING_WORKERS:
+        try:
+            return media_processed(media_id, name, encode_webp(source))
+        except Exception as e: # pragma: no cover
+            return media_processed(media_id, name, error=e)
+
+    def done(future):
+        # in a thread of the pool
+        close_old_connections()
+        try:
+            error = future.exception()
+            media_processed(media_id, name,
+                            None if error else future.result(),
+                            error=error)
+        finally:
+            close_old_connections()
+
+    get_pool().submit(encode_webp, source).add_done_callback(done)
+
+
+def media_processed(media_id, name, content=None, error=None):
+    """
+    replaces the original file of a media with its optimized version
+    """
+    Media = apps.get_model('cmsmedias.Media')
+    # deleted or replaced in the meantime
+    media = Media.objects.filter(pk=media_id, file=name).first()
+    if not media: return
+
+    if error or not content:
+        logger.error(f'Media {media_id} {name} processing failed: {error}')
+        Media.objects.filter(file=name)\
+                     .update(processing_status=app_settings.MEDIA_PROCESSING_FAILED)
+        return
+
+    storage = media.file.storage
+    media.file.name = storage.save(f'{os.path.splitext(name)[0]}.webp',
+                                   ContentFile(content))
+    media.file_size = len(content)
+    media.file_type = 'image/webp'
+    media.processing_status = app_settings.MEDIA_PROCESSING_DONE
+    # PRESAVE hooks don't process it again
+    media._unicms_processed = True
+    media.save(update_fields=['file', 'file_size', 'file_type',
+                              'processing_status', 'modified'])
+    # uploads of the same file, see cms.medias.deduplication
+    sharing = Media.objects.filter(file=name)
+    shared = list(sharing.only('uuid'))
+    sharing.update(file=media.file.name,
+                   file_size=media.file_size,
+                   file_type=media.file_type,
+                   processing_status=media.processing_status)
+    # the cached info must never point to the removed file
+    invalidate_media_files_info(shared)
+    storage.delete(name)
+    logger.info(f'Media {media_id} {name} converted to {media.file.name}')
+    return media
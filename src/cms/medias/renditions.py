@@ -0,0 +1,221 @@
+import hashlib
+import logging
+import mimetypes
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db.models.fields.files import FieldFile
+from PIL import Image
+
+from cms.contexts.cache import CMS_CACHE_KEY_PREFIX
+
+from . import settings as app_settings
+from . processing import get_source, run
+
+
+logger = logging.getLogger(__name__)
+
+FILETYPE_IMAGE = getattr(settings, 'FILETYPE_IMAGE',
+                         app_settings.FILETYPE_IMAGE)
+CMS_IMAGE_RENDITIONS_ENABLED = getattr(settings, 'CMS_IMAGE_RENDITIONS_ENABLED',
+                                       app_settings.CMS_IMAGE_RENDITIONS_ENABLED)
+CMS_IMAGE_RENDITIONS_WIDTHS = getattr(settings, 'CMS_IMAGE_RENDITIONS_WIDTHS',
+                                      app_settings.CMS_IMAGE_RENDITIONS_WIDTHS)
+CMS_IMAGE_RENDITIONS_FORMATS = getattr(settings, 'CMS_IMAGE_RENDITIONS_FORMATS',
+                                       app_settings.CMS_IMAGE_RENDITIONS_FORMATS)
+CMS_IMAGE_RENDITIONS_QUALITY = getattr(settings, 'CMS_IMAGE_RENDITIONS_QUALITY',
+                                       app_settings.CMS_IMAGE_RENDITIONS_QUALITY)
+CMS_IMAGE_RENDITIONS_EAGER = getattr(settings, 'CMS_IMAGE_RENDITIONS_EAGER',
+                                     app_settings.CMS_IMAGE_RENDITIONS_EAGER)
+CMS_IMAGE_RENDITIONS_WORKERS = getattr(settings, 'CMS_IMAGE_RENDITIONS_WORKERS',
+                                       app_settings.CMS_IMAGE_RENDITIONS_WORKERS)
+
+RENDITIONS_KEY_PREFIX = f'{CMS_CACHE_KEY_PREFIX}renditions_'
+
+_executor = None
+_scheduled = set()
+_lock = threading.Lock()
+
+
+def get_image_file(obj):
+    """
+    FieldFile of a Media or of an image field
+    """
+    if not obj: return
+    if isinstance(obj, FieldFile):
+        mime_type = mimetypes.guess_type(obj.name)[0]
+    else:
+        mime_type = getattr(obj, 'file_type', None)
+        obj = getattr(obj, 'file', None)
+    if obj and mime_type in FILETYPE_IMAGE:
+        return obj
+
+
+def get_rendition_name(name, width, fmt):
+    # medias/2021/image.jpg -> medias/2021/image.640w.webp
+    return f'{os.path.splitext(name)[0]}.{width}w.{fmt}'
+
+
+def make_renditions_cache_key(name):
+    return f'{RENDITIONS_KEY_PREFIX}{hashlib.sha256(name.encode()).hexdigest()}'
+
+
+def encode_renditions(source, variants, quality=CMS_IMAGE_RENDITIONS_QUALITY):
+    """
+    (worker) {(width, format): content} of the resized variants
+    of an image path or content
+    """
+    image = Image.open(BytesIO(source) if isinstance(source, bytes) else source)
+    mode = 'RGBA' if image.mode in ('RGBA', 'LA', 'P', 'PA') else 'RGB'
+    image = image.convert(mode)
+    encoded = {}
+    for width, fmt in variants:
+        height = max(1, round(image.height * width / image.width))
+        byte_io = BytesIO()
+        image.resize((width, height), Image.LANCZOS)\
+             .save(byte_io, format=fmt.upper(), quality=quality)
+        encoded[(width, fmt)] = byte_io.getvalue()
+    return encoded
+
+
+def save_rendition(storage, name, content):
+    """
+    stores a rendition with its own name, never an alternative one.
+    If another worker stored it in the meantime, that one is kept
+    """
+    if storage.exists(name): return name
+    saved = storage.save(name, ContentFile(content))
+    # image.640w_<random>.webp, chosen by the storage
+    if os.path.basename(saved) != os.path.basename(name):
+        storage.delete(saved)
+        return name
+    logger.info(f'Media rendition {saved} created')
+    return saved
+
+
+def create_renditions(fieldfile):
+    """
+    generates the missing renditions of an image.
+    Returns {'width': original width, 'renditions': {format: {width: name}}}
+    """
+    storage, name = fieldfile.storage, fieldfile.name
+    info = {'width': 0, 'renditions': {}}
+    missing = []
+    with storage.open(name) as fopen:
+        # only the header is read
+        image = Image.open(fopen)
+        info['width'] = image.width
+        # renditions would lose the animation
+        animated = getattr(image, 'is_animated', False)
+    for fmt in CMS_IMAGE_RENDITIONS_FORMATS:
+        renditions = info['renditions'].setdefault(fmt, {})
+        for width in CMS_IMAGE_RENDITIONS_WIDTHS:
+            # never upscaled
+            if animated or width >= info['width']: continue
+            renditions[width] = get_rendition_name(name, width, fmt)
+            if not storage.exists(renditions[width]):
+                missing.append((width, fmt))
+    if missing:
+        # resized in the media processing pool
+        encoded = run(encode_renditions, get_source(fieldfile), missing,
+                      CMS_IMAGE_RENDITIONS_QUALITY)
+        for (width, fmt), content in encoded.items():
+            renditions = info['renditions'][fmt]
+            renditions[width] = save_rendition(storage, renditions[width], content)
+    cache.set(make_renditions_cache_key(name), info, None)
+    return info
+
+
+def _create_renditions(fieldfile):
+    try:
+        return create_renditions(fieldfile)
+    except Exception as e: # pragma: no cover
+        logger.exception(f'Media renditions of {fieldfile.name} failed: {e}')
+    finally:
+        with _lock:
+            _scheduled.discard(fieldfile.name)
+
+
+def schedule_renditions(fieldfile):
+    """
+    generates the renditions in a background thread
+    (in the caller if CMS_IMAGE_RENDITIONS_WORKERS is 0)
+    """
+    global _executor
+    with _lock:
+        if fieldfile.name in _scheduled: return
+        _scheduled.add(fieldfile.name)
+    if not CMS_IMAGE_RENDITIONS_WORKERS:
+        return _create_renditions(fieldfile)
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=CMS_IMAGE_RENDITIONS_WORKERS,
+                                           thread_name_prefix='unicms-renditions')
+    return _executor.submit(_create_renditions, fieldfile)
+
+
+def get_renditions(obj):
+    """
+    renditions info of a Media or an image field, if already generated,
+    otherwise they are scheduled and None is returned
+    """
+    if not CMS_IMAGE_RENDITIONS_ENABLED: return
+    # the original is going to be replaced
+    if getattr(obj, 'processing_status', None) in (app_settings.MEDIA_PROCESSING_PENDING,
+                                                   app_settings.MEDIA_PROCESSING_RUNNING):
+        return
+    fieldfile = get_image_file(obj)
+    if not fieldfile: return
+    info = cache.get(make_renditions_cache_key(fieldfile.name))
+    if info is None:
+        schedule_renditions(fieldfile)
+    return info
+
+
+def get_srcset(obj, fmt=None):
+    """
+    srcset attribute value of a Media or an image field,
+    empty if there are no renditions yet
+    """
+    info = get_renditions(obj)
+    if not info: return ''
+    fmt = fmt or CMS_IMAGE_RENDITIONS_FORMATS[0]
+    renditions = info['renditions'].get(fmt)
+    if not renditions: return ''
+    storage = get_image_file(obj).storage
+    srcset = [f'{storage.url(name)} {width}w'
+              for width, name in sorted(renditions.items())]
+    srcset.append(f'{get_image_file(obj).url} {info["width"]}w')
+    return ', '.join(srcset)
+
+
+def get_rendition_url(obj, width, fmt=None):
+    """
+    url of the smallest rendition at least width pixels wide,
+    the original one if missing
+    """
+    fieldfile = get_image_file(obj)
+    if not fieldfile: return getattr(obj, 'url', '')
+    info = get_renditions(obj)
+    fmt = fmt or CMS_IMAGE_RENDITIONS_FORMATS[0]
+    renditions = (info or {}).get('renditions', {}).get(fmt, {})
+    for rendition_width, name in sorted(renditions.items()):
+        if rendition_width >= width:
+            return fieldfile.storage.url(name)
+    return fieldfile.url
+
+
+def remove_renditions(fieldfile):
+    storage, name = fieldfile.storage, fieldfile.name
+    for fmt in CMS_IMAGE_RENDITIONS_FORMATS:
+        for width in CMS_IMAGE_RENDITIONS_WIDTHS:
+            rendition = get_rendition_name(name, width, fmt)
+            if storage.exists(rendition):
+                storage.delete(rendition)
+    cache.delete(make_renditions_cache_key(name))
@@ -10,6 +10,7 @@ from rest_framework import serializers
 from taggit_serializer.serializers import (TagListSerializerField,
                                            TaggitSerializer)
 
+from . delivery import get_media_version
 from . models import Media, MediaCollection, MediaCollectionItem
 from . utils import get_image_width_height
 
@@ -31,6 +32,8 @@ class MediaSerializer(UniCMSCreateUpdateSerializer,
         data['file'] = secure_url(data['file'])
         data['file_size'] = instance.file_size_kb
         data['static_path'] = reverse('unicms_medias:media-file', kwargs={'unique_code': instance.uuid})
+        # versioned, cached forever by browsers
+        data['static_path'] += f'?v={get_media_version(instance)}'
         try:
             size = get_image_width_height(instance.file)
             if size:
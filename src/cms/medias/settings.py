@@ -1,6 +1,44 @@
+from django.utils.translation import gettext_lazy as _
+
+
 CMS_IMAGE_CATEGORY_SIZE = 128
 CMS_IMAGE_THUMBSIZE = 128
 
+# responsive images, resized variants stored next to the original
+CMS_IMAGE_RENDITIONS_ENABLED = True
+CMS_IMAGE_RENDITIONS_WIDTHS = (320, 640, 1024, 1600)
+# 'webp', 'avif' (if supported by Pillow)
+CMS_IMAGE_RENDITIONS_FORMATS = ('webp',)
+CMS_IMAGE_RENDITIONS_QUALITY = 75
+# generated when media are saved, otherwise when first requested
+CMS_IMAGE_RENDITIONS_EAGER = True
+# background threads that generate renditions, 0 means in the caller
+CMS_IMAGE_RENDITIONS_WORKERS = 2
+
+# images are optimized after the save, by a process pool,
+# instead of in the PRESAVE hook
+CMS_MEDIA_PROCESSING_QUEUE = True
+# processes of the pool (also used for renditions), 0 means in the caller
+CMS_MEDIA_PROCESSING_WORKERS = 2
+
+# uploads of files already in the library share their stored file
+# (and renditions), see Media.file_hash and cms_media_dedupe command
+CMS_MEDIA_DEDUPLICATION = True
+
+# bulk upload api (multipart files and zip archives)
+CMS_MEDIA_BULK_MAX_FILES = 500
+# threads that validate, hash and store the files
+CMS_MEDIA_BULK_WORKERS = 4
+
+MEDIA_PROCESSING_PENDING = 'pending'
+MEDIA_PROCESSING_RUNNING = 'processing'
+MEDIA_PROCESSING_DONE = 'done'
+MEDIA_PROCESSING_FAILED = 'failed'
+MEDIA_PROCESSING_STATUSES = ((MEDIA_PROCESSING_PENDING, _('pending')),
+                             (MEDIA_PROCESSING_RUNNING, _('processing')),
+                             (MEDIA_PROCESSING_DONE, _('done')),
+                             (MEDIA_PROCESSING_FAILED, _('failed')))
+
 # file validation
 FILETYPE_PDF = ('application/pdf',)
 FILETYPE_DATA = ('text/csv', 'application/json',
@@ -34,8 +72,21 @@ FILE_NAME_MAX_LEN = 128
 # 250MB - 214958080
 # 500MB - 429916160
 FILE_MAX_SIZE = 5242880
+# bytes read to detect the mime type of an upload,
+# office documents need some tens of KB
+FILE_MIME_SNIFF_SIZE = 65536
 
 FILETYPE_IMAGE_YX_RATIO_MIN = 0.28
 FILETYPE_IMAGE_YX_RATIO_MAX = 0.6
 
 CMS_MEDIA_HANDLER_PATH = 'uuid-media'
+# media files served by CMS_MEDIA_HANDLER_PATH are sent by the webserver:
+# '' (django), 'x-accel-redirect' (nginx) or 'x-sendfile' (apache, lighttpd)
+CMS_MEDIA_SENDFILE = ''
+# nginx internal location aliased to MEDIA_ROOT
+CMS_MEDIA_SENDFILE_URL = '/protected-media/'
+# in seconds, versioned media urls (?v=) are immutable
+CMS_MEDIA_CACHE_MAX_AGE = 31536000
+CMS_MEDIA_REVALIDATE_MAX_AGE = 3600
+# in seconds, uuids without an available file
+CMS_MEDIA_MISS_CACHE_TTL = 30
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+
+from . delivery import invalidate_media_file_info
+from . models import Media
+from . processing import schedule_media_processing
+from . renditions import CMS_IMAGE_RENDITIONS_EAGER, get_renditions
+
+
+def media_renditions(instance, *args, **kwargs):
+    # scheduled if missing
+    get_renditions(instance)
+
+
+def media_file_changed(instance, *args, **kwargs):
+    invalidate_media_file_info(instance)
+
+
+def media_processing(instance, *args, **kwargs):
+    # uploads enqueued by the PRESAVE hooks
+    schedule_media_processing(instance)
+
+
+post_save.connect(media_file_changed, sender=Media)
+post_delete.connect(media_file_changed, sender=Media)
+post_save.connect(media_processing, sender=Media)
+
+if CMS_IMAGE_RENDITIONS_EAGER:
+    post_save.connect(media_renditions, sender=Media)
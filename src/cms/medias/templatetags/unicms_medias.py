@@ -0,0 +1,26 @@
+import logging
+
+from django import template
+
+from cms.medias.renditions import get_rendition_url, get_srcset
+
+logger = logging.getLogger(__name__)
+register = template.Library()
+
+
+@register.filter
+def srcset(media, fmt=None):
+    """
+    {{ media|srcset }} -> srcset attribute value
+    of a Media or an image field, empty if not yet available
+    """
+    return get_srcset(media, fmt)
+
+
+@register.filter
+def rendition(media, width):
+    """
+    {{ media|rendition:640 }} -> url of the smallest
+    rendition at least 640px wide
+    """
+    return get_rendition_url(media, int(width))
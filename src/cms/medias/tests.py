@@ -1,16 +1,36 @@
 import logging
+import magic
 import os
 
 from django.conf import settings
+from django.core.files import File
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.test import Client, TestCase
 from django.urls import reverse
 from django.utils import timezone
 from glob import glob
 from shutil import copyfile
+from unittest.mock import patch
 
 from . models import Media, MediaCollection, MediaCollectionItem, ValidationError, validate_file_size, validate_image_size_ratio
+from . delivery import (CMS_MEDIA_MISS_CACHE_TTL,
+                        CMS_MEDIA_SENDFILE_URL,
+                        get_media_file_info,
+                        get_media_version)
+from . hooks import set_file_meta, webp_image_optimizer
+from . processing import media_processed
+from . renditions import (create_renditions,
+                          get_renditions,
+                          get_rendition_url,
+                          get_srcset,
+                          make_renditions_cache_key,
+                          save_rendition)
 from . validators import validate_file_extension
-from . settings import FILE_MAX_SIZE
+from . settings import FILE_MAX_SIZE, FILE_MIME_SNIFF_SIZE
+from . utils import _remove_file, get_image_width_height
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -108,6 +128,219 @@ class MediaUnitTest(TestCase):
                                    kwargs={'unique_code': media.uuid}))
         self.assertEqual(response.status_code, 200)
 
+    def test_single_pass_inspection(self):
+        fpath = f'{settings.MEDIA_ROOT}/unit_tests/download.jpeg'
+        with open(fpath, 'rb') as f:
+            upload = SimpleUploadedFile('download.jpeg', f.read(),
+                                        content_type='image/jpeg')
+        media = Media(title='media1', file=upload, description='blah blah')
+
+        with patch.object(magic.Magic, 'from_buffer', autospec=True,
+                          side_effect=magic.Magic.from_buffer) as sniff:
+            validate_file_extension(upload)
+            validate_file_size(upload)
+            try:
+                validate_image_size_ratio(upload)
+            except ValidationError:
+                pass
+            set_file_meta(media)
+            assert get_image_width_height(media.file)
+            # the same upload is sniffed once, from its head
+            assert sniff.call_count == 1
+            assert len(sniff.call_args[0][1]) <= FILE_MIME_SNIFF_SIZE
+            assert media.file_type == 'image/jpeg'
+            assert media.file_size == upload.size
+
+            assert webp_image_optimizer(media)
+            assert sniff.call_count == 1
+
+    def test_renditions(self):
+        fpath = f'{settings.MEDIA_ROOT}/images/categories/eventi.jpg'
+        with open(fpath, 'rb') as f:
+            upload = SimpleUploadedFile('eventi.jpg', f.read(),
+                                        content_type='image/jpeg')
+        with patch('cms.medias.renditions.CMS_IMAGE_RENDITIONS_ENABLED', True), \
+             patch('cms.medias.renditions.CMS_IMAGE_RENDITIONS_WORKERS', 0):
+            # generated on save
+            media = Media.objects.create(title='eventi', file=upload,
+                                         description='blah blah')
+            info = get_renditions(media)
+            renditions = info['renditions']['webp']
+            # never upscaled
+            assert sorted(renditions) == [320, 640]
+            storage = media.file.storage
+            assert all(storage.exists(i) for i in renditions.values())
+
+            srcset = get_srcset(media)
+            assert f'{storage.url(renditions[320])} 320w' in srcset
+            assert f'{media.file.url} 850w' in srcset
+            assert get_rendition_url(media, 300) == storage.url(renditions[320])
+            assert get_rendition_url(media, 1024) == media.file.url
+
+            media.delete()
+            assert not any(storage.exists(i) for i in renditions.values())
+
+    def test_renditions_storage(self):
+        fpath = f'{settings.MEDIA_ROOT}/unit_tests/renditions.jpg'
+        copyfile(f'{settings.MEDIA_ROOT}/images/categories/eventi.jpg', fpath)
+        media = Media(file=fpath, file_type='image/jpeg')
+        with patch('cms.medias.renditions.CMS_IMAGE_RENDITIONS_WORKERS', 0):
+            info = create_renditions(media.file)
+        renditions = list(info['renditions']['webp'].values())
+        rendition = renditions[0]
+
+        # stored by another worker after the exists() check
+        storage = FileSystemStorage()
+        calls = []
+        def exists(name):
+            calls.append(name)
+            return len(calls) > 1 and os.path.exists(storage.path(name))
+        with patch.object(storage, 'exists', side_effect=exists):
+            assert save_rendition(storage, rendition, b'other') == rendition
+        with storage.open(rendition) as f:
+            assert f.read() != b'other'
+        assert not glob(f'{os.path.splitext(storage.path(rendition))[0]}_*')
+
+        # replaced files (api PUT/PATCH) lose their renditions too
+        _remove_file(media)
+        assert not any(storage.exists(i) for i in renditions)
+        assert cache.get(make_renditions_cache_key(media.file.name)) is None
+
+    def test_media_file_delivery(self):
+        fpath = f'{settings.MEDIA_ROOT}/unit_tests/delivery.txt'
+        content = bytes(range(256)) * 4
+        with open(fpath, 'wb') as f:
+            f.write(content)
+        media = MediaUnitTest.create_media(file=fpath)
+        url = reverse('unicms_medias:media-file',
+                      kwargs={'unique_code': media.uuid})
+
+        response = self.client.get(url)
+        assert b''.join(response.streaming_content) == content
+        assert response['Accept-Ranges'] == 'bytes'
+        assert 'immutable' not in response['Cache-Control']
+        # uuid -> file map
+        with self.assertNumQueries(0):
+            response = self.client.get(f'{url}?v={get_media_version(media)}')
+        assert 'immutable' in response['Cache-Control']
+        etag = response['ETag']
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        response = self.client.get(url, HTTP_RANGE='bytes=10-19')
+        assert response.status_code == 206
+        assert response['Content-Range'] == f'bytes 10-19/{len(content)}'
+        assert b''.join(response.streaming_content) == content[10:20]
+        response = self.client.get(url, HTTP_RANGE='bytes=-5')
+        assert b''.join(response.streaming_content) == content[-5:]
+        response = self.client.get(url, HTTP_RANGE=f'bytes={len(content)}-')
+        assert response.status_code == 416
+
+        with patch('cms.medias.delivery.CMS_MEDIA_SENDFILE', 'x-accel-redirect'):
+            response = self.client.get(url)
+            assert response['X-Accel-Redirect'].startswith(CMS_MEDIA_SENDFILE_URL)
+            assert not response.content
+
+        # changes are seen
+        media.delete()
+        assert not os.path.exists(media.file.path)
+        assert self.client.get(url).status_code == 404
+        assert self.client.get(reverse('unicms_medias:media-file',
+                                       kwargs={'unique_code': 'wrong'})).status_code == 404
+
+    def test_media_file_delivery_storage(self):
+        class RemoteStorage(FileSystemStorage):
+            # as a storage without local paths
+            def path(self, name):
+                raise NotImplementedError()
+
+            def _open(self, name, mode='rb'):
+                return File(open(super().path(name), mode))
+
+            def size(self, name):
+                return os.path.getsize(super().path(name))
+
+        fpath = f'{settings.MEDIA_ROOT}/unit_tests/delivery_storage.txt'
+        content = b'remote storage ' * 64
+        with open(fpath, 'wb') as f:
+            f.write(content)
+        media = MediaUnitTest.create_media(file=fpath)
+        url = reverse('unicms_medias:media-file',
+                      kwargs={'unique_code': media.uuid})
+        field = Media._meta.get_field('file')
+        with patch.object(field, 'storage', RemoteStorage()), \
+             patch('cms.medias.delivery.CMS_MEDIA_SENDFILE', 'x-sendfile'):
+            info = get_media_file_info(media.uuid)
+            assert info['path'] is None
+            assert info['size'] == len(content)
+            # streamed, not sent by the webserver
+            response = self.client.get(url)
+            assert 'X-Sendfile' not in response
+            assert b''.join(response.streaming_content) == content
+            response = self.client.get(url, HTTP_RANGE='bytes=0-5')
+            assert b''.join(response.streaming_content) == content[:6]
+        media.delete()
+
+    def test_media_file_delivery_miss(self):
+        fpath = f'{settings.MEDIA_ROOT}/unit_tests/delivery_miss.txt'
+        with open(fpath, 'w') as f:
+            f.write('not yet there')
+        media = MediaUnitTest.create_media(file=fpath)
+        os.remove(fpath)
+        url = reverse('unicms_medias:media-file',
+                      kwargs={'unique_code': media.uuid})
+        # misses are cached briefly
+        with patch('cms.medias.delivery.cache.set') as cache_set:
+            assert self.client.get(url).status_code == 404
+        assert cache_set.call_args[0][2] == CMS_MEDIA_MISS_CACHE_TTL
+        Media.objects.filter(pk=media.pk).delete()
+
+    def test_media_processed_sharing(self):
+        fpath = f'{settings.MEDIA_ROOT}/unit_tests/processed.txt'
+        with open(fpath, 'w') as f:
+            f.write('original content')
+        media = MediaUnitTest.create_media(file=fpath)
+        shared = MediaUnitTest.create_media(title='shared')
+        Media.objects.filter(pk=shared.pk).update(file=fpath)
+
+        def invalidate(medias):
+            # sharers already updated, old file not removed yet
+            assert not Media.objects.filter(file=fpath).exists()
+            assert os.path.exists(fpath)
+            invalidated.extend(i.pk for i in medias)
+        invalidated = []
+        with patch('cms.medias.processing.invalidate_media_files_info',
+                   side_effect=invalidate):
+            media_processed(media.pk, fpath, content=b'optimized')
+        assert invalidated == [shared.pk]
+        assert not os.path.exists(fpath)
+        shared.refresh_from_db()
+        assert shared.file.name.endswith('processed.webp')
+        assert get_media_file_info(shared.uuid)['size'] == len(b'optimized')
+        media.delete()
+        Media.objects.filter(pk=shared.pk).delete()
+
+    def test_media_dedupe_command(self):
+        copies = [f'{settings.MEDIA_ROOT}/unit_tests/dedupe{i}.txt' for i in range(3)]
+        for copy in copies:
+            with open(copy, 'w') as f:
+                f.write('the same content ' * 64)
+        medias = [MediaUnitTest.create_media(file=copy) for copy in copies]
+        # not hashed yet
+        Media.objects.update(file_hash=None)
+
+        call_command('cms_media_dedupe', '-dry-run')
+        assert all(os.path.exists(copy) for copy in copies)
+
+        call_command('cms_media_dedupe')
+        for media in medias:
+            media.refresh_from_db()
+            assert media.file.name == copies[0]
+        assert not os.path.exists(copies[1])
+        assert not os.path.exists(copies[2])
+        for media in medias:
+            media.delete()
+        assert not os.path.exists(copies[0])
+
     def tearDown(self):
         match = f'{settings.MEDIA_ROOT}/medias/{timezone.now().year}/eventi_*.*'
         for i in glob(match):
@@ -1,8 +1,10 @@
+import hashlib
 import logging
 import magic
 import os
 
 from django.conf import settings
+from django.db.models.fields.files import FieldFile
 
 from io import BytesIO
 from PIL import Image
@@ -14,29 +16,73 @@ logger = logging.getLogger(__name__)
 
 FILETYPE_IMAGE = getattr(settings, 'FILETYPE_IMAGE',
                          app_settings.FILETYPE_IMAGE)
+FILE_MIME_SNIFF_SIZE = getattr(settings, 'FILE_MIME_SNIFF_SIZE',
+                               app_settings.FILE_MIME_SNIFF_SIZE)
 
 
-def get_file_type_size(media_obj) -> dict:
-    fopen = media_obj.file
-    mime = magic.Magic(mime=True)
+def _get_inspected_file(fobj):
+    # validators get a FieldFile or an UploadedFile, hooks the FieldFile:
+    # the results are cached on the underlying django File
+    if isinstance(fobj, FieldFile):
+        return fobj.file
+    return fobj
+
+
+def inspect_file(fobj) -> dict:
+    """
+    mime type (sniffed from the first FILE_MIME_SNIFF_SIZE bytes)
+    and size (from metadata) of a file.
+    One pass per uploaded file, shared by validators and hooks
+    """
+    fopen = _get_inspected_file(fobj)
+    data = getattr(fopen, '_unicms_inspection', None)
+    if data is not None:
+        return data
+
     fopen.seek(0)
-    content_type = mime.from_buffer(fopen.read())
-    fopen.seek(0, os.SEEK_END)
-    content_size = fopen.tell()
+    head = fopen.read(FILE_MIME_SNIFF_SIZE)
     fopen.seek(0)
-    data = dict(mime_type=content_type, file_size=content_size)
+    data = dict(mime_type=magic.Magic(mime=True).from_buffer(head),
+                file_size=fopen.size)
+    fopen._unicms_inspection = data
+    logger.debug(f'Media inspection {fopen}: {data}')
+    return data
+
+
+def get_file_type_size(media_obj) -> dict:
+    data = inspect_file(media_obj.file)
+    data = dict(mime_type=data['mime_type'], file_size=data['file_size'])
     logger.debug(f'Media item hook get_file_type_size: {data}')
     return data
 
 
 def get_image_width_height(fopen):
-    mime = magic.Magic(mime=True)
-    fopen.seek(0)
-    mimetype = mime.from_buffer(fopen.read())
-    fopen.seek(0)
-    if mimetype in FILETYPE_IMAGE:
-        pil = Image.open(fopen)
-        return pil.size
+    data = inspect_file(fopen)
+    if data['mime_type'] not in FILETYPE_IMAGE:
+        return
+    if 'dimensions' not in data:
+        fopen = _get_inspected_file(fopen)
+        fopen.seek(0)
+        # reads only the image header
+        data['dimensions'] = Image.open(fopen).size
+        fopen.seek(0)
+    return data['dimensions']
+
+
+def get_file_hash(fopen) -> str:
+    """
+    SHA-256 of a file, read in chunks.
+    Cached with the inspection results
+    """
+    data = inspect_file(fopen)
+    if 'sha256' not in data:
+        fopen = _get_inspected_file(fopen)
+        sha256 = hashlib.sha256()
+        for chunk in fopen.chunks():
+            sha256.update(chunk)
+        fopen.seek(0)
+        data['sha256'] = sha256.hexdigest()
+    return data['sha256']
 
 
 def to_webp(fobj):
@@ -52,7 +98,21 @@ def to_webp(fobj):
     return byte_io
 
 
+def is_file_shared(obj, field_name='file'):
+    """
+    True if other objects of the same model use the file of obj
+    """
+    name = getattr(obj, field_name).name
+    return obj.__class__.objects.filter(**{field_name: name})\
+                                .exclude(pk=obj.pk)\
+                                .exists()
+
+
 def _remove_file(media):
+    # used by other media too
+    if is_file_shared(media): return
+    from . renditions import remove_renditions
+    remove_renditions(media.file)
     try:
         os.remove(media.file.path)
     except Exception: # pragma: no cover
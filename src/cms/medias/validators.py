@@ -1,10 +1,8 @@
-import magic
-
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
 from . import settings as app_settings
-from . utils import get_image_width_height
+from . utils import get_image_width_height, inspect_file
 
 
 FILETYPE_IMAGE = getattr(settings, 'FILETYPE_IMAGE',
@@ -39,9 +37,7 @@ def validate_file_size(value):
 def _validate_generic_file_extension(value, allowed_filetypes):
     if not hasattr(value, 'file'): # pragma: no cover
         return
-    mimetype = magic.Magic(mime=True).from_buffer(value.file.read())
-    print(value.__dict__, mimetype)
-    value.file.seek(0)
+    mimetype = inspect_file(value)['mime_type']
     if mimetype not in allowed_filetypes:
         raise ValidationError(f'Unsupported file extension {mimetype}')
 
@@ -62,11 +58,9 @@ def validate_image_size_ratio(value):
     if not hasattr(value, 'content_type'): # pragma: no cover
         return
 
-    mimetype = magic.Magic(mime=True).from_buffer(value.file.read())
-    value.file.seek(0)
-
-    if mimetype in FILETYPE_IMAGE:
-        w, y = get_image_width_height(value.file)
+    size = get_image_width_height(value)
+    if size:
+        w, y = size
         ratio = y / w
         if ratio < FILETYPE_IMAGE_YX_RATIO_MIN or \
            ratio > FILETYPE_IMAGE_YX_RATIO_MAX:
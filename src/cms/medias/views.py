@@ -1,10 +1,10 @@
-from django.http import FileResponse
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 
-from . models import Media
+from . delivery import get_media_file_info, serve_media_file
 
 
 def get_media_file(request, *args, **kwargs):
-    uuid = kwargs['unique_code']
-    item = get_object_or_404(Media, uuid=uuid)
-    return FileResponse(item.file)
+    info = get_media_file_info(kwargs['unique_code'])
+    if not info:
+        raise Http404()
+    return serve_media_file(request, info)
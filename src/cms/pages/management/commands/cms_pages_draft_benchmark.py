@@ -0,0 +1,134 @@
+import statistics
+import time
+
+from django.db import connection, transaction
+from django.core.management.base import BaseCommand
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from cms.contexts.models import WebPath, WebSite
+from cms.pages.models import (Page,
+                              PageBlock,
+                              PageHeading,
+                              PageHeadingLocalization,
+                              PageLink,
+                              PageLocalization)
+from cms.pages.utils import copy_page_as_draft
+from cms.templates.models import PageTemplate, TemplateBlock
+
+
+def legacy_copy_page_as_draft(obj, user=None):
+    """
+    copy_page_as_draft before the bulk inserts,
+    kept as benchmark reference
+    """
+    draft = obj.__dict__.copy()
+    draft['state'] = 'draft'
+    draft['created_by'] = user
+    draft['modified_by'] = None
+    draft['draft_of'] = obj.pk
+    for attr in "id pk _state created_by modified_by created modified".split(' '):
+        if draft.get(attr):
+            draft.pop(attr)
+
+    # cleanup cached items
+    data = {k:v for k,v in draft.items() if not k.startswith('_')}
+
+    data['date_start'] = timezone.localtime()
+    new_obj = obj.__class__.objects.create(**data)
+    tags = [i for i in obj.tags.values_list('name', flat=1)]
+    new_obj.tags.add(*tags)
+
+    # now replicate all its childs and menus
+    for i in ('pageblock_set', 'pagecarousel_set', 'pagecontact_set',
+              'pagelink_set', 'pagemenu_set', 'pagepublication_set',
+              'pagemedia_set', 'pagelocalization_set',
+              'pageheading_set', 'pagemediacollection_set',
+              # this is a related_name property on model
+              'parent_page'):
+        childs = getattr(obj, i).all()
+        for child in childs:
+            child.pk = None
+            child.id = None
+            child.page = new_obj
+            child.save()
+    return new_obj
+
+
+class Command(BaseCommand):
+    help = 'uniCMS copy_page_as_draft Benchmark'
+
+    def add_arguments(self, parser):
+        parser.epilog = ('Example: ./manage.py cms_pages_draft_benchmark '
+                         '-blocks 100 [-repeat 5]')
+        parser.add_argument('-blocks', type=int, required=False, default=100,
+                            help="blocks of the synthetic page")
+        parser.add_argument('-repeat', type=int, required=False, default=5,
+                            help="drafts created by each implementation")
+
+    def create_page(self, blocks):
+        site = WebSite.objects.create(name='benchmark',
+                                      domain='benchmark.example.org',
+                                      is_active=True)
+        webpath = WebPath.objects.create(site=site, name='benchmark',
+                                         path='/', is_active=True)
+        template = PageTemplate.objects.create(name='benchmark',
+                                               template_file='italia.html',
+                                               is_active=True)
+        block = TemplateBlock.objects.create(name='benchmark',
+                                             type='cms.templates.blocks.HtmlBlock',
+                                             content='<p>benchmark</p>',
+                                             is_active=True)
+        page = Page.objects.create(name='benchmark', title='benchmark',
+                                   webpath=webpath, base_template=template,
+                                   date_start=timezone.localtime(),
+                                   state='published', is_active=True)
+        page.tags.add('benchmark', 'draft')
+        PageBlock.objects.bulk_create(
+            [PageBlock(page=page, block=block, section='1-center',
+                       order=i, is_active=True) for i in range(blocks)]
+        )
+        PageLink.objects.bulk_create(
+            [PageLink(page=page, name=f'link {i}', url='https://example.org')
+             for i in range(10)]
+        )
+        PageLocalization.objects.create(page=page, language='en',
+                                        title='benchmark en', is_active=True)
+        heading = PageHeading.objects.create(page=page, title='benchmark',
+                                             is_active=True)
+        PageHeadingLocalization.objects.create(heading=heading, language='en',
+                                               title='benchmark en',
+                                               is_active=True)
+        return page
+
+    def measure(self, func, page, repeat):
+        timings, queries = [], []
+        for i in range(repeat):
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as ctx:
+                func(page)
+            timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(ctx.captured_queries))
+        return queries, timings
+
+    def report(self, label, queries, timings):
+        print(f'{label}: {queries} queries, '
+              f'avg {statistics.mean(timings):.1f}ms, '
+              f'p50 {statistics.median(timings):.1f}ms')
+
+    def handle(self, *args, **options):
+        blocks, repeat = options['blocks'], options['repeat']
+        # synthetic data is rolled back and must never reach the search engine
+        hooks = {'Page': {'POSTSAVE': ['cms.contexts.hooks.used_by']}}
+        with transaction.atomic(), override_settings(CMS_HOOKS=hooks):
+            page = self.create_page(blocks)
+            print(f'page with {blocks} blocks')
+
+            queries, timings = self.measure(legacy_copy_page_as_draft,
+                                            page, repeat)
+            self.report('before', queries[0], timings)
+
+            queries, timings = self.measure(copy_page_as_draft,
+                                            page, repeat)
+            self.report('after', queries[0], timings)
+            transaction.set_rollback(True)
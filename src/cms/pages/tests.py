@@ -1,9 +1,18 @@
 import importlib
+import io
 import logging
 import datetime
+import tempfile
+
+from unittest.mock import patch
 
 from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_save
+from django.http import FileResponse
 from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -11,6 +20,7 @@ from cms.contacts.templatetags.unicms_contacts import load_contact
 from cms.contacts.tests import ContactUnitTest
 from cms.carousels.templatetags.unicms_carousels import load_carousel
 from cms.carousels.tests import CarouselUnitTest
+from cms.contexts.sitemaps import is_sitemap_dirty
 from cms.contexts.tests import ContextUnitTest
 from cms.medias.tests import MediaUnitTest
 from cms.menus.tests import MenuUnitTest
@@ -221,6 +231,40 @@ class PageUnitTest(TestCase):
 
         obj.delete()
 
+
+    def test_copy_page_as_draft(self):
+        obj = self.create_page()
+        block = obj.pageblock_set.first().block
+        PageBlock.objects.bulk_create([PageBlock(page=obj, block=block,
+                                                 order=i, is_active=True)
+                                       for i in range(99)])
+        obj.tags.add('draft', 'copy')
+
+        saved = []
+        def count_saves(sender, **kwargs):
+            saved.append(sender)
+        post_save.connect(count_saves)
+        try:
+            with CaptureQueriesContext(connection) as ctx:
+                draft = copy_page_as_draft(obj)
+        finally:
+            post_save.disconnect(count_saves)
+
+        # childs are inserted in bulk, signals sent once
+        assert saved == [Page]
+        # the same for 1 or 100 blocks
+        assert len(ctx.captured_queries) < 80
+        assert draft.state == 'draft'
+        assert draft.draft_of == obj.pk
+        assert draft.pageblock_set.count() == 100
+        for model in (PageCarousel, PageContact, PageHeading, PageLink,
+                      PageLocalization, PageMediaCollection, PageMenu):
+            assert model.objects.filter(page=draft).count() == \
+                   model.objects.filter(page=obj).count()
+        assert PageHeadingLocalization.objects.filter(heading__page=draft).count() == 1
+        assert PageRelated.objects.get(page=draft).related_page == obj
+        assert sorted(draft.tags.names()) == ['copy', 'draft']
+
     @classmethod
     def test_page_expired(cls):
         obj = cls.create_page(date_end=timezone.localtime())
@@ -686,6 +730,45 @@ class PageUnitTest(TestCase):
         res = self.client.get(url)
         assert res.status_code == 200
 
+    def test_unicms_sitemap_chunks(self):
+        put = getattr(importlib.import_module('cms.publications.tests'), 'PublicationUnitTest')
+        pub = put.create_pub(count=1)
+        context = pub.get_publication_context()
+        url = reverse('unicms_sitemap')
+
+        res = self.client.get(url)
+        index = b''.join(res.streaming_content).decode()
+        assert '<sitemapindex' in index
+        assert f'{url}?p=1' in index
+
+        res = self.client.get(f'{url}?p=1')
+        urlset = b''.join(res.streaming_content).decode()
+        assert context.webpath.get_full_path() in urlset
+        assert context.url in urlset
+
+        assert self.client.get(f'{url}?p=2').status_code == 404
+        assert self.client.get(f'{url}?p=a').status_code == 404
+
+        # 50k urls per sitemap
+        with patch('cms.contexts.sitemaps.SITEMAP_CHUNK_SIZE', 1):
+            res = self.client.get(f'{url}?p=2')
+            urlset = b''.join(res.streaming_content).decode()
+            assert urlset.count('<url>') == 1
+            assert context.url in urlset
+
+        # pre-generated sitemaps
+        with tempfile.TemporaryDirectory() as root:
+            with patch('cms.contexts.sitemaps.SITEMAP_ROOT', root):
+                call_command('cms_sitemap_build', stdout=io.StringIO())
+                website = context.webpath.site
+                assert not is_sitemap_dirty(website)
+                res = self.client.get(f'{url}?p=1')
+                assert isinstance(res, FileResponse)
+                assert context.url in b''.join(res.streaming_content).decode()
+
+                context.save()
+                assert is_sitemap_dirty(website)
+
     def test_unicms_robots(self):
         obj = self.create_page(webpath_path='/')
         url = reverse('unicms_robots')
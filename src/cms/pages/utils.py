@@ -1,35 +1,44 @@
+from django.db import router, transaction
+from django.db.models.signals import post_save
 from django.utils import timezone
 
+from cms.contexts.cloning import clone_pages_childs, copy_instance
 
-def copy_page_as_draft(obj, user=None):
-    draft = obj.__dict__.copy()
-    draft['state'] = 'draft'
-    draft['created_by'] = user
-    draft['modified_by'] = None
-    draft['draft_of'] = obj.pk
-    for attr in "id pk _state created_by modified_by created modified".split(' '):
-        if draft.get(attr):
-            draft.pop(attr)
 
-    # cleanup cached items
-    data = {k:v for k,v in draft.items() if not k.startswith('_')}
+def copy_page_as_draft(obj, user=None):
+    """
+    draft copy of a page, with its tags and childs,
+    inserted in bulk in one transaction.
+    Signals (and so CMS_HOOKS) are sent once, for the draft page
+    """
+    model = obj.__class__
+    new_obj = copy_instance(obj,
+                            created_by_id=user.pk if user else None,
+                            modified_by_id=None,
+                            state='draft',
+                            draft_of=obj.pk,
+                            date_start=timezone.localtime())
+    with transaction.atomic():
+        model.objects.bulk_create([new_obj])
+        if new_obj.pk is None:
+            # primary keys aren't returned by all the databases
+            new_obj.pk = model.objects.filter(draft_of=obj.pk).latest('pk').pk
+            new_obj._state.adding = False
+        cloned = clone_pages_childs({obj.pk: new_obj}, remap_related=False)
+        post_save.send(sender=model, instance=new_obj, created=True,
+                       update_fields=None, raw=False,
+                       using=router.db_for_write(model, instance=new_obj))
+        labels = [child_model._meta.label_lower
+                  for child_model, model_cloned in cloned.items()
+                  if model_cloned]
+        transaction.on_commit(lambda: draft_childs_copied(labels))
+    return new_obj
 
-    data['date_start'] = timezone.localtime()
-    new_obj = obj.__class__.objects.create(**data)
-    tags = [i for i in obj.tags.values_list('name', flat=1)]
-    new_obj.tags.add(*tags)
 
-    # now replicate all its childs and menus
-    for i in ('pageblock_set', 'pagecarousel_set', 'pagecontact_set',
-              'pagelink_set', 'pagemenu_set', 'pagepublication_set',
-              'pagemedia_set', 'pagelocalization_set',
-              'pageheading_set', 'pagemediacollection_set',
-              # this is a related_name property on model
-              'parent_page'):
-        childs = getattr(obj, i).all()
-        for child in childs:
-            child.pk = None
-            child.id = None
-            child.page = new_obj
-            child.save()
-    return new_obj
+def draft_childs_copied(labels):
+    """
+    invalidations of the bulk inserted childs, once for each model
+    """
+    from cms.api.cache import bump_model_generation
+    for label in labels:
+        bump_model_generation(label)
@@ -6,3 +6,7 @@ class PublicationsConfig(AppConfig):
     name = 'cms.publications'
     label = 'cmspublications'
     verbose_name = _('publications')
+
+    def ready(self):
+        # that actually loads the signals
+        import cms.publications.signals # noqa
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import settings as app_settings
+
+logger = logging.getLogger(__name__)
+
+
+# load_publications_preview results cache
+CMS_PUBLICATIONS_PREVIEW_CACHE_ENABLED = getattr(settings,
+                                                 'CMS_PUBLICATIONS_PREVIEW_CACHE_ENABLED',
+                                                 app_settings.CMS_PUBLICATIONS_PREVIEW_CACHE_ENABLED)
+CMS_PUBLICATIONS_PREVIEW_CACHE_KEY_PREFIX = getattr(settings,
+                                                    'CMS_PUBLICATIONS_PREVIEW_CACHE_KEY_PREFIX',
+                                                    app_settings.CMS_PUBLICATIONS_PREVIEW_CACHE_KEY_PREFIX)
+CMS_PUBLICATIONS_PREVIEW_CACHE_TTL = getattr(settings,
+                                             'CMS_PUBLICATIONS_PREVIEW_CACHE_TTL',
+                                             app_settings.CMS_PUBLICATIONS_PREVIEW_CACHE_TTL)
+
+GENERATION_KEY = f'{CMS_PUBLICATIONS_PREVIEW_CACHE_KEY_PREFIX}generation'
+
+
+def get_preview_generation():
+    """
+    returns the current publications preview generation.
+    A missing counter is initialized with a timestamp, this way
+    an evicted counter never matches entries of past generations
+    """
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, int(time.time()), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_preview_generation():
+    """
+    invalidates all the cached publications previews.
+    Called by publications signals
+    """
+    get_preview_generation()
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError: # pragma: no cover
+        # evicted between the two calls
+        cache.add(GENERATION_KEY, int(time.time()), None)
+        return cache.get(GENERATION_KEY)
+
+
+def make_preview_cache_key(webpath_id, filters, language=''):
+    value_key = json.dumps({'webpath': webpath_id,
+                            'filters': filters,
+                            'lang': language,
+                            'generation': get_preview_generation()},
+                           sort_keys=True,
+                           default=str)
+    hashed_v = hashlib.sha256(value_key.encode()).hexdigest()
+    return f'{CMS_PUBLICATIONS_PREVIEW_CACHE_KEY_PREFIX}{hashed_v}'
+
+
+def get_preview_from_cache(key):
+    if not CMS_PUBLICATIONS_PREVIEW_CACHE_ENABLED: return
+    res = cache.get(key)
+    if res is not None:
+        logger.debug(f'uniCMS publications preview cache - {key} succesfully taken from cache')
+    return res
+
+
+def set_preview_to_cache(key, value, timeout=None):
+    if not CMS_PUBLICATIONS_PREVIEW_CACHE_ENABLED: return
+    cache.set(key, value, timeout or CMS_PUBLICATIONS_PREVIEW_CACHE_TTL)
+    logger.debug(f'uniCMS publications preview cache - {key} succesfully stored to cache')
+    return True
@@ -0,0 +1,152 @@
+import statistics
+import time
+
+from django.db import connection, transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from cms.contexts.models import WebPath, WebSite
+from cms.medias.models import Media
+from cms.publications.models import (Category,
+                                     Publication,
+                                     PublicationContext,
+                                     PublicationLocalization)
+from cms.publications.cache import bump_preview_generation
+from cms.publications.utils import get_publications_preview
+
+
+def legacy_publications_preview(webpath, language='', number=0):
+    """
+    load_publications_preview before the query builder,
+    kept as benchmark reference
+    """
+    now = timezone.localtime()
+    pub_in_context = PublicationContext.objects.\
+        filter(webpath=webpath,
+               is_active=True,
+               publication__is_active=True,
+               date_start__lte=now,
+               date_end__gt=now).\
+        distinct().\
+        order_by('order','-date_start')
+    if number > 0:
+        pub_in_context = pub_in_context[0:number]
+    for i in pub_in_context:
+        i.publication.translate_as(lang=language)
+    return pub_in_context
+
+
+def render_cards(pub_in_context):
+    """
+    what a publication preview card usually shows
+    """
+    for i in pub_in_context:
+        (i.url,
+         i.publication.title,
+         i.publication.subheading,
+         i.publication.image_url(),
+         [c.name for c in i.publication.categories],
+         [t.name for t in i.publication.tags.all()])
+
+
+class Command(BaseCommand):
+    help = 'uniCMS load_publications_preview Benchmark'
+
+    def add_arguments(self, parser):
+        parser.epilog = ('Example: ./manage.py cms_publications_preview_benchmark '
+                         '-n 12 [-webpath 3]')
+        parser.add_argument('-webpath', type=int, required=False,
+                            help="existing webpath id, synthetic data if omitted")
+        parser.add_argument('-n', type=int, required=False, default=12,
+                            help="publications in the preview")
+        parser.add_argument('-lang', type=str, required=False, default='en',
+                            help="rendering language")
+        parser.add_argument('-repeat', type=int, required=False, default=20,
+                            help="executions of each render")
+
+    def create_webpath(self, n):
+        now = timezone.localtime()
+        site = WebSite.objects.create(name='benchmark',
+                                      domain='benchmark.example.org',
+                                      is_active=True)
+        webpath = WebPath.objects.create(site=site, name='benchmark',
+                                         path='/', is_active=True)
+        # bulk_create doesn't return primary keys on every backend
+        Media.objects.bulk_create(
+            [Media(title=f'benchmark media {i}', file=f'images/benchmark-{i}.jpg',
+                   description='') for i in range(n)]
+        )
+        media = list(Media.objects.filter(title__startswith='benchmark media')
+                                  .order_by('pk'))
+        Category.objects.bulk_create(
+            [Category(name=f'benchmark category {i}', description='') for i in range(3)]
+        )
+        categories = list(Category.objects.filter(name__startswith='benchmark category')
+                                          .order_by('pk'))
+        for i in range(n):
+            pub = Publication.objects.create(name=f'publication {i}',
+                                             title=f'publication {i}',
+                                             subheading='subheading',
+                                             content='<p>content</p>',
+                                             content_type='html',
+                                             preview_image=media[i],
+                                             is_active=True)
+            pub.category.add(categories[i % len(categories)])
+            pub.tags.add('benchmark', f'tag{i % 5}')
+            PublicationLocalization.objects.create(publication=pub,
+                                                   language='en',
+                                                   title=f'publication {i} en',
+                                                   subheading='',
+                                                   content='',
+                                                   is_active=True)
+            PublicationContext.objects.create(publication=pub,
+                                              webpath=webpath,
+                                              date_start=now,
+                                              date_end=now + timezone.timedelta(days=1),
+                                              is_active=True)
+        return webpath
+
+    def measure(self, func, repeat):
+        timings, queries = [], []
+        for i in range(repeat):
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as ctx:
+                render_cards(func())
+            timings.append((time.perf_counter() - start) * 1000)
+            queries.append(len(ctx.captured_queries))
+        return queries, timings
+
+    def report(self, label, queries, timings):
+        print(f'{label}: {queries} queries, '
+              f'avg {statistics.mean(timings):.1f}ms, '
+              f'p50 {statistics.median(timings):.1f}ms')
+
+    def handle(self, *args, **options):
+        n, lang, repeat = options['n'], options['lang'], options['repeat']
+        # synthetic data is rolled back
+        with transaction.atomic():
+            if options['webpath']:
+                webpath = WebPath.objects.filter(pk=options['webpath']).first()
+                if not webpath:
+                    raise CommandError(f'webpath {options["webpath"]} not found')
+            else:
+                # synthetic publications must never reach the search engine
+                with override_settings(CMS_HOOKS={}):
+                    webpath = self.create_webpath(n)
+
+            queries, timings = self.measure(
+                lambda: legacy_publications_preview(webpath, lang, n),
+                repeat
+            )
+            self.report('before', queries[0], timings)
+
+            # the first render is a cache miss
+            bump_preview_generation()
+            queries, timings = self.measure(
+                lambda: get_publications_preview(webpath, lang, n),
+                repeat
+            )
+            self.report('after (cache miss)', queries[0], timings[:1])
+            self.report('after (cache hit)', queries[-1], timings[1:] or timings)
+            transaction.set_rollback(True)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from cms.publications.cache import bump_preview_generation
+from cms.publications.models import Publication, PublicationContext
+
+
+class Command(BaseCommand):
+    help = 'uniCMS rebuild precomputed publication urls and images'
+
+    def add_arguments(self, parser):
+        parser.epilog = 'Example: ./manage.py cms_publications_refresh_urls'
+        parser.add_argument('-batch', type=int, required=False, default=500,
+                            help="objects updated in each query")
+
+    def handle(self, *args, **options):
+        batch = options['batch']
+
+        publications = Publication.objects.select_related('preview_image',
+                                                          'presentation_image')\
+                                          .prefetch_related('category')\
+                                          .order_by('pk')
+        for i in range(0, publications.count(), batch):
+            Publication.refresh_image_urls(publications[i:i+batch])
+        print(f'{publications.count()} publications image urls updated')
+
+        contexts = PublicationContext.objects.select_related('publication',
+                                                             'webpath__alias')\
+                                             .order_by('pk')
+        for i in range(0, contexts.count(), batch):
+            PublicationContext.refresh_urls(contexts[i:i+batch])
+        print(f'{contexts.count()} publication contexts urls updated')
+        bump_preview_generation()
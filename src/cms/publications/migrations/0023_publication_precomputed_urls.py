@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-19 03:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cmspublications', '0022_auto_20220128_1536'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publication',
+            name='image_url_cache',
+            field=models.CharField(blank=True, editable=False, max_length=1024, null=True),
+        ),
+        migrations.AddField(
+            model_name='publicationcontext',
+            name='url_cache',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=768),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-19 03:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cmspublications', '0023_publication_precomputed_urls'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='publicationcontext',
+            index=models.Index(fields=['webpath', 'is_active', 'date_start', 'date_end'], name='cmspublicat_webpath_ed71ca_idx'),
+        ),
+    ]
@@ -12,6 +12,7 @@ from django.utils.safestring import mark_safe
 
 from cms.medias import settings as cms_media_settings
 from cms.medias.models import Media, MediaCollection, AbstractMedia
+from cms.medias.renditions import get_rendition_url
 from cms.medias.validators import *
 
 from cms.pages.models import AbstractPublicable
@@ -51,7 +52,8 @@ class Category(TimeStampedModel, CreatedModifiedBy):
     def image_as_html(self):
         res = ""
         try:
-            res = f'<img width={CMS_IMAGE_CATEGORY_SIZE} src="{self.image.url}"/>'
+            url = get_rendition_url(self.image, CMS_IMAGE_CATEGORY_SIZE)
+            res = f'<img width={CMS_IMAGE_CATEGORY_SIZE} src="{url}"/>'
         except ValueError:  # pragma: no cover
             # *** ValueError: The 'image' attribute has no file associated with it.
             res = f"{settings.STATIC_URL}images/no-image.jpg"
@@ -99,6 +101,9 @@ class Publication(AbstractPublication, CreatedModifiedBy, AbstractLockable):
     slug = models.SlugField(default='', blank=True, max_length=256)
     tags = TaggableManager()
     relevance = models.IntegerField(default=0, blank=True)
+    # precomputed image_url(), null if not computed yet
+    image_url_cache = models.CharField(max_length=1024, null=True,
+                                       blank=True, editable=False)
 
     class Meta:
         verbose_name_plural = _("Publications")
@@ -119,16 +124,32 @@ class Publication(AbstractPublication, CreatedModifiedBy, AbstractLockable):
         return PublicationLocalization.objects.filter(publication=self,
                                                       is_active=True)
 
-    def image_url(self):
+    def compute_image_url(self):
         if self.preview_image:
             return self.preview_image.get_media_path()
         elif self.presentation_image:
             return self.presentation_image.get_media_path()
-        else: # pragma: no cover
+        elif self.pk:
             categories = self.category.all()
             for category in categories:
                 if category.image:
                     return sanitize_path(f'{settings.MEDIA_URL}/{category.image}')
+        return ''
+
+    def image_url(self):
+        if self.image_url_cache is None:
+            return self.compute_image_url() or None
+        return self.image_url_cache or None
+
+    @classmethod
+    def refresh_image_urls(cls, publications):
+        """
+        updates the precomputed image urls of publications
+        """
+        publications = list(publications)
+        for publication in publications:
+            publication.image_url_cache = publication.compute_image_url()
+        cls.objects.bulk_update(publications, ['image_url_cache'])
 
     def image_title(self): # pragma: no cover
         if self.preview_image: return self.preview_image.title
@@ -177,9 +198,9 @@ class Publication(AbstractPublication, CreatedModifiedBy, AbstractLockable):
                                                      is_active=True,
                                                      webpath__is_active=True,
                                                      date_start__lte=now,
-                                                     date_end__gte=now)
-        if pubcontx.exists():
-            return pubcontx.first().url
+                                                     date_end__gte=now).first()
+        if pubcontx:
+            return pubcontx.url
 
     @property
     def related_links(self):
@@ -215,6 +236,25 @@ class Publication(AbstractPublication, CreatedModifiedBy, AbstractLockable):
             self.subheading = trans.subheading
             self.content = trans.content
 
+    @classmethod
+    def translate_many_as(cls, publications, lang):
+        """
+        translate_as() of many publications with a single query
+        """
+        publications = [i for i in publications if i]
+        if not publications: return
+        translations = {i.publication_id: i
+                        for i in PublicationLocalization.objects.filter(
+                            publication__in=publications,
+                            language=lang,
+                            is_active=True).order_by('-pk')}
+        for publication in publications:
+            trans = translations.get(publication.pk)
+            if trans:
+                publication.title = trans.title
+                publication.subheading = trans.subheading
+                publication.content = trans.content
+
     @property
     def available_in_languages(self) -> list:
         return [(i, i.get_language_display())
@@ -247,7 +287,12 @@ class Publication(AbstractPublication, CreatedModifiedBy, AbstractLockable):
         if not self.slug:
             self.slug = self.title2slug()
         self.content_save_switch()
+        self.image_url_cache = self.compute_image_url()
         super(self.__class__, self).save(*args, **kwargs)
+        # slug is part of the contexts urls
+        PublicationContext.refresh_urls(
+            self.publicationcontext_set.select_related('webpath__alias')
+        )
 
     @property
     def get_attachments(self):
@@ -377,10 +422,17 @@ class PublicationContext(TimeStampedModel, ActivableModel,
     date_end = models.DateTimeField()
     in_evidence_start = models.DateTimeField(null=True,blank=True)
     in_evidence_end = models.DateTimeField(null=True,blank=True)
+    # precomputed url, empty if not computed yet or too long
+    url_cache = models.CharField(max_length=768, default='',
+                                 blank=True, editable=False,
+                                 db_index=True)
 
     class Meta:
         verbose_name_plural = _("Publication Contexts")
         ordering = ['webpath__fullpath', 'order', '-date_start']
+        indexes = [
+           models.Index(fields=['webpath', 'is_active', 'date_start', 'date_end']),
+        ]
 
     @property
     def path_prefix(self):
@@ -401,11 +453,34 @@ class PublicationContext(TimeStampedModel, ActivableModel,
         # related__is_active=True)
         # return [i for i in related if i.related.is_publicable]
 
-    @property
-    def url(self):
+    def compute_url(self):
         url = f'{self.webpath.get_full_path()}{self.path_prefix}/{self.publication.pk}-{self.publication.slug}/'
         return sanitize_path(url)
 
+    @property
+    def url(self):
+        return self.url_cache or self.compute_url()
+
+    def set_url_cache(self):
+        url = self.compute_url()
+        max_length = self._meta.get_field('url_cache').max_length
+        # too long urls are computed on each access
+        self.url_cache = url if len(url) <= max_length else ''
+
+    @classmethod
+    def refresh_urls(cls, contexts):
+        """
+        updates the precomputed urls of publication contexts
+        """
+        contexts = list(contexts)
+        for context in contexts:
+            context.set_url_cache()
+        cls.objects.bulk_update(contexts, ['url_cache'])
+
+    def save(self, *args, **kwargs):
+        self.set_url_cache()
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         return self.url
 
@@ -0,0 +1,75 @@
+import logging
+import math
+
+from django.core.cache import cache
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from . cache import (CMS_PUBLICATIONS_PREVIEW_CACHE_TTL,
+                     make_preview_cache_key)
+from . models import PublicationContext
+
+
+logger = logging.getLogger(__name__)
+
+
+class PublicationScheduler(object):
+    """
+    knows when the next publication context starts or ends.
+
+    Listings filtered on date_start/date_end and
+    in_evidence_start/in_evidence_end don't change
+    between two transitions, so their caches can be valid
+    exactly until the next one.
+    """
+
+    def get_next_transition(self, webpath=None):
+        """
+        returns the datetime of the next start or end
+        (or in evidence start or end)
+        of an active publication context (of a webpath), if any
+        """
+        webpath_id = getattr(webpath, 'pk', webpath)
+        # the key changes with the publications preview generation
+        key = make_preview_cache_key(webpath_id, {'next_transition': True})
+        transition = cache.get(key)
+        if transition is not None:
+            return transition or None
+
+        now = timezone.localtime()
+        contexts = PublicationContext.objects.filter(is_active=True,
+                                                     publication__is_active=True)
+        if webpath_id:
+            contexts = contexts.filter(webpath__pk=webpath_id)
+        transitions = contexts.aggregate(
+            next_start=Min('date_start', filter=Q(date_start__gt=now)),
+            next_end=Min('date_end', filter=Q(date_end__gt=now)),
+            # in_evidence listings
+            next_evidence_start=Min('in_evidence_start',
+                                    filter=Q(in_evidence_start__gt=now)),
+            next_evidence_end=Min('in_evidence_end',
+                                  filter=Q(in_evidence_end__gt=now))
+        )
+        transitions = [i for i in transitions.values() if i]
+        transition = min(transitions) if transitions else None
+        cache.set(key, transition or '', self.get_timeout(transition))
+        logger.debug(f'uniCMS publications scheduler - webpath {webpath_id} '
+                     f'next transition: {transition}')
+        return transition
+
+    def get_timeout(self, transition, max_timeout=CMS_PUBLICATIONS_PREVIEW_CACHE_TTL):
+        """
+        seconds until transition, at most max_timeout
+        """
+        if not transition: return max_timeout
+        seconds = (transition - timezone.now()).total_seconds()
+        return max(1, min(max_timeout, math.ceil(seconds)))
+
+    def get_cache_timeout(self, webpath=None):
+        """
+        lifetime of the cached listings of a webpath
+        """
+        return self.get_timeout(self.get_next_transition(webpath))
+
+
+publication_scheduler = PublicationScheduler()
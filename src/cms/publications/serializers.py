@@ -94,14 +94,16 @@ class PublicationContextSerializer(UniCMSCreateUpdateSerializer,
             data['in_evidence_end'] = None
         return super().to_internal_value(data)
 
+    def get_webpath_data(self, webpath):
+        return WebPathSerializer(webpath).data
+
     def to_representation(self, instance):
         data = super().to_representation(instance)
         if instance.publication:
             publication = PublicationSerializer(instance.publication)
             data['publication'] = publication.data
         if instance.webpath:
-            webpath = WebPathSerializer(instance.webpath)
-            data['webpath'] = webpath.data
+            data['webpath'] = self.get_webpath_data(instance.webpath)
         data['path'] = instance.url
         return data
 
@@ -111,6 +113,37 @@ class PublicationContextSerializer(UniCMSCreateUpdateSerializer,
         read_only_fields = ('created_by', 'modified_by')
 
 
+class PublicationContextPublicListSerializer(serializers.ListSerializer):
+
+    def to_representation(self, data):
+        contexts = list(data)
+        request = self.context.get('request', None)
+        language = getattr(request, 'LANGUAGE_CODE', None)
+        if language:
+            # translations of the whole page in one query
+            Publication.translate_many_as([i.publication for i in contexts],
+                                          language)
+        return super().to_representation(contexts)
+
+
+class PublicationContextPublicSerializer(PublicationContextSerializer):
+    """
+    read only PublicationContextSerializer for public lists.
+    Querysets should be prepared with
+    utils.publication_context_related_objects(),
+    shared webpaths are serialized once
+    """
+
+    def get_webpath_data(self, webpath):
+        webpaths = self.context.setdefault('webpaths_data', {})
+        if webpath.pk not in webpaths:
+            webpaths[webpath.pk] = super().get_webpath_data(webpath)
+        return webpaths[webpath.pk]
+
+    class Meta(PublicationContextSerializer.Meta):
+        list_serializer_class = PublicationContextPublicListSerializer
+
+
 class PublicationContextSelectOptionsSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
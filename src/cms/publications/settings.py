@@ -1,5 +1,7 @@
 import logging
 
+from cms.contexts.settings import CMS_CACHE_KEY_PREFIX
+
 
 logger = logging.getLogger(__name__)
 
@@ -26,3 +28,11 @@ CMS_APP_REGEXP_URLPATHS = {
 
 
 CMS_PAGE_SIZE = 3
+
+# publications listings cache (load_publications_preview, api),
+# invalidated when publications and their contexts change
+# and expired when the next publication context starts or ends
+CMS_PUBLICATIONS_PREVIEW_CACHE_ENABLED = True
+CMS_PUBLICATIONS_PREVIEW_CACHE_KEY_PREFIX = f'{CMS_CACHE_KEY_PREFIX}pubpreview_'
+# in seconds, maximum lifetime of listings without upcoming transitions
+CMS_PUBLICATIONS_PREVIEW_CACHE_TTL = 3600
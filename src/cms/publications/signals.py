@@ -0,0 +1,114 @@
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+
+from cms.contexts.models import WebPath
+from cms.contexts import sitemaps
+from cms.medias.models import Media
+
+from . cache import bump_preview_generation
+from . models import (Category,
+                      Publication,
+                      PublicationContext,
+                      PublicationLocalization)
+
+
+def preview_changed():
+    bump_preview_generation()
+    # a preview cached before the commit would hold the previous rows
+    if connection.in_atomic_block:
+        transaction.on_commit(bump_preview_generation)
+
+
+def webpath_urls_changed(instance, *args, **kwargs):
+    # childs are saved (and signaled) by WebPath.save
+    contexts = PublicationContext.objects.filter(Q(webpath=instance) |
+                                                 Q(webpath__alias=instance))\
+                                         .select_related('publication',
+                                                         'webpath__alias')
+    PublicationContext.refresh_urls(contexts)
+    preview_changed()
+
+
+def media_image_urls_changed(instance, *args, **kwargs):
+    publications = Publication.objects.filter(Q(preview_image=instance) |
+                                              Q(presentation_image=instance))\
+                                      .select_related('preview_image',
+                                                      'presentation_image')
+    Publication.refresh_image_urls(publications)
+
+
+def get_category_publications(category):
+    # only publications without images fall back to categories
+    return list(
+        category.publication_set.filter(preview_image__isnull=True,
+                                        presentation_image__isnull=True)
+                                .values_list('pk', flat=True)
+    )
+
+
+def category_pre_delete(instance, *args, **kwargs):
+    instance._publications_ids = get_category_publications(instance)
+
+
+def category_image_urls_changed(instance, *args, **kwargs):
+    publications_ids = getattr(instance, '_publications_ids', None)
+    if publications_ids is None:
+        publications_ids = get_category_publications(instance)
+    Publication.refresh_image_urls(Publication.objects.filter(pk__in=publications_ids))
+
+
+def publication_categories_changed(instance, action, reverse, pk_set, *args, **kwargs):
+    if reverse and action == 'pre_clear':
+        # post_clear has no pk_set
+        instance._cleared_publications_ids = get_category_publications(instance)
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'): return
+    if not reverse:
+        Publication.refresh_image_urls([instance])
+        return
+    if action == 'post_clear':
+        pk_set = instance.__dict__.pop('_cleared_publications_ids', None)
+    if pk_set:
+        Publication.refresh_image_urls(Publication.objects.filter(pk__in=pk_set))
+
+
+def publications_preview_changed(*args, **kwargs):
+    preview_changed()
+
+
+def context_sitemap_changed(instance, *args, **kwargs):
+    if not sitemaps.SITEMAP_ROOT: return
+    sitemaps.mark_sitemaps_dirty([instance.webpath.site_id])
+
+
+def publication_sitemap_changed(instance, *args, **kwargs):
+    if not sitemaps.SITEMAP_ROOT: return
+    sites = PublicationContext.objects.filter(publication=instance)\
+                                      .values_list('webpath__site', flat=True)
+    sitemaps.mark_sitemaps_dirty(set(sites))
+
+
+# precomputed urls, before cache invalidations
+post_save.connect(webpath_urls_changed, sender=WebPath)
+post_save.connect(media_image_urls_changed, sender=Media)
+post_save.connect(category_image_urls_changed, sender=Category)
+pre_delete.connect(category_pre_delete, sender=Category)
+post_delete.connect(category_image_urls_changed, sender=Category)
+m2m_changed.connect(publication_categories_changed,
+                    sender=Publication.category.through)
+
+# everything shown by load_publications_preview
+for sender in (Category, Media, Publication, PublicationContext,
+               PublicationLocalization, Publication.tags.through):
+    post_save.connect(publications_preview_changed, sender=sender)
+    post_delete.connect(publications_preview_changed, sender=sender)
+m2m_changed.connect(publications_preview_changed,
+                    sender=Publication.category.through)
+
+# pre-generated sitemaps
+post_save.connect(context_sitemap_changed, sender=PublicationContext)
+post_delete.connect(context_sitemap_changed, sender=PublicationContext)
+post_save.connect(publication_sitemap_changed, sender=Publication)
+pre_delete.connect(publication_sitemap_changed, sender=Publication)
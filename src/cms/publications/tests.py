@@ -3,10 +3,15 @@ import logging
 
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
 from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
+from cms.contexts.models import ScheduledTransition
+from cms.contexts.scheduler import get_next_transition
+from cms.contexts.sites import get_websites
 from cms.contexts.tests import ContextUnitTest
 from cms.contexts.utils import fill_created_modified_by
 from cms.medias.tests import MediaUnitTest
@@ -23,12 +28,14 @@ from cms.publications.templatetags.unicms_publications import (load_publication,
 from . models import (Publication, PublicationAttachment, PublicationBlock,
                       PublicationContext, PublicationMediaCollection, PublicationLink,
                       PublicationLocalization, PublicationRelated)
+from . cache import get_preview_generation
+from . scheduler import publication_scheduler
+from . utils import get_publications_preview
 
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-
 class PublicationUnitTest(TestCase):
 
     def setUp(self):
@@ -227,6 +234,29 @@ class PublicationUnitTest(TestCase):
         # assert res['next_url'] == None
 
 
+    def test_api_pubcont_queries(self):
+
+        def count_queries(pub):
+            webpath = pub.get_publication_context().webpath
+            url = reverse('unicms_api:api-news-by-contexts',
+                          kwargs={'webpath_id': webpath.pk})
+            # websites are loaded once per process
+            get_websites()
+            with CaptureQueriesContext(connection) as ctx:
+                res = Client().get(url, HTTP_ACCEPT_LANGUAGE='en')
+            return res.json(), len(ctx.captured_queries)
+
+        few, few_queries = count_queries(self.create_pub(count=2))
+        many, many_queries = count_queries(self.create_pub(count=8))
+        assert len(few['results']) == 2
+        assert len(many['results']) == 8
+        # the number of queries doesn't depend on the number of rows
+        assert few_queries == many_queries
+        # translated in the request language
+        assert many['results'][0]['publication']['title'] == 'pub eng'
+        assert many['results'][0]['publication']['category_data']
+        assert many['results'][0]['publication']['tags'] == ['ciao']
+
     def test_api_pub_detail(self):
         pub = self.enrich_pub()
         req = Client()
@@ -362,6 +392,162 @@ class PublicationUnitTest(TestCase):
         assert not lm
 
 
+    def test_publications_preview_queries(self):
+
+        def render(webpath, tags=None):
+            with CaptureQueriesContext(connection) as ctx:
+                pubs = get_publications_preview(webpath, language='en', tags=tags)
+                for i in pubs:
+                    i.url
+                    i.publication.image_url()
+                    list(i.publication.categories)
+                    list(i.publication.tags.all())
+            return pubs, len(ctx.captured_queries)
+
+        few = self.create_pub(count=2).get_publication_context().webpath
+        many = self.create_pub(count=8).get_publication_context().webpath
+        few_pubs, few_queries = render(few)
+        many_pubs, many_queries = render(many)
+        assert len(few_pubs) == 2
+        assert len(many_pubs) == 8
+        # the number of queries doesn't depend on the number of rows
+        assert few_queries == many_queries
+        assert many_pubs[0].publication.title == 'pub eng'
+
+        # tags are filtered without duplicating rows
+        many_pubs[0].publication.tags.add('mamma')
+        pubs, queries = render(many, tags=['ciao', 'mamma'])
+        assert len(pubs) == 8
+
+        # cached
+        pubs, queries = render(many)
+        pubs, queries = render(many)
+        assert not queries
+        assert len(pubs) == 8
+
+        # invalidated by changes
+        many_pubs[0].publication.is_active = False
+        many_pubs[0].publication.save()
+        pubs, queries = render(many)
+        assert queries
+        assert len(pubs) == 7
+
+        # invalidated again after the commit: a preview cached
+        # by a concurrent request would hold the previous rows
+        with self.captureOnCommitCallbacks() as callbacks:
+            many_pubs[1].publication.save()
+        generation = get_preview_generation()
+        for callback in callbacks:
+            callback()
+        assert get_preview_generation() > generation
+
+    def test_precomputed_urls(self):
+        pub = self.create_pub(count=1)
+        context = PublicationContext.objects.select_related('publication')\
+                                            .get(publication=pub)
+        with CaptureQueriesContext(connection) as ctx:
+            url = context.url
+            image_url = context.publication.image_url()
+        assert not ctx.captured_queries
+        assert url == context.compute_url()
+        assert image_url == pub.presentation_image.get_media_path()
+
+        # webpath
+        webpath = context.webpath
+        webpath.path = 'changed-path'
+        webpath.save()
+        context.refresh_from_db()
+        assert 'changed-path' in context.url_cache
+        assert context.url_cache == context.compute_url()
+
+        # slug
+        pub.slug = 'changed-slug'
+        pub.save()
+        context.refresh_from_db()
+        assert context.url_cache.endswith(f'{pub.pk}-changed-slug/')
+
+        # media
+        media = pub.presentation_image
+        media.file = 'images/changed.jpg'
+        media.save()
+        pub.refresh_from_db()
+        assert pub.image_url_cache.endswith('images/changed.jpg')
+
+        # category fallback
+        pub.presentation_image = None
+        pub.save()
+        pub.refresh_from_db()
+        category = pub.category.first()
+        category.image = 'images/categories/changed.jpg'
+        category.save()
+        pub.refresh_from_db()
+        assert pub.image_url_cache.endswith('images/categories/changed.jpg')
+        pub.category.remove(category)
+        pub.refresh_from_db()
+        assert pub.image_url_cache == ''
+        assert pub.image_url() is None
+
+        # cleared from the category side
+        pub.category.add(category)
+        pub.refresh_from_db()
+        assert pub.image_url_cache.endswith('images/categories/changed.jpg')
+        category.publication_set.clear()
+        pub.refresh_from_db()
+        assert pub.image_url_cache == ''
+
+    def test_publication_scheduler(self):
+        pub = self.create_pub(count=1)
+        context = pub.get_publication_context()
+        webpath = context.webpath
+        assert publication_scheduler.get_next_transition(webpath) == context.date_end
+
+        # a context going live before
+        start = timezone.localtime() + timezone.timedelta(minutes=10)
+        PublicationContext.objects.create(publication=pub,
+                                          webpath=webpath,
+                                          date_start=start,
+                                          date_end=start + timezone.timedelta(days=1),
+                                          is_active=True)
+        assert publication_scheduler.get_next_transition(webpath) == start
+        assert 590 < publication_scheduler.get_cache_timeout(webpath) <= 600
+        # other webpaths
+        assert publication_scheduler.get_next_transition(webpath.pk + 1000) is None
+
+        # in evidence listings change when the evidence starts or ends
+        evidence = timezone.localtime() + timezone.timedelta(minutes=5)
+        context.in_evidence_start = evidence
+        context.save()
+        assert publication_scheduler.get_next_transition(webpath) == evidence
+        context.in_evidence_start = timezone.localtime() - timezone.timedelta(days=1)
+        context.in_evidence_end = evidence
+        context.save()
+        assert publication_scheduler.get_next_transition(webpath) == evidence
+
+        # api listings are cached until the next transition
+        url = reverse('unicms_api:api-news-by-contexts',
+                      kwargs={'webpath_id': webpath.pk})
+        res = Client().get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            cached = Client().get(url)
+        assert cached.json() == res.json()
+        assert not [i for i in ctx.captured_queries
+                    if 'cmspublications' in i['sql']]
+
+    def test_scheduled_transitions(self):
+        pub = self.create_pub(count=1)
+        context = pub.get_publication_context()
+        transitions = ScheduledTransition.objects.filter(object_id=context.pk)
+        # date_start is already passed
+        assert [i.field_name for i in transitions] == ['date_end']
+
+        context.date_start = timezone.localtime() + timezone.timedelta(minutes=30)
+        context.save()
+        assert transitions.all().count() == 2
+        assert get_next_transition() == context.date_start
+
+        context.delete()
+        assert not transitions.all().exists()
+
     # templatetag
     def test_load_publication(self):
         req = RequestFactory().get('/')
@@ -1,7 +1,12 @@
 import logging
 
+from django.db.models import Q
 from django.utils import timezone
 
+from . cache import (get_preview_from_cache,
+                     make_preview_cache_key,
+                     set_preview_to_cache)
+
 
 logger = logging.getLogger(__name__)
 
@@ -27,3 +32,93 @@ def publication_context_base_filter():
         # }
     pubcontx_filter['is_active'] = True
     return pubcontx_filter
+
+
+def publication_context_related_objects(queryset):
+    """
+    loads, in a constant number of queries, all the objects
+    used by PublicationContextPublicSerializer
+    """
+    return queryset.select_related('publication__preview_image',
+                                   'publication__presentation_image',
+                                   'webpath__site',
+                                   'webpath__parent',
+                                   'webpath__alias')\
+                   .prefetch_related('publication__category',
+                                     'publication__tags')
+
+
+def publications_preview_queryset(webpath, section=None,
+                                  categories=None,
+                                  exclude_categories=False,
+                                  tags=None,
+                                  exclude_negative_order=False,
+                                  in_evidence=False):
+    """
+    active publication contexts of a webpath.
+    Categories and tags are filtered with subqueries, this way
+    rows are never duplicated by joins and distinct() is not needed
+    """
+    from . models import Category, Publication, PublicationContext
+
+    now = timezone.localtime()
+    queryset = PublicationContext.objects.filter(webpath=webpath,
+                                                 is_active=True,
+                                                 publication__is_active=True,
+                                                 date_start__lte=now,
+                                                 date_end__gt=now)
+    if section:
+        queryset = queryset.filter(section=section)
+    if categories:
+        if exclude_categories:
+            category_filter = {'category__in': Category.objects.exclude(name__in=categories)}
+        else:
+            category_filter = {'category__name__in': categories}
+        queryset = queryset.filter(
+            publication__in=Publication.objects.filter(**category_filter).values('pk')
+        )
+    if tags:
+        queryset = queryset.filter(
+            publication__in=Publication.objects.filter(tags__name__in=tags).values('pk')
+        )
+    if exclude_negative_order:
+        queryset = queryset.filter(order__gte=0)
+    if in_evidence:
+        queryset = queryset.filter(Q(in_evidence_end__gt=now) |
+                                   Q(in_evidence_end__isnull=True),
+                                   in_evidence_start__lt=now)
+    return queryset.select_related('publication__preview_image',
+                                   'publication__presentation_image')\
+                   .prefetch_related('publication__category',
+                                     'publication__tags')\
+                   .order_by('order', '-date_start')
+
+
+def get_publications_preview(webpath, language='', number=0, **filters):
+    """
+    returns the list of the publication contexts
+    rendered by load_publications_preview, translated in language.
+    Lists are cached for each webpath, filters and language
+    until the next publication context transition
+    """
+    from . models import Publication
+    from . scheduler import publication_scheduler
+
+    key = make_preview_cache_key(webpath.pk,
+                                 dict(filters, number=number),
+                                 language)
+    pub_in_context = get_preview_from_cache(key)
+    if pub_in_context is None:
+        queryset = publications_preview_queryset(webpath, **filters)
+        if number > 0:
+            queryset = queryset[0:number]
+        pub_in_context = list(queryset)
+        Publication.translate_many_as([i.publication for i in pub_in_context],
+                                      lang=language)
+        # valid until a publication context starts or ends
+        set_preview_to_cache(key, pub_in_context,
+                             publication_scheduler.get_cache_timeout(webpath))
+    # all the contexts belong to the webpath that's being rendered
+    for i in pub_in_context:
+        i.webpath = webpath
+    return pub_in_context
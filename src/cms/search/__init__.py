@@ -1,21 +1,17 @@
-import pymongo
-
 from django.conf import settings as global_settings
 
 default_app_config = 'cms.search.apps.CmsSearchConfig'
 
 
 class MongoClientFactory(object):
-    mongo_client = None
+    """
+    returns the pooled MongoClient of the current process,
+    see cms.search.mongo.MongoClientManager
+    """
 
     def __new__(cls, *args, **kwargs):
-        if not isinstance(cls.mongo_client, cls) or \
-           not cls.mongo_client.server_info():
-            cls.mongo_client = pymongo.MongoClient(
-                                global_settings.MONGO_URL,
-                                **global_settings.MONGO_CONNECTION_PARAMS
-            )
-        return cls.mongo_client
+        from . mongo import mongo_client_manager
+        return mongo_client_manager.get_client()
 
 
 def mongo_collection():
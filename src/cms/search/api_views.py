@@ -1,25 +1,29 @@
 import logging
 import math
 import re
-import pymongo
-
-from pymongo.errors import ServerSelectionTimeoutError
 
 from django.conf import settings
-from django.utils import timezone, dateparse
 from django.utils.decorators import method_decorator
 
 
 from rest_framework.exceptions import APIException, NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from cms.api.filters import GenericApiFilter
 from cms.contexts.decorators import detect_language
 
-from . import MongoClientFactory
-from . settings import ALLOW_SEARCH_IN_SITES
+from . backends import get_search_backend
+from . cache import (get_search_cache_stats,
+                     get_search_from_cache,
+                     set_search_to_cache)
+from . exceptions import SearchEngineUnavailable
+from . mongo import mongo_client_manager
+from . settings import (ALLOW_SEARCH_IN_SITES,
+                        SEARCH_SUGGEST_LIMIT,
+                        SEARCH_SUGGEST_MIN_LENGTH)
 
 
 logger = logging.getLogger(__name__)
@@ -28,6 +32,12 @@ logger = logging.getLogger(__name__)
 ALLOW_SEARCH_IN_SITES = getattr(settings,
                                 'ALLOW_SEARCH_IN_SITES',
                                 ALLOW_SEARCH_IN_SITES)
+SEARCH_SUGGEST_LIMIT = getattr(settings,
+                               'SEARCH_SUGGEST_LIMIT',
+                               SEARCH_SUGGEST_LIMIT)
+SEARCH_SUGGEST_MIN_LENGTH = getattr(settings,
+                                    'SEARCH_SUGGEST_MIN_LENGTH',
+                                    SEARCH_SUGGEST_MIN_LENGTH)
 
 
 class ServiceUnavailable(APIException): # pragma: no cover
@@ -36,12 +46,6 @@ class ServiceUnavailable(APIException): # pragma: no cover
     default_code = 'service_unavailable'
 
 
-def _handle_date_string(date_string):
-    date = dateparse.parse_date(date_string)
-    dt = timezone.datetime(date.year, date.month, date.day)
-    return timezone.make_aware(dt)
-
-
 class ApiSearchEngineFilter(GenericApiFilter):
     search_params = [
         {'name': 'categories',
@@ -80,10 +84,54 @@ class ApiSearchEngineFilter(GenericApiFilter):
          'required': False,
          'schema':
              {'type': 'string'},
+        },
+        {'name': 'facets',
+         'description': 'true to get categories, tags, sites and year counts',
+         'required': False,
+         'schema':
+             {'type': 'boolean'},
         }
     ]
 
 
+def _get_search_filters(request):
+    """
+    returns a dict with the search parameters taken from the request
+    """
+    filters = {}
+
+    # get only what's really needed
+    search_regexp = re.match(r'^[\w\+\-\s\(\)\[\]\=\"\'\.\_]*',
+                             request.GET.get('search', ''))
+    filters['search'] = search_regexp.group().strip() if search_regexp else ''
+
+    # year
+    year = request.GET.get('year', None)
+    if year:
+        if isinstance(year, str):
+            year = int(year)
+        filters['year'] = year
+
+    # date range
+    filters['date_start'] = request.GET.get('date_start')
+    filters['date_end'] = request.GET.get('date_end')
+
+    # comma separated values
+    for name in ('tags', 'sites', 'categories'):
+        values = request.GET.get(name)
+        if values:
+            filters[name] = [i.strip() for i in values.split(',')]
+
+    # facet counts
+    filters['facets'] = request.GET.get('facets', '').lower() in ('1', 'true')
+
+    try:
+        filters['page'] = int(request.GET.get('page', 1)) or 1
+    except ValueError:
+        filters['page'] = 1
+    return filters
+
+
 @method_decorator(detect_language, name='dispatch')
 class ApiSearchEngine(APIView):
     """
@@ -92,96 +140,41 @@ class ApiSearchEngine(APIView):
     filter_backends = [ApiSearchEngineFilter,]
 
     def get(self, request):
-        # get collection
-        collection = MongoClientFactory().unicms.search
-
-        # get only what's really needed
-        search_regexp = re.match(r'^[\w\+\-\s\(\)\[\]\=\"\'\.\_]*',
-                                 request.GET.get('search', ''))
-        query = {}
-        if search_regexp:
-            search = search_regexp.group()
-            if search:
-                query = {"$text": {"$search": search}}
-
-        # year
-        year = request.GET.get('year', None)
-        if year:
-            if isinstance(year, str):
-                year = int(year)
-            query['year'] = year
-
-        # date range
-        date_start = request.GET.get('date_start')
-        date_end = request.GET.get('date_end')
-        if date_start or date_end:
-            query['published'] = {}
-        if date_start:
-            query['published']["$gte"] = _handle_date_string(date_start)
-        if date_end:
-            query['published']["$lt"] = _handle_date_string(date_end)
-
-        # tags
-        tags = request.GET.get('tags')
-        if tags:
-            try:
-                tags = [i.strip() for i in tags.split(',')]
-                query['tags'] = {'$all': tags}
-            except ValueError: # pragma: no cover
-                logger.debug(f'API Search: Bad tags: {tags}')
-
-        # web site
-
-        # allowed sites
-        if '*' in ALLOW_SEARCH_IN_SITES: pass
-        else:
-            query['sites'] = {}
-            query['sites']['$elemMatch'] = {'$in': ALLOW_SEARCH_IN_SITES}
-
-        sites = request.GET.get('sites')
-        if sites:
-            try:
-                if not 'sites' in query: query['sites'] = {}
-                sites = [i.strip() for i in sites.split(',')]
-                query['sites']['$all'] = sites
-            except ValueError: # pragma: no cover
-                logger.debug(f'API Search: Bad sites: {sites}')
-
-        # categories
-        categories = request.GET.get('categories')
-        if categories:
-            try:
-                categories = [i.strip() for i in categories.split(',')]
-                query['categories'] = {'$all': categories}
-            except ValueError: # pragma: no cover
-                logger.debug(f'API Search: Bad categories: {categories}')
+        filters = _get_search_filters(request)
+        language = getattr(request, 'LANGUAGE_CODE', '')
+
+        cached = get_search_from_cache(filters, language)
+        if cached is not None:
+            return Response(cached)
+
+        # pagination
+        elements_in_page = getattr(settings, 'SEARCH_ELEMENTS_IN_PAGE', 25)
+        page = filters['page']
+        end = elements_in_page * page
+        start = end - elements_in_page
 
         # run query
-        logger.debug('Search query: {}'.format(query))
+        backend = get_search_backend()
         try:
-            if search:
-                res = collection.find(query, {'relevance': {'$meta': "textScore"}}).\
-                                 sort([('relevance', {'$meta': 'textScore'})])
-            else:
-                res = collection.find(query).sort('published',
-                                                  pymongo.DESCENDING)
-        except ServerSelectionTimeoutError as e: # pragma: no cover
+            data, total_elements = backend.search(
+                filters,
+                start=start,
+                end=end,
+                allowed_sites=ALLOW_SEARCH_IN_SITES
+            )
+            facets = backend.facets(
+                filters,
+                allowed_sites=ALLOW_SEARCH_IN_SITES
+            ) if filters['facets'] else None
+        except SearchEngineUnavailable as e: # pragma: no cover
             logger.critical(e)
             raise ServiceUnavailable()
 
-
-        # pagination
-        elements_in_page = getattr(settings, 'SEARCH_ELEMENTS_IN_PAGE', 25)
-        total_elements = res.collection.count_documents(query)
         if total_elements >= elements_in_page:
             total_pages = math.ceil(total_elements / elements_in_page)
         else:
             total_pages = 1
 
-        try:
-            page = int(request.GET.get('page', 1)) or 1
-        except ValueError:
-            page = 1
         if page > total_pages:
             msg = PageNumberPagination.invalid_page_message.format(
                 page=page
@@ -189,24 +182,86 @@ class ApiSearchEngine(APIView):
             raise NotFound(msg)
             # page = total_pages
 
-        # get page
-        end = elements_in_page * page
-        start = end - elements_in_page
-
         # this commented if should be checked!
         # if total_elements == total_pages:
         # page_number = total_elements
         # else:
         page_number = int(end / elements_in_page)
 
-        entries = res[start:end]
-        # dumped = dumps(result)
-        data = [{k:v for k,v in entry.items() if k != '_id'}
-                for entry in entries]
         result = {"results": data,
                   "count": total_elements,
                   "total_pages": total_pages,
                   "per_page": elements_in_page,
                   "page": page_number
         }
+        if facets is not None:
+            result['facets'] = facets
+        # facets are cached along with the page
+        set_search_to_cache(filters, result, language)
         return Response(result)
+
+
+class ApiSearchEngineSuggestFilter(GenericApiFilter):
+    search_params = [
+        {'name': 'q',
+         'description': 'what the user is typing',
+         'required': True,
+         'schema':
+             {'type': 'string'},
+        },
+        {'name': 'limit',
+         'description': 'max number of suggestions',
+         'required': False,
+         'schema':
+             {'type': 'integer',
+              'format': 'int32'},
+        }
+    ]
+
+
+class ApiSearchEngineSuggest(APIView):
+    """
+    """
+    description = 'Search Engine autocomplete (titles and tags)'
+    filter_backends = [ApiSearchEngineSuggestFilter,]
+
+    def get(self, request):
+        prefix = request.GET.get('q', '').strip()
+        if len(prefix) < SEARCH_SUGGEST_MIN_LENGTH:
+            return Response({'results': []})
+        try:
+            limit = max(1, min(int(request.GET.get('limit', SEARCH_SUGGEST_LIMIT)),
+                               SEARCH_SUGGEST_LIMIT))
+        except ValueError:
+            limit = SEARCH_SUGGEST_LIMIT
+        try:
+            results = get_search_backend().suggest(
+                prefix,
+                limit=limit,
+                allowed_sites=ALLOW_SEARCH_IN_SITES
+            )
+        except SearchEngineUnavailable as e: # pragma: no cover
+            logger.critical(e)
+            raise ServiceUnavailable()
+        return Response({'results': results})
+
+
+class ApiSearchEngineCacheStats(APIView):
+    """
+    """
+    description = 'Search Engine results cache hits/misses'
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_search_cache_stats())
+
+
+class ApiSearchEngineMongoStats(APIView):
+    """
+    """
+    description = ('MongoDB client health and connection pool '
+                   'checkout wait time (current process)')
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(mongo_client_manager.get_stats())
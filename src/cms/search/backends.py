@@ -0,0 +1,697 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+
+import pymongo
+
+from contextlib import contextmanager
+from datetime import timezone as dt_timezone
+from pymongo.errors import ConnectionFailure, PyMongoError
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import dateparse, timezone
+from django.utils.html import strip_tags
+from django.utils.module_loading import import_string
+
+from . import settings as app_settings
+from . exceptions import SearchEngineUnavailable
+from . mongo import mongo_client_manager
+
+
+logger = logging.getLogger(__name__)
+
+SEARCH_BACKEND = getattr(settings, 'SEARCH_BACKEND',
+                         app_settings.SEARCH_BACKEND)
+SEARCH_SQLITE_PATH = getattr(settings, 'SEARCH_SQLITE_PATH',
+                             app_settings.SEARCH_SQLITE_PATH)
+SEARCH_FACETS_LIMIT = getattr(settings, 'SEARCH_FACETS_LIMIT',
+                              app_settings.SEARCH_FACETS_LIMIT)
+SEARCH_SUGGEST_LIMIT = getattr(settings, 'SEARCH_SUGGEST_LIMIT',
+                               app_settings.SEARCH_SUGGEST_LIMIT)
+SEARCH_SUGGEST_TITLE_WORDS = getattr(settings, 'SEARCH_SUGGEST_TITLE_WORDS',
+                                     app_settings.SEARCH_SUGGEST_TITLE_WORDS)
+SEARCH_SUGGEST_SCAN_LIMIT = getattr(settings, 'SEARCH_SUGGEST_SCAN_LIMIT',
+                                    app_settings.SEARCH_SUGGEST_SCAN_LIMIT)
+
+
+def _handle_date_string(date_string):
+    date = dateparse.parse_date(date_string)
+    dt = timezone.datetime(date.year, date.month, date.day)
+    return timezone.make_aware(dt)
+
+
+def normalize_term(value):
+    """
+    lowercase, without accents and redundant spaces
+    """
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(i for i in value if not unicodedata.combining(i))
+    return ' '.join(value.lower().split())
+
+
+def get_suggestion_terms(entry):
+    """
+    returns the (kind, value, normalized key) autocomplete terms of an entry.
+    Titles are indexed from each of their first words,
+    this way "campus" prefix matches "Unical campus"
+    """
+    terms = set()
+    title = ' '.join((entry.get('title') or '').split())
+    words = title.split(' ')
+    for i in range(min(len(words), SEARCH_SUGGEST_TITLE_WORDS)):
+        normalized = normalize_term(' '.join(words[i:]))
+        if normalized:
+            terms.add(('title', title, normalized))
+    for tag in entry.get('tags') or []:
+        normalized = normalize_term(tag)
+        if normalized:
+            terms.add(('tag', tag, normalized))
+    return terms
+
+
+def _site_allowed(site, allowed_sites):
+    return '*' in allowed_sites or site in allowed_sites
+
+
+def _sort_facets(facets, limit=None):
+    """
+    most frequent values first, years in descending order
+    """
+    limit = limit or SEARCH_FACETS_LIMIT
+    for field, values in facets.items():
+        if field == 'year':
+            values.sort(key=lambda i: i['value'], reverse=True)
+        else:
+            values.sort(key=lambda i: (-i['count'], i['value']))
+            facets[field] = values[:limit]
+    return facets
+
+
+class BaseSearchBackend(object):
+    """
+    Search engine storage.
+    Every backend stores cms.search.models.SearchEntry documents
+    and implements the same filters:
+
+    filters = {'search': 'words "a phrase" -excluded',
+               'tags': ['tag1', 'tag2'],
+               'categories': ['category1'],
+               'sites': ['www.example.org'],
+               'year': 2021,
+               'date_start': 'YYYY-mm-dd',
+               'date_end': 'YYYY-mm-dd'}
+
+    match dicts, used by hooks and commands, are equality
+    conditions on content_type, content_id, year, month and day
+    """
+    facets_fields = ('categories', 'tags', 'sites', 'year')
+
+    def insert_one(self, entry): # pragma: no cover
+        raise NotImplementedError()
+
+    def insert_many(self, entries): # pragma: no cover
+        raise NotImplementedError()
+
+    def delete_many(self, match): # pragma: no cover
+        """
+        returns the number of removed entries
+        """
+        raise NotImplementedError()
+
+    def find(self, match): # pragma: no cover
+        raise NotImplementedError()
+
+    def count(self, match): # pragma: no cover
+        raise NotImplementedError()
+
+    def search(self, filters, start=0, end=None, allowed_sites=('*',)): # pragma: no cover
+        """
+        returns a tuple (entries[start:end], total entries count)
+        """
+        raise NotImplementedError()
+
+    def suggest(self, prefix, limit=None, allowed_sites=('*',)): # pragma: no cover
+        """
+        returns the titles and tags that start with prefix,
+        or that have a word starting with it, ordered by entries count:
+
+        [{'value': 'Unical campus', 'kind': 'title', 'count': 1}, ...]
+        """
+        raise NotImplementedError()
+
+    def facets(self, filters, allowed_sites=('*',), limit=None): # pragma: no cover
+        """
+        returns the entries count of each categories, tags, sites
+        and year value among the entries matched by filters:
+
+        {'categories': [{'value': 'news', 'count': 12}, ...],
+         'tags': [...], 'sites': [...],
+         'year': [{'value': 2021, 'count': 7}, ...]}
+        """
+        raise NotImplementedError()
+
+
+class MongoSearchBackend(BaseSearchBackend):
+    """
+    MongoDB $text search engine (default)
+    """
+
+    def __init__(self, collection_name=None, **kwargs):
+        self.collection_name = collection_name or \
+                               settings.MONGO_COLLECTION_NAME
+
+    @property
+    def collection(self):
+        client = mongo_client_manager.get_client()
+        db = getattr(client, settings.MONGO_DB_NAME)
+        return getattr(db, self.collection_name)
+
+    @property
+    def suggestions(self):
+        """
+        autocomplete terms collection, see create_suggestions_index()
+        """
+        client = mongo_client_manager.get_client()
+        db = getattr(client, settings.MONGO_DB_NAME)
+        return getattr(db, f'{self.collection_name}_suggest')
+
+    def create_suggestions_index(self):
+        return self.suggestions.create_index([('normalized', 1)])
+
+    @staticmethod
+    def _get_suggestions(entries):
+        return [{'content_type': entry['content_type'],
+                 'content_id': str(entry['content_id']),
+                 'year': entry.get('year'),
+                 'month': entry.get('month'),
+                 'day': entry.get('day'),
+                 'sites': entry.get('sites') or [],
+                 'kind': kind,
+                 'value': value,
+                 'normalized': normalized}
+                for entry in entries
+                for kind, value, normalized in get_suggestion_terms(entry)]
+
+    @contextmanager
+    def available(self):
+        """
+        fails fast while the server is known to be unavailable,
+        failures are reported to the client manager health checker
+        """
+        if not mongo_client_manager.healthy:
+            raise SearchEngineUnavailable('MongoDB is not available')
+        try:
+            yield self.collection
+        except ConnectionFailure as e:
+            mongo_client_manager.report_failure(e)
+            raise SearchEngineUnavailable(e)
+        except PyMongoError as e:
+            raise SearchEngineUnavailable(e)
+
+    def insert_one(self, entry):
+        self.insert_many([entry])
+
+    def insert_many(self, entries):
+        if not entries: return
+        suggestions = self._get_suggestions(entries)
+        with self.available() as collection:
+            collection.insert_many(entries, ordered=False)
+            if suggestions:
+                self.suggestions.insert_many(suggestions, ordered=False)
+
+    def delete_many(self, match):
+        with self.available() as collection:
+            self.suggestions.delete_many(match)
+            return collection.delete_many(match).deleted_count
+
+    def find(self, match):
+        with self.available() as collection:
+            entries = list(collection.find(match))
+        for entry in entries:
+            entry.pop('_id', None)
+            yield entry
+
+    def count(self, match):
+        with self.available() as collection:
+            return collection.count_documents(match)
+
+    @staticmethod
+    def get_query(filters, allowed_sites=('*',)):
+        query = {}
+        search = filters.get('search')
+        if search:
+            query = {"$text": {"$search": search}}
+
+        # year
+        if filters.get('year'):
+            query['year'] = filters['year']
+
+        # date range
+        date_start = filters.get('date_start')
+        date_end = filters.get('date_end')
+        if date_start or date_end:
+            query['published'] = {}
+        if date_start:
+            query['published']["$gte"] = _handle_date_string(date_start)
+        if date_end:
+            query['published']["$lt"] = _handle_date_string(date_end)
+
+        # tags
+        tags = filters.get('tags')
+        if tags:
+            query['tags'] = {'$all': tags}
+
+        # web site
+
+        # allowed sites
+        if '*' in allowed_sites: pass
+        else:
+            query['sites'] = {}
+            query['sites']['$elemMatch'] = {'$in': list(allowed_sites)}
+
+        sites = filters.get('sites')
+        if sites:
+            if not 'sites' in query: query['sites'] = {}
+            query['sites']['$all'] = sites
+
+        # categories
+        categories = filters.get('categories')
+        if categories:
+            query['categories'] = {'$all': categories}
+        return query
+
+    def search(self, filters, start=0, end=None, allowed_sites=('*',)):
+        query = self.get_query(filters, allowed_sites)
+        logger.debug('Search query: {}'.format(query))
+        with self.available() as collection:
+            if filters.get('search'):
+                res = collection.find(query, {'relevance': {'$meta': "textScore"}}).\
+                                 sort([('relevance', {'$meta': 'textScore'})])
+            else:
+                res = collection.find(query).sort('published',
+                                                  pymongo.DESCENDING)
+            total = collection.count_documents(query)
+            entries = [{k:v for k,v in entry.items() if k != '_id'}
+                       for entry in res[start:end]]
+        return entries, total
+
+    def suggest(self, prefix, limit=None, allowed_sites=('*',)):
+        normalized = normalize_term(prefix)
+        if not normalized: return []
+        # an anchored regex is a range scan on the normalized index
+        query = {'normalized': {'$regex': f'^{re.escape(normalized)}'}}
+        if '*' not in allowed_sites:
+            query['sites'] = {'$in': list(allowed_sites)}
+        pipeline = [{'$match': query},
+                    {'$sort': {'normalized': 1}},
+                    {'$limit': SEARCH_SUGGEST_SCAN_LIMIT},
+                    {'$group': {'_id': {'kind': '$kind', 'value': '$value'},
+                                'entries': {'$addToSet': '$content_id'}}},
+                    {'$project': {'count': {'$size': '$entries'}}},
+                    {'$sort': {'count': -1, '_id.value': 1}},
+                    {'$limit': limit or SEARCH_SUGGEST_LIMIT}]
+        with self.available():
+            res = list(self.suggestions.aggregate(pipeline))
+        return [{'value': i['_id']['value'],
+                 'kind': i['_id']['kind'],
+                 'count': i['count']} for i in res]
+
+    def facets(self, filters, allowed_sites=('*',), limit=None):
+        query = self.get_query(filters, allowed_sites)
+        count_stages = [{'$group': {'_id': '$_v', 'count': {'$sum': 1}}}]
+        facet = {}
+        for field in self.facets_fields:
+            if field == 'year':
+                facet[field] = [{'$project': {'_v': '$year'}}]
+            else:
+                facet[field] = [{'$unwind': f'${field}'},
+                                {'$project': {'_v': f'${field}'}}]
+                if field == 'sites' and '*' not in allowed_sites:
+                    facet[field].append(
+                        {'$match': {'_v': {'$in': list(allowed_sites)}}}
+                    )
+            facet[field].extend(count_stages)
+        # single aggregation pipeline, $text $match must be the first stage
+        pipeline = [{'$match': query}, {'$facet': facet}]
+        with self.available() as collection:
+            res = list(collection.aggregate(pipeline))
+        res = res[0] if res else {}
+        facets = {field: [{'value': i['_id'], 'count': i['count']}
+                          for i in res.get(field, [])]
+                  for field in self.facets_fields}
+        return _sort_facets(facets, limit)
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_entry (
+    id INTEGER PRIMARY KEY,
+    content_type TEXT NOT NULL,
+    content_id TEXT NOT NULL,
+    published TEXT,
+    year INTEGER,
+    month INTEGER,
+    day INTEGER,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS search_entry_content
+    ON search_entry (content_type, content_id);
+CREATE INDEX IF NOT EXISTS search_entry_published
+    ON search_entry (published);
+CREATE INDEX IF NOT EXISTS search_entry_date
+    ON search_entry (year, month, day);
+CREATE TABLE IF NOT EXISTS search_entry_term (
+    entry_id INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS search_entry_term_value
+    ON search_entry_term (field, value, entry_id);
+CREATE INDEX IF NOT EXISTS search_entry_term_entry
+    ON search_entry_term (entry_id);
+CREATE TABLE IF NOT EXISTS search_suggestion (
+    entry_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    normalized TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS search_suggestion_normalized
+    ON search_suggestion (normalized, entry_id);
+CREATE INDEX IF NOT EXISTS search_suggestion_entry
+    ON search_suggestion (entry_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_entry_fts USING fts5(
+    title, heading, content, translations,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    local full-text search engine built on SQLite FTS5,
+    results are ranked with bm25.
+    Suitable for small deployments and for tests,
+    it doesn't need any external service.
+    """
+    match_fields = ('content_type', 'content_id', 'year', 'month', 'day')
+    terms_fields = ('tags', 'categories', 'sites')
+    datetime_fields = ('indexed', 'published')
+    # bm25 weights of title, heading, content and translations
+    bm25_weights = (4.0, 2.0, 1.0, 1.0)
+
+    def __init__(self, path=None, **kwargs):
+        self.path = path or SEARCH_SQLITE_PATH
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        # one connection for each thread, new ones in forked processes
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SQLITE_SCHEMA)
+            self._local.connection = conn
+            self._local.pid = pid
+        return self._local.connection
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection
+        conn.execute('BEGIN')
+        try:
+            yield conn
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    @staticmethod
+    def _as_utc(value):
+        if isinstance(value, str):
+            value = dateparse.parse_datetime(value)
+        if value and timezone.is_aware(value):
+            value = value.astimezone(dt_timezone.utc).replace(tzinfo=None)
+        return value.strftime('%Y-%m-%dT%H:%M:%S.%f') if value else None
+
+    def _insert(self, conn, entry):
+        published = entry.get('published')
+        cursor = conn.execute(
+            'INSERT INTO search_entry (content_type, content_id, published, '
+            'year, month, day, document) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (entry['content_type'], str(entry['content_id']),
+             self._as_utc(published),
+             entry.get('year'), entry.get('month'), entry.get('day'),
+             json.dumps(entry, cls=DjangoJSONEncoder))
+        )
+        entry_id = cursor.lastrowid
+        translations = ' '.join(' '.join((i.get('title') or '',
+                                          i.get('subheading') or '',
+                                          strip_tags(i.get('content') or '')))
+                                for i in entry.get('translations') or [])
+        conn.execute(
+            'INSERT INTO search_entry_fts (rowid, title, heading, '
+            'content, translations) VALUES (?, ?, ?, ?, ?)',
+            (entry_id, entry.get('title') or '', entry.get('heading') or '',
+             strip_tags(entry.get('content') or ''), translations)
+        )
+        terms = [(entry_id, field, value)
+                 for field in self.terms_fields
+                 for value in set(entry.get(field) or [])]
+        conn.executemany(
+            'INSERT INTO search_entry_term (entry_id, field, value) '
+            'VALUES (?, ?, ?)', terms
+        )
+        conn.executemany(
+            'INSERT INTO search_suggestion (entry_id, kind, value, normalized) '
+            'VALUES (?, ?, ?, ?)',
+            [(entry_id, *term) for term in get_suggestion_terms(entry)]
+        )
+
+    def _decode(self, document):
+        entry = json.loads(document)
+        for field in self.datetime_fields:
+            if entry.get(field):
+                entry[field] = dateparse.parse_datetime(entry[field])
+        return entry
+
+    def _get_match_where(self, match):
+        where, params = [], []
+        for k,v in match.items():
+            if k not in self.match_fields:
+                raise ValueError(f'Unsupported search entry match field: {k}')
+            where.append(f'e.{k} = ?')
+            params.append(str(v) if k == 'content_id' else v)
+        return where, params
+
+    @staticmethod
+    def get_fts_query(search):
+        """
+        translates MongoDB $text search syntax to FTS5 query syntax:
+        words are in OR, "phrases" are required and -words excluded.
+        As in MongoDB, words don't filter the results of phrases,
+        hyphens exclude only at the start of a word (e-learning is
+        "e" OR "learning") and excluded words alone match nothing (None)
+        """
+        phrases = [i for i in re.findall(r'"([^"]*)"', search) if i.strip()]
+        include, exclude = [], []
+        for token in re.sub(r'"[^"]*"?', ' ', search).split():
+            words = re.findall(r'\w+', token)
+            if not words: continue
+            if token.startswith('-'):
+                exclude.append(' '.join(words))
+            else:
+                include.extend(words)
+        if phrases:
+            query = ' AND '.join('"{}"'.format(i.replace('"', ''))
+                                 for i in phrases)
+        elif include:
+            query = '({})'.format(' OR '.join(f'"{i}"' for i in include))
+        else:
+            return None if search.strip() else ''
+        for words in exclude:
+            query += f' NOT "{words}"'
+        return query
+
+    def get_where(self, filters, allowed_sites=('*',)):
+        where, params = [], []
+
+        if filters.get('year'):
+            where.append('e.year = ?')
+            params.append(int(filters['year']))
+
+        # date range
+        if filters.get('date_start'):
+            where.append('e.published >= ?')
+            params.append(self._as_utc(_handle_date_string(filters['date_start'])))
+        if filters.get('date_end'):
+            where.append('e.published < ?')
+            params.append(self._as_utc(_handle_date_string(filters['date_end'])))
+
+        # allowed sites
+        if '*' not in allowed_sites:
+            placeholders = ', '.join('?' for i in allowed_sites)
+            where.append('e.id IN (SELECT entry_id FROM search_entry_term '
+                         f'WHERE field = ? AND value IN ({placeholders}))')
+            params.extend(['sites', *allowed_sites])
+
+        # tags, categories and sites must contain all the values
+        for field in self.terms_fields:
+            for value in filters.get(field) or []:
+                where.append('e.id IN (SELECT entry_id FROM search_entry_term '
+                             'WHERE field = ? AND value = ?)')
+                params.extend([field, value])
+        return where, params
+
+    def insert_one(self, entry):
+        with self.transaction() as conn:
+            self._insert(conn, entry)
+
+    def insert_many(self, entries):
+        with self.transaction() as conn:
+            for entry in entries:
+                self._insert(conn, entry)
+
+    def delete_many(self, match):
+        where, params = self._get_match_where(match)
+        ids_query = 'SELECT e.id FROM search_entry e WHERE {}'.format(
+            ' AND '.join(where) or '1'
+        )
+        with self.transaction() as conn:
+            conn.execute(f'DELETE FROM search_entry_fts WHERE rowid IN ({ids_query})', params)
+            conn.execute(f'DELETE FROM search_entry_term WHERE entry_id IN ({ids_query})', params)
+            conn.execute(f'DELETE FROM search_suggestion WHERE entry_id IN ({ids_query})', params)
+            cursor = conn.execute(f'DELETE FROM search_entry WHERE id IN ({ids_query})', params)
+        return cursor.rowcount
+
+    def find(self, match):
+        where, params = self._get_match_where(match)
+        rows = self.connection.execute(
+            'SELECT e.document FROM search_entry e WHERE {} ORDER BY e.id'.format(
+                ' AND '.join(where) or '1'
+            ), params
+        )
+        for row in rows:
+            yield self._decode(row[0])
+
+    def count(self, match):
+        where, params = self._get_match_where(match)
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM search_entry e WHERE {}'.format(
+                ' AND '.join(where) or '1'
+            ), params
+        ).fetchone()[0]
+
+    def get_search_query(self, filters, allowed_sites=('*',)):
+        """
+        returns tables, where clause and parameters of a search
+        """
+        where, params = self.get_where(filters, allowed_sites)
+        fts_query = self.get_fts_query(filters.get('search') or '')
+        if fts_query:
+            tables = ('search_entry_fts JOIN search_entry e '
+                      'ON e.id = search_entry_fts.rowid')
+            where.insert(0, 'search_entry_fts MATCH ?')
+            params.insert(0, fts_query)
+        else:
+            tables = 'search_entry e'
+            # nothing to search for
+            if fts_query is None: where.insert(0, '0')
+        where_sql = ' AND '.join(where) or '1'
+        logger.debug(f'Search query: {where_sql} {params}')
+        return tables, where_sql, params
+
+    def search(self, filters, start=0, end=None, allowed_sites=('*',)):
+        tables, where_sql, params = self.get_search_query(filters,
+                                                          allowed_sites)
+        if 'search_entry_fts' in tables:
+            weights = ', '.join(str(i) for i in self.bm25_weights)
+            columns = f'e.document, -bm25(search_entry_fts, {weights}) AS score'
+            order_by = 'score DESC'
+        else:
+            columns = 'e.document, NULL AS score'
+            order_by = 'e.published DESC'
+
+        conn = self.connection
+        try:
+            total = conn.execute(f'SELECT COUNT(*) FROM {tables} WHERE {where_sql}',
+                                 params).fetchone()[0]
+            limit = -1 if end is None else max(end - start, 0)
+            rows = conn.execute(f'SELECT {columns} FROM {tables} WHERE {where_sql} '
+                                f'ORDER BY {order_by} LIMIT ? OFFSET ?',
+                                params + [limit, start]).fetchall()
+        except sqlite3.OperationalError as e: # pragma: no cover
+            raise SearchEngineUnavailable(e)
+
+        entries = []
+        for document, score in rows:
+            entry = self._decode(document)
+            if score is not None:
+                entry['relevance'] = score
+            entries.append(entry)
+        return entries, total
+
+    def suggest(self, prefix, limit=None, allowed_sites=('*',)):
+        normalized = normalize_term(prefix)
+        if not normalized: return []
+        # prefix range scan on the normalized index
+        where = ['s.normalized >= ?', 's.normalized < ?']
+        params = [normalized, f'{normalized}\U0010ffff']
+        if '*' not in allowed_sites:
+            placeholders = ', '.join('?' for i in allowed_sites)
+            where.append('s.entry_id IN (SELECT entry_id FROM search_entry_term '
+                         f'WHERE field = ? AND value IN ({placeholders}))')
+            params.extend(['sites', *allowed_sites])
+        # at most SEARCH_SUGGEST_SCAN_LIMIT index rows, in prefix order,
+        # are grouped: this bounds the lookup time of short prefixes
+        rows = self.connection.execute(
+            'SELECT kind, value, COUNT(DISTINCT entry_id) AS n FROM '
+            '(SELECT s.kind, s.value, s.entry_id FROM search_suggestion s '
+            'WHERE {} ORDER BY s.normalized LIMIT ?) '
+            'GROUP BY kind, value '
+            'ORDER BY n DESC, value LIMIT ?'.format(' AND '.join(where)),
+            params + [SEARCH_SUGGEST_SCAN_LIMIT, limit or SEARCH_SUGGEST_LIMIT]
+        ).fetchall()
+        return [{'value': value, 'kind': kind, 'count': count}
+                for kind, value, count in rows]
+
+    def facets(self, filters, allowed_sites=('*',), limit=None):
+        tables, where_sql, params = self.get_search_query(filters,
+                                                          allowed_sites)
+        # one statement, matching entries are selected only once
+        query = (f'WITH matched AS (SELECT e.id, e.year FROM {tables} '
+                 f'WHERE {where_sql}) '
+                 'SELECT t.field, t.value, COUNT(*) FROM search_entry_term t '
+                 'JOIN matched m ON m.id = t.entry_id '
+                 'GROUP BY t.field, t.value '
+                 'UNION ALL '
+                 "SELECT 'year', m.year, COUNT(*) FROM matched m "
+                 'GROUP BY m.year')
+        try:
+            rows = self.connection.execute(query, params).fetchall()
+        except sqlite3.OperationalError as e: # pragma: no cover
+            raise SearchEngineUnavailable(e)
+
+        facets = {field: [] for field in self.facets_fields}
+        for field, value, count in rows:
+            if field == 'sites' and not _site_allowed(value, allowed_sites):
+                continue
+            facets[field].append({'value': value, 'count': count})
+        return _sort_facets(facets, limit)
+
+
+_backends = {}
+
+
+def get_search_backend(backend_path=None):
+    """
+    returns the configured search backend (settings.SEARCH_BACKEND)
+    """
+    backend_path = backend_path or SEARCH_BACKEND
+    if backend_path not in _backends:
+        _backends[backend_path] = import_string(backend_path)()
+    return _backends[backend_path]
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import settings as app_settings
+
+logger = logging.getLogger(__name__)
+
+
+# search results cache
+SEARCH_CACHE_ENABLED = getattr(settings, 'SEARCH_CACHE_ENABLED',
+                               app_settings.SEARCH_CACHE_ENABLED)
+SEARCH_CACHE_KEY_PREFIX = getattr(settings, 'SEARCH_CACHE_KEY_PREFIX',
+                                  app_settings.SEARCH_CACHE_KEY_PREFIX)
+SEARCH_CACHE_TTL = getattr(settings, 'SEARCH_CACHE_TTL',
+                           app_settings.SEARCH_CACHE_TTL)
+
+GENERATION_KEY = f'{SEARCH_CACHE_KEY_PREFIX}generation'
+HITS_KEY = f'{SEARCH_CACHE_KEY_PREFIX}hits'
+MISSES_KEY = f'{SEARCH_CACHE_KEY_PREFIX}misses'
+
+
+def _incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # key doesn't exist yet (or it has been evicted)
+        if cache.add(key, 1, None):
+            return 1
+        return cache.incr(key)
+
+
+def get_index_generation():
+    """
+    returns the current search index generation.
+    A missing counter is initialized with a timestamp, this way
+    an evicted counter never matches entries of past generations
+    """
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, int(time.time()), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_index_generation():
+    """
+    invalidates all the cached search results.
+    Called by search engine indexing hooks
+    """
+    get_index_generation()
+    generation = _incr(GENERATION_KEY)
+    logger.debug(f'uniCMS search cache - index generation bumped to {generation}')
+    return generation
+
+
+def normalize_search_filters(filters):
+    """
+    returns a canonical representation of search filters,
+    empty values are dropped and comma separated values sorted
+    """
+    normalized = {}
+    for k,v in filters.items():
+        if v in (None, '', [], ()):
+            continue
+        if isinstance(v, (list, tuple, set)):
+            v = sorted(set(v))
+        normalized[k] = v
+    return normalized
+
+
+def make_search_cache_key(filters, language=''):
+    normalized = normalize_search_filters(filters)
+    value_key = json.dumps({'filters': normalized,
+                            'lang': language,
+                            'generation': get_index_generation()},
+                           sort_keys=True,
+                           default=str)
+    hashed_v = hashlib.sha256(value_key.encode()).hexdigest()
+    return f'{SEARCH_CACHE_KEY_PREFIX}{hashed_v}'
+
+
+def get_search_from_cache(filters, language=''):
+    if not SEARCH_CACHE_ENABLED: return
+    key = make_search_cache_key(filters, language)
+    res = cache.get(key)
+    if res is not None:
+        _incr(HITS_KEY)
+        logger.debug(f'uniCMS search cache - {key} succesfully taken from cache')
+        return res
+    _incr(MISSES_KEY)
+
+
+def set_search_to_cache(filters, value, language=''):
+    if not SEARCH_CACHE_ENABLED: return
+    key = make_search_cache_key(filters, language)
+    cache.set(key, value, SEARCH_CACHE_TTL)
+    logger.debug(f'uniCMS search cache - {key} succesfully stored to cache')
+    return True
+
+
+def get_search_cache_stats():
+    hits = cache.get(HITS_KEY) or 0
+    misses = cache.get(MISSES_KEY) or 0
+    total = hits + misses
+    return {'enabled': SEARCH_CACHE_ENABLED,
+            'generation': get_index_generation(),
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else 0}
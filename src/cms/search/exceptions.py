@@ -0,0 +1,2 @@
+class SearchEngineUnavailable(Exception):
+    pass
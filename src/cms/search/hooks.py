@@ -3,7 +3,8 @@ import logging
 from django.conf import settings as global_settings
 from django.utils import timezone
 
-from . import mongo_collection
+from . backends import get_search_backend
+from . cache import bump_index_generation
 from . models import page_to_entry, publication_to_entry
 
 logger = logging.getLogger(__name__)
@@ -14,30 +15,28 @@ MONGO_COLLECTION_NAME = getattr(global_settings, 'MONGO_COLLECTION_NAME')
 
 
 def page_se_insert(page_object):
-    collection = mongo_collection()
+    backend = get_search_backend()
     search_entry = page_to_entry(page_object)
     # check if it doesn't exists or remove it and recreate
     doc_query = {"content_type": page_object._meta.label,
                  "content_id": str(page_object.pk)}
-    doc = collection.find_one(doc_query)
-    if doc:
-        collection.delete_many(doc_query)
+    if backend.delete_many(doc_query):
         logger.info(f'{page_object} removed from search engine')
 
     if page_object.is_publicable:
-        doc = collection.insert_one(search_entry)
+        backend.insert_one(search_entry)
+    bump_index_generation()
 
     logger.info(f'{page_object} succesfully indexed in search engine')
 
 
 def publication_se_insert(pub_object, *args, **kwargs):
-    collection = mongo_collection()
+    backend = get_search_backend()
     doc_query = {"content_type": pub_object._meta.label,
                  "content_id": str(pub_object.pk)}
     # remove old if it exists
-    doc = collection.find_one(doc_query)
-    if doc:
-        collection.delete_many(doc_query)
+    if backend.delete_many(doc_query):
+        bump_index_generation()
         logger.info(f'{pub_object} removed from search engine')
 
     # if publication isn't active, return
@@ -60,7 +59,8 @@ def publication_se_insert(pub_object, *args, **kwargs):
 
     # if pub_object.is_publicable:
     if contexts:
-        doc = collection.insert_one(search_entry)
+        backend.insert_one(search_entry)
+        bump_index_generation()
 
     logger.info(f'{pub_object} succesfully indexed in search engine')
 
@@ -78,8 +78,8 @@ def publication_context_se_delete(pubctx_object, *args, **kwargs):
 
 
 def searchengine_entry_remove(obj):
-    collection = mongo_collection()
     doc_query = {"content_type": obj._meta.label,
                  "content_id": str(obj.pk)}
-    collection.delete_many(doc_query)
+    get_search_backend().delete_many(doc_query)
+    bump_index_generation()
     logger.info(f'{obj} removed from search engine')
@@ -0,0 +1,157 @@
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from cms.search.backends import MongoSearchBackend, SQLiteSearchBackend
+from cms.search.models import SearchEntry
+
+
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do '
+         'eiusmod tempor incididunt ut labore et dolore magna aliqua enim '
+         'minim veniam quis nostrud exercitation ullamco laboris nisi '
+         'aliquip commodo consequat duis aute irure reprehenderit voluptate '
+         'velit esse cillum fugiat nulla pariatur excepteur sint occaecat '
+         'cupidatat proident sunt culpa officia deserunt mollit anim').split()
+TAGS = [f'tag{i}' for i in range(50)]
+CATEGORIES = [f'category{i}' for i in range(10)]
+SITES = [f'site{i}.example.org' for i in range(5)]
+QUERIES = [{'search': 'lorem ipsum'},
+           {'search': '"dolor sit"'},
+           {'search': 'tempor -magna'},
+           {'search': 'veniam', 'tags': ['tag1']},
+           {'search': 'consequat', 'sites': [SITES[0]]},
+           {'tags': ['tag2', 'tag3']},
+           {'categories': ['category1'], 'year': 2020},
+           {'date_start': '2019-01-01', 'date_end': '2019-06-30'},
+           {}]
+
+
+def _text(n):
+    return ' '.join(random.choices(WORDS, k=n))
+
+
+def fake_entry(i):
+    published = timezone.make_aware(
+        timezone.datetime(2015, 1, 1) + timezone.timedelta(hours=i % 60000)
+    )
+    entry = SearchEntry(
+        title=_text(6),
+        heading=_text(12),
+        content_type='cmspublications.Publication',
+        content_id=str(i),
+        content=f'<p>{_text(120)}</p>',
+        sites=random.sample(SITES, 2),
+        urls=[f'//{SITES[0]}/benchmark/{i}'],
+        tags=random.sample(TAGS, 3),
+        categories=random.sample(CATEGORIES, 1),
+        indexed=timezone.localtime(),
+        published=published,
+        language='italiano',
+        translations=[{'language': 'english',
+                       'title': _text(6),
+                       'subheading': _text(10),
+                       'content': _text(60)}],
+        day=published.day,
+        month=published.month,
+        year=published.year
+    )
+    return entry.dict()
+
+
+class Command(BaseCommand):
+    help = 'uniCMS Search Engine Backend Benchmark'
+
+    def add_arguments(self, parser):
+        parser.epilog = ('Example: ./manage.py cms_search_benchmark '
+                         '-backend cms.search.backends.SQLiteSearchBackend '
+                         '-n 100000')
+        parser.add_argument('-backend', type=str, required=False,
+                            default=getattr(settings, 'SEARCH_BACKEND',
+                                            'cms.search.backends.MongoSearchBackend'),
+                            help="search backend dotted path")
+        parser.add_argument('-n', type=int, required=False, default=100000,
+                            help="number of synthetic entries")
+        parser.add_argument('-batch', type=int, required=False, default=1000,
+                            help="entries inserted in each batch")
+        parser.add_argument('-repeat', type=int, required=False, default=20,
+                            help="executions of each query")
+
+    def get_backend(self, backend_path):
+        """
+        benchmarks never touch the real index
+        """
+        try:
+            backend_class = import_string(backend_path)
+        except ImportError as e:
+            raise CommandError(f'{backend_path} not found: {e}')
+        if not isinstance(backend_class, type):
+            raise CommandError(f'{backend_path} is not a search backend')
+        if issubclass(backend_class, MongoSearchBackend):
+            name = f'{settings.MONGO_COLLECTION_NAME}_benchmark'
+            backend = backend_class(collection_name=name)
+
+            def cleanup():
+                backend.collection.drop()
+                backend.suggestions.drop()
+            cleanup()
+            backend.create_suggestions_index()
+            return backend, cleanup
+        elif issubclass(backend_class, SQLiteSearchBackend):
+            fd, path = tempfile.mkstemp(suffix='.sqlite3')
+            os.close(fd)
+            backend = backend_class(path=path)
+
+            def cleanup():
+                backend.connection.close()
+                for i in ('', '-wal', '-shm'):
+                    if os.path.exists(f'{path}{i}'): os.remove(f'{path}{i}')
+            return backend, cleanup
+        raise CommandError(f'{backend_path} benchmark is not supported')
+
+    def handle(self, *args, **options):
+        random.seed(0)
+        backend, cleanup = self.get_backend(options['backend'])
+        n = options['n']
+        batch = options['batch']
+        try:
+            print(f'-- {options["backend"]}: indexing {n} entries --')
+            indexing = 0
+            for i in range(0, n, batch):
+                entries = [fake_entry(j) for j in range(i, min(i+batch, n))]
+                start = time.perf_counter()
+                backend.insert_many(entries)
+                indexing += time.perf_counter() - start
+            print(f'indexing: {indexing:.2f}s '
+                  f'({n / indexing:.0f} entries/s)')
+
+            for query in QUERIES:
+                timings = []
+                for i in range(options['repeat']):
+                    start = time.perf_counter()
+                    entries, total = backend.search(query, start=0, end=25)
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                p95 = timings[min(len(timings)-1, int(len(timings)*0.95))]
+                print(f'{query}: {total} results, '
+                      f'avg {statistics.mean(timings):.1f}ms, '
+                      f'p50 {statistics.median(timings):.1f}ms, '
+                      f'p95 {p95:.1f}ms')
+
+            for prefix in ('lo', 'lorem', 'tag1', 'dolor sit'):
+                timings = []
+                for i in range(options['repeat']):
+                    start = time.perf_counter()
+                    suggestions = backend.suggest(prefix)
+                    timings.append((time.perf_counter() - start) * 1000)
+                print(f'suggest {prefix!r}: {len(suggestions)} results, '
+                      f'avg {statistics.mean(timings):.1f}ms, '
+                      f'p50 {statistics.median(timings):.1f}ms')
+        finally:
+            cleanup()
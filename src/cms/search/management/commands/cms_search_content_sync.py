@@ -1,4 +1,5 @@
-from cms.search import mongo_collection
+from cms.search.backends import get_search_backend
+from cms.search.cache import bump_index_generation
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
@@ -29,7 +30,7 @@ class Command(BaseCommand):
                             help="see debug messages")
 
     def handle(self, *args, **options):
-        collection = mongo_collection()
+        backend = get_search_backend()
         content_type = options['type']
         query = {'content_type': content_type} if content_type else {}
 
@@ -40,9 +41,8 @@ class Command(BaseCommand):
 
         # purge
         if options['purge']:
-            del_res = collection.find(query)
-            del_count = del_res.collection.count_documents(query)
-            to_be_deleted = [i['_id'] for i in del_res]
+            del_count = backend.delete_many(query)
+            print(f'-- Deleted {del_count} elements. --')
 
         # rebuild
         data = []
@@ -56,30 +56,22 @@ class Command(BaseCommand):
                 doc_query = {"content_type": content_type,
                              "content_id": str(obj.pk)}
                 # remove old if it exists
-                doc = collection.find_one(doc_query)
-                if doc:
-                    collection.delete_many(doc_query)
+                backend.delete_many(doc_query)
 
                 if obj.is_publicable:
                     entry = _func(obj)
                     if entry: data.append(entry)
 
-            collection.insert_many(data, ordered=False)
-            ins_res = collection.find(query)
-            count = ins_res.collection.count_documents(query)
+            backend.insert_many(data)
             print(f'-- Inserted {len(data)} elements. --')
 
-        # purge
-        if options['purge']:
-            del_query = query.copy()
-            del_query.update({"_id": {"$in" : to_be_deleted}})
-            collection.delete_many(del_query)
-            print(f'-- Deleted {del_count} elements. --')
+        if options['purge'] or options['insert']:
+            bump_index_generation()
 
         # show
         if options['show']:
-            ins_show = collection.find(query)
-            count = ins_show.collection.count_documents(query)
-            for i in collection.find(query):
+            count = 0
+            for i in backend.find(query):
                 print(i)
+                count += 1
             print(f'-- {count} elements. --')
@@ -1,4 +1,5 @@
 from cms.search import mongo_collection
+from cms.search.backends import MongoSearchBackend
 
 from django.core.management.base import BaseCommand
 
@@ -47,3 +48,7 @@ class Command(BaseCommand):
                                            default_language=options["default_language"])
 
             print(f"Creating index: {res2}")
+
+            # autocomplete prefix index
+            res3 = MongoSearchBackend().create_suggestions_index()
+            print(f"Creating suggestions index: {res3}")
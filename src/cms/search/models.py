@@ -11,25 +11,25 @@ DEFAULT_LANGUAGE = dict(settings.LANGUAGES)[settings.LANGUAGE].lower()
 class SearchTranslationEntry(BaseModel):
     language : str
     title : str
-    subheading : Optional[str]
-    content : Optional[str]
+    subheading : Optional[str] = None
+    content : Optional[str] = None
 
 
 class SearchEntry(BaseModel):
     title : str
-    heading : Optional[str]
+    heading : Optional[str] = None
     content_type : str
     content_id : str
-    image : Optional[str]
-    content : Optional[str]
+    image : Optional[str] = None
+    content : Optional[str] = None
     sites : List[str]
     urls : List[str]
-    tags : Optional[list]
+    tags : Optional[list] = []
     categories : Optional[list] = []
     indexed : datetime
     published : datetime
-    viewed : Optional[int]
-    relevance : Optional[int]
+    viewed : Optional[int] = 0
+    relevance : Optional[float] = None
     language : str
     translations : List[SearchTranslationEntry] = None
     day : int
@@ -45,7 +45,7 @@ def page_to_entry(page_object):
         "title": page_object.name,
         "heading": page_object.description,
         "content_type": page_object._meta.label,
-        "content_id": page_object.pk,
+        "content_id": str(page_object.pk),
         "content": "",
         "sites": sites,
         "urls": [f'//{sites[0]}{page_object.webpath.get_full_path()}',],
@@ -82,7 +82,7 @@ def publication_to_entry(pub_object, contexts=None):
         "heading": pub_object.subheading,
         "content_type": pub_object._meta.label,
         "image": pub_object.image_url(),
-        "content_id": pub_object.pk,
+        "content_id": str(pub_object.pk),
         "content": pub_object.content,
         "sites": list(sites),
         "urls": list(urls),
@@ -0,0 +1,194 @@
+import logging
+import os
+import threading
+import time
+
+import pymongo
+
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+
+from django.conf import settings
+
+from . import settings as app_settings
+
+
+logger = logging.getLogger(__name__)
+
+MONGO_POOL_PARAMS = getattr(settings, 'MONGO_POOL_PARAMS',
+                            app_settings.MONGO_POOL_PARAMS)
+MONGO_HEALTH_CHECK_INTERVAL = getattr(settings, 'MONGO_HEALTH_CHECK_INTERVAL',
+                                      app_settings.MONGO_HEALTH_CHECK_INTERVAL)
+MONGO_HEALTH_CHECK_BACKGROUND = getattr(settings, 'MONGO_HEALTH_CHECK_BACKGROUND',
+                                        app_settings.MONGO_HEALTH_CHECK_BACKGROUND)
+
+# connection parameters shown by the stats api
+POOL_STATS_PARAMS = ('maxPoolSize', 'minPoolSize', 'maxIdleTimeMS',
+                     'maxConnecting', 'waitQueueTimeoutMS',
+                     'connectTimeoutMS', 'socketTimeoutMS',
+                     'serverSelectionTimeoutMS', 'heartbeatFrequencyMS',
+                     'retryReads', 'retryWrites', 'appname')
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    collects connection pool checkout wait times (process local)
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.connections = 0
+
+    def _wait(self, event):
+        duration = getattr(event, 'duration', None) or 0.0
+        with self.lock:
+            self.wait_total += duration
+            self.wait_max = max(self.wait_max, duration)
+
+    def connection_checked_out(self, event):
+        self._wait(event)
+        with self.lock:
+            self.checkouts += 1
+
+    def connection_check_out_failed(self, event):
+        self._wait(event)
+        with self.lock:
+            self.checkout_failures += 1
+        logger.warning(f'MongoDB connection checkout failed: {event.reason}')
+
+    def connection_created(self, event):
+        with self.lock:
+            self.connections += 1
+
+    def connection_closed(self, event):
+        with self.lock:
+            self.connections -= 1
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+    def connection_checked_in(self, event): pass
+
+    def get_stats(self):
+        with self.lock:
+            requests = self.checkouts + self.checkout_failures
+            return {'checkouts': self.checkouts,
+                    'checkout_failures': self.checkout_failures,
+                    'open_connections': self.connections,
+                    'wait_avg_ms': round(self.wait_total / requests * 1000, 3)
+                                   if requests else 0,
+                    'wait_max_ms': round(self.wait_max * 1000, 3)}
+
+
+class MongoClientManager(object):
+    """
+    one pooled MongoClient for each process.
+
+    The client is lazily created at the first use and recreated
+    in forked processes (pymongo clients are not fork safe).
+    Server availability is checked by a background thread
+    (MONGO_HEALTH_CHECK_BACKGROUND) or after a failure,
+    never on each call.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = PoolMetricsListener()
+        self.client = None
+        self.pid = None
+        self.healthy = True
+        self.last_check = None
+        self._checker = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # a lock held by another thread during fork would never be released
+        self.lock = threading.Lock()
+
+    def get_params(self):
+        params = dict(MONGO_POOL_PARAMS)
+        params.update(getattr(settings, 'MONGO_CONNECTION_PARAMS', {}))
+        params['event_listeners'] = [self.metrics,
+                                     *params.get('event_listeners', [])]
+        return params
+
+    def get_client(self):
+        pid = os.getpid()
+        if self.client is None or self.pid != pid:
+            with self.lock:
+                if self.client is None or self.pid != pid:
+                    if self.pid != pid:
+                        # never close sockets inherited from the parent
+                        self.metrics.reset()
+                        self._checker = None
+                        self.healthy = True
+                    self.client = pymongo.MongoClient(settings.MONGO_URL,
+                                                      **self.get_params())
+                    self.pid = pid
+                    logger.debug(f'MongoDB client created (pid {pid})')
+                    if MONGO_HEALTH_CHECK_BACKGROUND:
+                        self._start_checker(periodic=True)
+        return self.client
+
+    def check_health(self):
+        client = self.get_client()
+        try:
+            client.admin.command('ping')
+            healthy = True
+        except PyMongoError as e:
+            logger.error(f'MongoDB health check failed: {e}')
+            healthy = False
+        if healthy and not self.healthy:
+            logger.info('MongoDB is available again')
+        self.healthy = healthy
+        self.last_check = time.time()
+        return healthy
+
+    def report_failure(self, exc=None):
+        """
+        marks the server as unavailable until a health check succeeds
+        """
+        if self.healthy:
+            logger.error(f'MongoDB failure: {exc}')
+        self.healthy = False
+        self._start_checker(periodic=False)
+
+    def _start_checker(self, periodic):
+        if self._checker and self._checker.is_alive(): return
+        self._checker = threading.Thread(target=self._run_checker,
+                                         args=(periodic,),
+                                         name='unicms-mongo-health',
+                                         daemon=True)
+        self._checker.start()
+
+    def _run_checker(self, periodic):
+        pid = os.getpid()
+        while self.pid == pid:
+            time.sleep(MONGO_HEALTH_CHECK_INTERVAL)
+            if self.pid != pid: return
+            if self.check_health() and not periodic: return
+
+    def get_stats(self):
+        stats = self.metrics.get_stats()
+        params = self.get_params()
+        stats.update({'healthy': self.healthy,
+                      'last_check': self.last_check,
+                      # credentials, tls and auth options are never exposed
+                      'pool': {k: params[k] for k in POOL_STATS_PARAMS
+                               if k in params}})
+        return stats
+
+
+mongo_client_manager = MongoClientManager()
@@ -1,10 +1,29 @@
+from cms.contexts.settings import CMS_CACHE_KEY_PREFIX
+
+
 MONGO_URL = 'mongodb://localhost:27017'
 MONGO_DB_PARAMS = dict(connectTimeoutMS=5000,
                        socketTimeoutMS=5000,
                        serverSelectionTimeoutMS=5000)
+# MongoClient connection pool, overridden by MONGO_CONNECTION_PARAMS
+MONGO_POOL_PARAMS = dict(maxPoolSize=50,
+                         minPoolSize=0,
+                         maxIdleTimeMS=300000,
+                         waitQueueTimeoutMS=5000)
+# seconds between MongoDB health checks,
+# they run after a failure or periodically in background
+MONGO_HEALTH_CHECK_INTERVAL = 30
+MONGO_HEALTH_CHECK_BACKGROUND = False
 MONGO_DB_NAME = 'unicms'
 MONGO_COLLECTION_NAME = 'search'
 
+# search engine storage
+# 'cms.search.backends.MongoSearchBackend' or
+# 'cms.search.backends.SQLiteSearchBackend' (local FTS5 index)
+SEARCH_BACKEND = 'cms.search.backends.MongoSearchBackend'
+# SQLiteSearchBackend database file
+SEARCH_SQLITE_PATH = 'unicms_search.sqlite3'
+
 MODEL_TO_MONGO_MAP = {
     'cmspages.Page': 'cms.search.models.page_to_entry',
     'cmspublications.Publication': 'cms.search.models.publication_to_entry'
@@ -26,5 +45,21 @@ CMS_HOOKS = {
 }
 
 SEARCH_ELEMENTS_IN_PAGE = 25
+# max number of values of each facet (categories, tags, sites)
+SEARCH_FACETS_LIMIT = 20
+
+# autocomplete
+SEARCH_SUGGEST_LIMIT = 10
+SEARCH_SUGGEST_MIN_LENGTH = 2
+# titles are also suggested from each of their first N words
+SEARCH_SUGGEST_TITLE_WORDS = 8
+# max prefix index rows read by each lookup, in prefix order
+SEARCH_SUGGEST_SCAN_LIMIT = 1000
 
 ALLOW_SEARCH_IN_SITES = ['*']
+
+# search results cache
+SEARCH_CACHE_ENABLED = True
+SEARCH_CACHE_KEY_PREFIX = f'{CMS_CACHE_KEY_PREFIX}search_'
+# in seconds
+SEARCH_CACHE_TTL = 300
@@ -1,12 +1,24 @@
 import logging
 
-from django.test import Client, TestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
+from cms.contexts.tests import ContextUnitTest
 from cms.publications.tests import PublicationUnitTest
 from cms.templates.tests import TemplateUnitTest
 
+from . backends import (SQLiteSearchBackend,
+                        get_search_backend,
+                        get_suggestion_terms)
+from . mongo import MongoClientManager
+from . cache import (bump_index_generation,
+                     get_search_from_cache,
+                     make_search_cache_key,
+                     set_search_to_cache)
+
 
 
 logger = logging.getLogger(__name__)
@@ -62,3 +74,281 @@ class TemplateUnitTest(TestCase):
         # wrong page number #2
         res = req.get(url+f'?page_number=1024', content_type='application/json')
         assert isinstance(res.json(), dict)
+
+
+class SearchCacheUnitTest(TestCase):
+
+    def test_search_cache_key(self):
+        filters = {'search': 'lorem', 'tags': ['b', 'a'], 'year': None}
+        same = {'tags': ['a', 'b'], 'search': 'lorem'}
+        assert make_search_cache_key(filters, 'it') == make_search_cache_key(same, 'it')
+        assert make_search_cache_key(filters, 'it') != make_search_cache_key(filters, 'en')
+
+    def test_search_cache_generation(self):
+        filters = {'search': 'lorem ipsum', 'page': 1}
+        result = {'results': [], 'count': 0}
+        set_search_to_cache(filters, result, 'it')
+        assert get_search_from_cache(filters, 'it') == result
+
+        # indexing hooks invalidate cached results
+        bump_index_generation()
+        assert get_search_from_cache(filters, 'it') is None
+
+    def test_search_cache_stats(self):
+        req = Client()
+        url = reverse('unicms_search:api-search-engine-cache-stats')
+        res = req.get(url)
+        assert res.status_code == 403
+
+        user = ContextUnitTest.create_user(is_staff=True)
+        req.force_login(user)
+        res = req.get(url)
+        assert 'hits' in res.json()
+
+
+class SearchBackendUnitTest(TestCase):
+
+    @staticmethod
+    def create_entry(**kwargs):
+        now = timezone.localtime()
+        entry = {'title': 'lorem ipsum',
+                 'heading': 'dolor sit amet',
+                 'content_type': 'cmspublications.Publication',
+                 'content_id': '1',
+                 'content': '<p>consectetur adipiscing elit</p>',
+                 'sites': ['backend.example.org'],
+                 'urls': ['//backend.example.org/lorem-ipsum'],
+                 'tags': ['tag1', 'tag2'],
+                 'categories': ['news'],
+                 'indexed': now,
+                 'published': now,
+                 'viewed': 0,
+                 'language': 'italiano',
+                 'translations': [{'language': 'english',
+                                   'title': 'translated title',
+                                   'subheading': '',
+                                   'content': 'translated content'}],
+                 'day': now.day,
+                 'month': now.month,
+                 'year': now.year}
+        entry.update(kwargs)
+        return entry
+
+    def setUp(self):
+        self.backend = get_search_backend()
+        self.backend.delete_many({})
+        bump_index_generation()
+
+    def test_fts_query(self):
+        get_fts_query = SQLiteSearchBackend.get_fts_query
+        assert get_fts_query('') == ''
+        assert get_fts_query('lorem ipsum') == '("lorem" OR "ipsum")'
+        assert get_fts_query('lorem -ipsum') == '("lorem") NOT "ipsum"'
+        # words don't filter phrases results, as in MongoDB
+        assert get_fts_query('"lorem ipsum" dolor -sit') == \
+               '"lorem ipsum" NOT "sit"'
+        # hyphens exclude only at the start of a word
+        assert get_fts_query('e-learning') == '("e" OR "learning")'
+        assert get_fts_query('lorem -e-learning') == '("lorem") NOT "e learning"'
+        # nothing to search for
+        assert get_fts_query('-lorem -ipsum') is None
+        assert get_fts_query('- !') is None
+
+    def test_benchmark_unsupported_backend(self):
+        for backend in ('cms.search.backends.BaseSearchBackend',
+                        'cms.search.backends.Missing'):
+            with self.assertRaises(CommandError):
+                call_command('cms_search_benchmark', '-backend', backend)
+
+    def test_backend_crud(self):
+        self.backend.insert_many([self.create_entry(content_id=str(i))
+                                  for i in range(3)])
+        match = {'content_type': 'cmspublications.Publication'}
+        assert self.backend.count(match) == 3
+        entry = list(self.backend.find({'content_id': '1'}))[0]
+        assert entry['title'] == 'lorem ipsum'
+        assert entry['published'].tzinfo
+        assert self.backend.delete_many({'content_id': '1'}) == 1
+        assert self.backend.count(match) == 2
+
+    def test_backend_search(self):
+        yesterday = timezone.localtime() - timezone.timedelta(days=1)
+        self.backend.insert_many([
+            self.create_entry(content_id='1'),
+            self.create_entry(content_id='2',
+                              title='another title',
+                              tags=['tag1'],
+                              sites=['other.example.org'],
+                              categories=['events'],
+                              published=yesterday),
+            self.create_entry(content_id='3',
+                              title='unrelated',
+                              heading='',
+                              content='ipsum',
+                              year=2000)
+        ])
+        search = self.backend.search
+
+        entries, total = search({})
+        assert total == 3
+        # most recent first
+        assert entries[-1]['content_id'] == '2'
+
+        # bm25 ranking: title matches weigh more than content ones
+        entries, total = search({'search': 'ipsum'})
+        assert total == 2
+        assert entries[0]['content_id'] == '1'
+        assert entries[0]['relevance'] > entries[1]['relevance']
+
+        assert search({'search': '"adipiscing elit"'})[1] == 2
+        assert search({'search': 'lorem -unrelated'})[1] == 1
+        assert search({'search': '"adipiscing elit" unrelated'})[1] == 2
+        assert search({'search': 'ipsum -dolor-sit'})[1] == 1
+        assert search({'search': 'lorem-ipsum'})[1] == 2
+        assert search({'search': '-unrelated'})[1] == 0
+        assert search({'search': 'translated'})[1] == 3
+        assert search({'tags': ['tag1', 'tag2']})[1] == 2
+        assert search({'categories': ['events']})[1] == 1
+        assert search({'sites': ['other.example.org']})[1] == 1
+        assert search({'year': 2000})[1] == 1
+        today = timezone.localtime().strftime('%Y-%m-%d')
+        assert search({'date_end': today})[1] == 1
+        assert search({}, allowed_sites=['backend.example.org'])[1] == 2
+
+        # pagination
+        entries, total = search({}, start=1, end=2)
+        assert total == 3 and len(entries) == 1
+
+    def test_backend_facets(self):
+        self.backend.insert_many([
+            self.create_entry(content_id='1'),
+            self.create_entry(content_id='2',
+                              tags=['tag1'],
+                              sites=['backend.example.org', 'other.example.org'],
+                              year=2020),
+            self.create_entry(content_id='3', title='unrelated')
+        ])
+        facets = self.backend.facets({'search': 'lorem'})
+        assert facets['tags'] == [{'value': 'tag1', 'count': 2},
+                                  {'value': 'tag2', 'count': 1}]
+        assert facets['categories'] == [{'value': 'news', 'count': 2}]
+        assert facets['year'][-1] == {'value': 2020, 'count': 1}
+        assert len(facets['sites']) == 2
+
+        # not allowed sites are not counted
+        facets = self.backend.facets({}, allowed_sites=['backend.example.org'])
+        assert facets['sites'] == [{'value': 'backend.example.org', 'count': 3}]
+
+        facets = self.backend.facets({'search': 'lorem'}, limit=1)
+        assert facets['tags'] == [{'value': 'tag1', 'count': 2}]
+
+    def test_suggestion_terms(self):
+        terms = get_suggestion_terms({'title': 'Università  Campus',
+                                      'tags': ['Erasmus']})
+        assert terms == {('title', 'Università Campus', 'universita campus'),
+                         ('title', 'Università Campus', 'campus'),
+                         ('tag', 'Erasmus', 'erasmus')}
+
+    def test_backend_suggest(self):
+        self.backend.insert_many([
+            self.create_entry(content_id='1', title='Lorem ipsum'),
+            self.create_entry(content_id='2', title='Lorem ipsum',
+                              sites=['other.example.org']),
+            self.create_entry(content_id='3', title='Loremipsum dolor',
+                              tags=['lorem-tag']),
+        ])
+        suggestions = self.backend.suggest('LOREM')
+        assert suggestions[0] == {'value': 'Lorem ipsum',
+                                  'kind': 'title',
+                                  'count': 2}
+        assert {'value': 'lorem-tag', 'kind': 'tag', 'count': 1} in suggestions
+        assert self.backend.suggest('ipsum')[0]['value'] == 'Lorem ipsum'
+        assert self.backend.suggest('lorem', limit=1) == suggestions[:1]
+        assert self.backend.suggest('lorem',
+                                    allowed_sites=['other.example.org'])[0]['count'] == 1
+
+        # deleted entries are no longer suggested
+        self.backend.delete_many({'content_id': '3'})
+        assert not self.backend.suggest('dolor')
+
+    def test_api_suggest(self):
+        self.backend.insert_one(self.create_entry())
+        req = Client()
+        url = reverse('unicms_search:api-search-engine-suggest')
+        assert req.get(url+'?q=l').json()['results'] == []
+        res = req.get(url+'?q=lor')
+        assert res.json()['results'][0]['value'] == 'lorem ipsum'
+        # at least one result, never unbounded
+        self.backend.insert_one(self.create_entry(content_id='2',
+                                                  title='lorem dolor'))
+        assert len(req.get(url+'?q=lor').json()['results']) == 2
+        for limit in (-1, 0):
+            res = req.get(url+f'?q=lor&limit={limit}')
+            assert len(res.json()['results']) == 1
+
+    def test_api_search_backend(self):
+        self.backend.insert_one(self.create_entry())
+        req = Client()
+        url = reverse('unicms_search:api-search-engine')
+        res = req.get(url+'?search=lorem&sites=backend.example.org')
+        assert res.json()['count'] == 1
+        assert res.json()['results'][0]['content_id'] == '1'
+
+        res = req.get(url+'?tags=missing')
+        assert res.json()['count'] == 0
+        assert 'facets' not in res.json()
+
+        res = req.get(url+'?search=lorem&facets=true')
+        assert res.json()['facets']['tags'][0]['count'] == 1
+
+    def test_publication_hooks(self):
+        pub = PublicationUnitTest.enrich_pub()
+        match = {'content_type': pub._meta.label,
+                 'content_id': pub.pk}
+        pub.save()
+        assert self.backend.count(match) == 1
+        # inactive publications are removed from the index
+        pub.is_active = False
+        pub.save()
+        assert self.backend.count(match) == 0
+
+
+class MongoClientManagerUnitTest(TestCase):
+
+    def test_client_reuse(self):
+        manager = MongoClientManager()
+        client = manager.get_client()
+        # the same pooled client, no server round trips
+        assert manager.get_client() is client
+        assert manager.metrics.get_stats()['checkouts'] == 0
+
+        # forked processes get their own client
+        manager.pid = -1
+        assert manager.get_client() is not client
+        client.close()
+
+    def test_failure_health_check(self):
+        manager = MongoClientManager()
+        manager._start_checker = lambda periodic: None
+        manager.report_failure(Exception('test'))
+        assert not manager.healthy
+        with override_settings(MONGO_URL='mongodb://127.0.0.1:1',
+                               MONGO_CONNECTION_PARAMS=dict(serverSelectionTimeoutMS=50)):
+            assert manager.check_health() is False
+        assert manager.last_check
+
+    def test_mongo_stats(self):
+        req = Client()
+        url = reverse('unicms_search:api-search-engine-mongo-stats')
+        assert req.get(url).status_code == 403
+
+        user = ContextUnitTest.create_user(is_staff=True)
+        req.force_login(user)
+        params = dict(password='secret', tlsCertificateKeyFilePassword='secret',
+                      authMechanismProperties={'AWS_SESSION_TOKEN': 'secret'})
+        with override_settings(MONGO_CONNECTION_PARAMS=params):
+            res = req.get(url).json()
+        assert 'wait_avg_ms' in res
+        assert 'maxPoolSize' in res['pool']
+        # only the allowed parameters
+        assert 'secret' not in str(res)
@@ -11,3 +11,12 @@ CMS_PATH_PREFIX = getattr(settings, 'CMS_PATH_PREFIX', '')
 urlpatterns += path('api/search/',
                     api_views.ApiSearchEngine.as_view(),
                     name='api-search-engine'),
+urlpatterns += path('api/search/suggest/',
+                    api_views.ApiSearchEngineSuggest.as_view(),
+                    name='api-search-engine-suggest'),
+urlpatterns += path('api/search/cache-stats/',
+                    api_views.ApiSearchEngineCacheStats.as_view(),
+                    name='api-search-engine-cache-stats'),
+urlpatterns += path('api/search/mongo-stats/',
+                    api_views.ApiSearchEngineMongoStats.as_view(),
+                    name='api-search-engine-mongo-stats'),